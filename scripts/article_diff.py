@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+조문 단위 구조 비교(diff) 엔진
+
+파일 전체를 difflib.HtmlDiff에 넣으면 줄 수의 제곱에 비례해 느려지므로
+(3-3-5.md처럼 1.6MB 규정은 수 분 또는 메모리 부족) 먼저 구조로 정렬합니다.
+
+1. 문서를 머리말 / 제N장 / 제N조(제N조의M) / 부칙 단위로 분할
+2. 각 단위의 내용 해시를 계산하고, 조문 번호를 뺀 본문 해시로 순서 정렬
+   → 같은 조문은 건너뛰고, 조문이 끼어들어 번호가 밀려도 본문이 같으면 "번호 변경"
+3. 바뀐 단위만 줄 단위 비교 (HtmlDiff 표), 너무 큰 단위는 빈 줄 기준 문단으로 다시 분할
+4. 바뀐 조문 목록(상태, 바뀐 항 ①②…)을 JSON으로 쓸 수 있는 형태로 반환
+
+사용법:
+    python3 scripts/article_diff.py <이전 md> <새 md> [출력 html]
+"""
+
+import sys
+import json
+import difflib
+import hashlib
+
+from regulation_parser import ARTICLE_PATTERN, CHAPTER_PATTERN, ADDENDA_PATTERN, CLAUSE_PATTERN
+
+# 한 단위의 줄 수가 이보다 많으면 문단 단위로 다시 정렬한 뒤 비교
+MAX_UNIT_LINES = 400
+
+def _digest(lines):
+    return hashlib.sha1('\n'.join(lines).encode('utf-8')).hexdigest()
+
+def _body_digest(lines):
+    """조문 번호를 뺀 본문 해시 (번호만 바뀐 조문을 같은 조문으로 정렬)"""
+    if lines:
+        first = ARTICLE_PATTERN.sub('', lines[0], count=1)
+        lines = [first] + lines[1:]
+    return _digest([line.strip() for line in lines])
+
+def _make_unit(key, label, start, lines):
+    return {
+        'key': key,
+        'label': label,
+        'start': start,
+        'lines': lines,
+        'digest': _digest(lines),
+        'body_digest': _body_digest(lines),
+    }
+
+def split_articles(lines):
+    """문서를 머리말 / 장 / 조 / 부칙 단위로 분할
+
+    반환: [{'key', 'label', 'start', 'lines', 'digest', 'body_digest'}]
+    key는 문서 안에서 유일합니다. (부칙 안의 조는 '부칙[2] 제1조' 형태)
+    """
+    boundaries = []
+    addenda_no = 0
+    for i, line in enumerate(lines):
+        match = ARTICLE_PATTERN.match(line)
+        if match:
+            key = f"제{match.group(1)}조" + (f"의{match.group(2)}" if match.group(2) else '')
+            if addenda_no:
+                key = f"부칙[{addenda_no}] {key}"
+            boundaries.append((i, key))
+            continue
+        match = CHAPTER_PATTERN.match(line)
+        if match:
+            boundaries.append((i, f"제{match.group(1)}장"))
+            continue
+        if ADDENDA_PATTERN.match(line):
+            addenda_no += 1
+            boundaries.append((i, f"부칙[{addenda_no}]"))
+
+    units = []
+    if not boundaries or boundaries[0][0] > 0:
+        end = boundaries[0][0] if boundaries else len(lines)
+        units.append(('머리말', 0, end))
+    for n, (start, key) in enumerate(boundaries):
+        end = boundaries[n + 1][0] if n + 1 < len(boundaries) else len(lines)
+        units.append((key, start, end))
+
+    seen = {}
+    result = []
+    for key, start, end in units:
+        seen[key] = seen.get(key, 0) + 1
+        unique_key = key if seen[key] == 1 else f"{key}#{seen[key]}"
+        result.append(_make_unit(unique_key, key, start, lines[start:end]))
+    return result
+
+def split_paragraphs(lines, offset=0):
+    """빈 줄 기준 문단 단위 분할 (큰 단위를 다시 나눌 때 사용)"""
+    units = []
+    start = 0
+    for i in range(len(lines) + 1):
+        if i == len(lines) or not lines[i].strip():
+            if i > start:
+                units.append(_make_unit(f"L{offset + start + 1}", '', offset + start, lines[start:i + 1]))
+            start = i + 1
+    return units
+
+def align_units(old_units, new_units):
+    """두 단위 목록을 본문 해시로 정렬하여 (상태, 이전 단위, 새 단위) 목록 반환
+
+    상태: 'same', 'renumbered', 'modified', 'added', 'deleted'
+    """
+    # 앞뒤 공통 부분은 SequenceMatcher 없이 바로 처리 (대부분의 개정은 일부 조문만 바뀜)
+    prefix = 0
+    limit = min(len(old_units), len(new_units))
+    while prefix < limit and old_units[prefix]['digest'] == new_units[prefix]['digest']:
+        prefix += 1
+    suffix = 0
+    while (suffix < limit - prefix
+           and old_units[-1 - suffix]['digest'] == new_units[-1 - suffix]['digest']):
+        suffix += 1
+
+    pairs = [('same', unit, new_units[i]) for i, unit in enumerate(old_units[:prefix])]
+    old_mid = old_units[prefix:len(old_units) - suffix]
+    new_mid = new_units[prefix:len(new_units) - suffix]
+
+    matcher = difflib.SequenceMatcher(None, [u['body_digest'] for u in old_mid],
+                                      [u['body_digest'] for u in new_mid], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for old, new in zip(old_mid[i1:i2], new_mid[j1:j2]):
+                if old['digest'] == new['digest']:
+                    pairs.append(('same', old, new))
+                elif old['key'] != new['key']:
+                    pairs.append(('renumbered', old, new))
+                else:
+                    pairs.append(('modified', old, new))
+            continue
+
+        # 본문이 다른 구간: 같은 key끼리 짝지어 수정, 나머지는 신설/삭제
+        old_by_key = {u['key']: u for u in old_mid[i1:i2]}
+        used = set()
+        for new in new_mid[j1:j2]:
+            old = old_by_key.get(new['key'])
+            if old is not None:
+                used.add(new['key'])
+                pairs.append(('modified', old, new))
+            else:
+                pairs.append(('added', None, new))
+        for old in old_mid[i1:i2]:
+            if old['key'] not in used:
+                pairs.append(('deleted', old, None))
+
+    base_old = len(old_units) - suffix
+    base_new = len(new_units) - suffix
+    pairs += [('same', old_units[base_old + i], new_units[base_new + i]) for i in range(suffix)]
+    return pairs
+
+def changed_clauses(old_lines, new_lines):
+    """조문 안에서 바뀐 항(①②…) 목록"""
+    def clauses(lines):
+        result = {}
+        current = ''
+        for line in lines:
+            match = CLAUSE_PATTERN.match(line)
+            if match:
+                current = match.group(1)
+            result.setdefault(current, []).append(line.strip())
+        return result
+
+    old, new = clauses(old_lines), clauses(new_lines)
+    markers = list(dict.fromkeys(list(new) + list(old)))
+    return [marker for marker in markers if marker and old.get(marker) != new.get(marker)]
+
+def diff_articles(old_lines, new_lines):
+    """조문 단위 비교 결과
+
+    반환: [{'status', 'key', 'old_key', 'old_start', 'new_start', 'clauses',
+            'old_lines', 'new_lines'}] (바뀐 단위만, 새 문서 순서)
+    """
+    changes = []
+    for status, old, new in align_units(split_articles(old_lines), split_articles(new_lines)):
+        if status == 'same':
+            continue
+        changes.append({
+            'status': status,
+            'key': (new or old)['key'],
+            'old_key': old['key'] if old else None,
+            'old_start': old['start'] + 1 if old else None,
+            'new_start': new['start'] + 1 if new else None,
+            'clauses': changed_clauses(old['lines'] if old else [], new['lines'] if new else []),
+            'old_lines': old['lines'] if old else [],
+            'new_lines': new['lines'] if new else [],
+        })
+    return changes
+
+def _line_diff_blocks(old_lines, new_lines, old_start, new_start):
+    """줄 단위 비교할 (이전 줄, 새 줄) 묶음 - 큰 단위는 문단으로 다시 정렬"""
+    if len(old_lines) <= MAX_UNIT_LINES or len(new_lines) <= MAX_UNIT_LINES:
+        return [(old_lines, new_lines)]
+    blocks = []
+    for status, old, new in align_units(split_paragraphs(old_lines, old_start),
+                                        split_paragraphs(new_lines, new_start)):
+        if status != 'same':
+            blocks.append((old['lines'] if old else [], new['lines'] if new else []))
+    return blocks
+
+STATUS_LABELS = {
+    'modified': '수정',
+    'renumbered': '번호 변경',
+    'added': '신설',
+    'deleted': '삭제',
+}
+
+def render_html(changes, title):
+    """바뀐 조문별 HtmlDiff 표로 구성한 HTML 조각"""
+    html_diff = difflib.HtmlDiff()
+    parts = [f"<h3>{title}</h3>"]
+    if changes:
+        summary = ', '.join(f"{change['key']}({STATUS_LABELS[change['status']]})" for change in changes)
+        parts.append(f"<p>변경 조문 {len(changes)}개: {summary}</p>")
+    for change in changes:
+        heading = change['key']
+        if change['status'] == 'renumbered':
+            heading = f"{change['old_key']} → {change['key']}"
+        if change['clauses']:
+            heading += f" [{' '.join(change['clauses'])}]"
+        parts.append(f"<h4>{heading} ({STATUS_LABELS[change['status']]})</h4>")
+        for old_block, new_block in _line_diff_blocks(change['old_lines'], change['new_lines'],
+                                                      (change['old_start'] or 1) - 1,
+                                                      (change['new_start'] or 1) - 1):
+            parts.append(html_diff.make_table(old_block, new_block, context=True, numlines=3))
+    return '\n'.join(parts) + "<br>"
+
+def changes_summary(changes):
+    """JSON 저장용 바뀐 조문 목록 (본문 제외)"""
+    return [{
+        'status': change['status'],
+        'article': change['key'],
+        'old_article': change['old_key'],
+        'old_line': change['old_start'],
+        'new_line': change['new_start'],
+        'clauses': change['clauses'],
+    } for change in changes]
+
+def main():
+    """명령행 실행: 두 MD 파일의 조문 단위 비교"""
+    if len(sys.argv) < 3:
+        print(f"사용법: python3 {sys.argv[0]} <이전 md> <새 md> [출력 html]")
+        return 1
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        old_lines = f.read().splitlines()
+    with open(sys.argv[2], 'r', encoding='utf-8') as f:
+        new_lines = f.read().splitlines()
+
+    changes = diff_articles(old_lines, new_lines)
+    if len(sys.argv) > 3:
+        with open(sys.argv[3], 'w', encoding='utf-8') as f:
+            f.write(render_html(changes, sys.argv[2]))
+    print(json.dumps(changes_summary(changes), ensure_ascii=False, indent=2))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
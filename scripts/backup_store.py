@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+규정 파일 백업 저장소 (내용 주소 + 압축 + 델타)
+
+규정 파일 옆에 *.backup.YYYYmmdd_HHMMSS 전체 복사본을 남기는 대신
+트리 밖의 저장소에 버전을 쌓습니다.
+
+- 객체는 내용의 SHA-256으로 저장 → 같은 내용은 한 번만 저장 (중복 제거)
+- 같은 규정의 직전 버전 대비 줄 단위 델타(바뀐 줄만)를 zlib 압축하여 저장
+  델타가 전체 압축보다 크지 않을 때만 사용하며, 델타 체인은 MAX_DELTA_CHAIN 단계까지
+- 버전 목록(index.json)은 규정 코드별 [{time, sha256, size, source}]
+  (time은 마이크로초까지 기록하고, 같은 시각이 이미 있으면 -2, -3 ... 을 붙여 버전마다 고유)
+- 보존 정책: 규정마다 최근 N개 + 최근 D일 이내 버전 유지, 나머지는 정리 후
+  어떤 버전에서도 참조하지 않는 객체 삭제 (파일 목록을 훑지 않고 index만 사용)
+- 복원: 규정 코드 + 시각(접두어 가능, 그 시각 이전의 마지막 버전) 또는 list에 표시된 해시 접두어
+
+저장소 위치는 기본적으로 <프로젝트 루트>/.cache/backups 이며 환경 변수로 조정할 수 있습니다.
+(.cache는 gitignore 대상이므로 GitHub Actions에서는 워크플로의 actions/cache 경로와
+ regulation-backups 아티팩트로 실행 간에 보존합니다. git clean -X에도 지워지니 로컬에서 오래 둘 때는
+ REGULATION_BACKUP_DIR을 저장소 밖으로 지정하세요.)
+    REGULATION_BACKUP_DIR        저장소 폴더 경로
+    REGULATION_BACKUP_KEEP_LAST  규정별 유지할 최근 버전 수 (기본 10)
+    REGULATION_BACKUP_KEEP_DAYS  유지할 기간 (일, 기본 30)
+
+사용법:
+    python3 scripts/backup_store.py save <코드> <파일>
+    python3 scripts/backup_store.py list [코드]
+    python3 scripts/backup_store.py restore <코드> [시각|해시] [--output <경로>]
+    python3 scripts/backup_store.py prune [--keep-last N] [--keep-days D]
+    python3 scripts/backup_store.py import-legacy      # regulations/의 *.backup.* 파일을 저장소로 옮김
+    python3 scripts/backup_store.py stats
+"""
+
+import os
+import re
+import sys
+import json
+import zlib
+import difflib
+import hashlib
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+project_root = Path(__file__).resolve().parent.parent
+
+DEFAULT_BACKUP_DIR = project_root / '.cache' / 'backups'
+DEFAULT_KEEP_LAST = 10
+DEFAULT_KEEP_DAYS = 30
+MAX_DELTA_CHAIN = 10
+TIME_FORMAT = '%Y%m%d_%H%M%S'
+# 버전 시각 (1초 안에 여러 번 저장해도 구분되도록 마이크로초까지)
+VERSION_TIME_FORMAT = '%Y%m%d_%H%M%S_%f'
+# list에 표시하는 해시 길이 (숫자로만 된 해시 접두어도 이 길이면 해시로 간주)
+SHORT_HASH = 12
+LEGACY_BACKUP_PATTERN = re.compile(r'^(?P<code>.+)\.md\.backup\.(?P<time>\d{8}_\d{6})$')
+
+FULL, DELTA = b'F', b'D'
+
+def make_delta(base, data):
+    """base → data 줄 단위 델타: [[복사 시작, 복사 끝] 또는 "삽입할 텍스트", ...]"""
+    base_lines = base.splitlines(keepends=True)
+    lines = data.splitlines(keepends=True)
+    # 대부분의 개정은 일부 조문만 바뀌므로 앞뒤 공통 줄은 SequenceMatcher 없이 처리
+    prefix = 0
+    limit = min(len(base_lines), len(lines))
+    while prefix < limit and base_lines[prefix] == lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and base_lines[-1 - suffix] == lines[-1 - suffix]:
+        suffix += 1
+
+    ops = [[0, prefix]] if prefix else []
+    matcher = difflib.SequenceMatcher(None, base_lines[prefix:len(base_lines) - suffix],
+                                      lines[prefix:len(lines) - suffix])
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([prefix + i1, prefix + i2])
+        elif j2 > j1:
+            ops.append(b''.join(lines[prefix + j1:prefix + j2]).decode('utf-8', errors='surrogateescape'))
+    if suffix:
+        ops.append([len(base_lines) - suffix, len(base_lines)])
+    return ops
+
+def apply_delta(base, ops):
+    """make_delta()의 역: base에 델타를 적용한 내용"""
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op.encode('utf-8', errors='surrogateescape'))
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return b''.join(parts)
+
+class BackupStore:
+    """규정 코드별 버전을 내용 해시로 저장하는 백업 저장소"""
+
+    def __init__(self, backup_dir=None):
+        self.backup_dir = Path(backup_dir or os.environ.get('REGULATION_BACKUP_DIR') or DEFAULT_BACKUP_DIR)
+        self.objects_dir = self.backup_dir / 'objects'
+        self.index_path = self.backup_dir / 'index.json'
+        self.lock_path = self.backup_dir / '.lock'
+        self.keep_last = int(os.environ.get('REGULATION_BACKUP_KEEP_LAST', DEFAULT_KEEP_LAST))
+        self.keep_days = float(os.environ.get('REGULATION_BACKUP_KEEP_DAYS', DEFAULT_KEEP_DAYS))
+
+    @contextmanager
+    def _locked(self):
+        """여러 프로세스가 동시에 저장소를 갱신할 때를 위한 파일 잠금"""
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index):
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / digest
+
+    def _read_header(self, digest):
+        """(종류, 기준 객체 해시) - 델타 체인 길이 확인용"""
+        with open(self._object_path(digest), 'rb') as f:
+            head = f.read(65)
+        return head[:1], head[1:65].decode('ascii') if head[:1] == DELTA else None
+
+    def _chain_length(self, digest):
+        length = 0
+        while True:
+            kind, base = self._read_header(digest)
+            if kind != DELTA:
+                return length
+            length += 1
+            digest = base
+
+    def read(self, digest):
+        """객체 내용 (델타는 기준 객체부터 차례로 적용)"""
+        with open(self._object_path(digest), 'rb') as f:
+            raw = f.read()
+        if raw[:1] == FULL:
+            return zlib.decompress(raw[1:])
+        base = self.read(raw[1:65].decode('ascii'))
+        return apply_delta(base, json.loads(zlib.decompress(raw[65:])))
+
+    def _write_object(self, digest, data, base_digest=None):
+        """객체 저장 (이미 있으면 그대로) → 저장한 바이트 수"""
+        path = self._object_path(digest)
+        if path.exists():
+            return 0
+        payload = FULL + zlib.compress(data, 9)
+        if base_digest and self._chain_length(base_digest) < MAX_DELTA_CHAIN:
+            ops = make_delta(self.read(base_digest), data)
+            delta = DELTA + base_digest.encode('ascii') + zlib.compress(
+                json.dumps(ops, ensure_ascii=False).encode('utf-8'), 9)
+            if len(delta) < len(payload):
+                payload = delta
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return len(payload)
+
+    def save(self, code, file_path, timestamp=None, source=None, prune=True):
+        """파일의 현재 내용을 규정 코드의 새 버전으로 저장 → 버전 항목 (직전 버전과 같으면 그 항목)"""
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        timestamp = timestamp or datetime.now().strftime(VERSION_TIME_FORMAT)
+        with self._locked():
+            index = self.load_index()
+            versions = index.setdefault(code, [])
+            if versions and versions[-1]['sha256'] == digest:
+                return versions[-1]
+            timestamp = unique_time(timestamp, {v['time'] for v in versions})
+            base = versions[-1]['sha256'] if versions else None
+            stored = self._write_object(digest, data, base)
+            entry = {'time': timestamp, 'sha256': digest, 'size': len(data), 'stored': stored,
+                     'source': str(source or file_path)}
+            versions.append(entry)
+            versions.sort(key=lambda v: v['time'])
+            if prune:
+                self._prune(index, [code])
+            self._save_index(index)
+        return entry
+
+    def versions(self, code):
+        return self.load_index().get(code, [])
+
+    def find(self, code, timestamp=None):
+        """시각(접두어 가능) 이전의 마지막 버전, 또는 해시 접두어가 같은 버전 (없으면 None)"""
+        versions = self.versions(code)
+        if timestamp and is_hash_ref(timestamp):
+            matches = [v for v in versions if v['sha256'].startswith(timestamp.lower())]
+            if matches:
+                return matches[-1]
+        if timestamp:
+            exact = [v for v in versions if v['time'] == timestamp]
+            if exact:
+                return exact[-1]
+            versions = [v for v in versions if v['time'][:len(timestamp)] <= timestamp]
+        return versions[-1] if versions else None
+
+    def restore(self, code, timestamp=None, output=None):
+        """버전 내용을 output 경로에 쓰고 그 버전 항목 반환"""
+        entry = self.find(code, timestamp)
+        if entry is None:
+            raise KeyError(f"{code} 백업 없음" + (f" ({timestamp})" if timestamp else ''))
+        data = self.read(entry['sha256'])
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=output.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, output)
+        return entry
+
+    def _prune(self, index, codes=None):
+        """보존 정책에 맞지 않는 버전 제거 후 참조되지 않는 객체 삭제 → 삭제한 버전 수"""
+        cutoff = (datetime.now() - timedelta(days=self.keep_days)).strftime(TIME_FORMAT)
+        removed = []
+        for code in (codes or list(index)):
+            versions = index.get(code, [])
+            keep_from = max(0, len(versions) - self.keep_last)
+            kept = [v for i, v in enumerate(versions) if i >= keep_from or v['time'] >= cutoff]
+            removed += [v['sha256'] for v in versions if v not in kept]
+            index[code] = kept
+        if removed:
+            self._collect_garbage(index, set(removed))
+        return len(removed)
+
+    def _collect_garbage(self, index, candidates):
+        """후보 객체 중 남은 버전(및 그 델타 기준 객체)이 참조하지 않는 것 삭제"""
+        live = set()
+        for versions in index.values():
+            for version in versions:
+                digest = version['sha256']
+                while digest and digest not in live:
+                    live.add(digest)
+                    digest = self._read_header(digest)[1] if self._object_path(digest).exists() else None
+        for digest in candidates - live:
+            try:
+                self._object_path(digest).unlink()
+            except OSError:
+                pass
+
+    def prune(self, keep_last=None, keep_days=None):
+        """보존 정책 적용 (전체 규정) → 삭제한 버전 수"""
+        if keep_last is not None:
+            self.keep_last = keep_last
+        if keep_days is not None:
+            self.keep_days = keep_days
+        with self._locked():
+            index = self.load_index()
+            removed = self._prune(index)
+            self._save_index(index)
+        return removed
+
+    def import_legacy(self, regulations_dir=None):
+        """regulations/ 안의 *.md.backup.<시각> 파일을 저장소로 옮기고 삭제 → 옮긴 파일 수"""
+        regulations_dir = Path(regulations_dir or project_root / 'regulations')
+        found = []
+        for path in regulations_dir.rglob('*.backup.*'):
+            match = LEGACY_BACKUP_PATTERN.match(path.name)
+            if match:
+                found.append((match.group('time'), match.group('code'), path))
+        for timestamp, code, path in sorted(found):
+            self.save(code, path, timestamp=timestamp, source=path.relative_to(regulations_dir.parent),
+                      prune=False)
+            path.unlink()
+        return len(found)
+
+    def stats(self):
+        """버전 수, 원본 크기 합계, 저장된 크기"""
+        index = self.load_index()
+        versions = [v for vs in index.values() for v in vs]
+        stored = 0
+        objects = 0
+        if self.objects_dir.exists():
+            for path in self.objects_dir.glob('*/*'):
+                if not path.name.endswith('.tmp'):
+                    objects += 1
+                    stored += path.stat().st_size
+        return {
+            'codes': len(index),
+            'versions': len(versions),
+            'objects': objects,
+            'original_bytes': sum(v['size'] for v in versions),
+            'stored_bytes': stored,
+            'keep_last': self.keep_last,
+            'keep_days': self.keep_days,
+        }
+
+def unique_time(timestamp, existing):
+    """같은 규정에 같은 시각의 버전이 있으면 -2, -3 ... 을 붙인 시각"""
+    candidate = timestamp
+    n = 1
+    while candidate in existing:
+        n += 1
+        candidate = f"{timestamp}-{n}"
+    return candidate
+
+def is_hash_ref(ref):
+    """복원 인자가 시각이 아니라 해시 접두어인지 (a-f가 있거나 list에 표시되는 길이 이상)"""
+    ref = ref.lower()
+    if not re.fullmatch(r'[0-9a-f]{4,64}', ref):
+        return False
+    return len(ref) >= SHORT_HASH or not ref.isdigit()
+
+def regulation_path(code):
+    """규정 카탈로그에서 규정 파일 경로 찾기 (없으면 None)"""
+    from regulation_catalog import get_catalog
+
+    try:
+        reg = get_catalog().get(code)
+    except (OSError, ValueError, sqlite3.Error):
+        return None
+    return project_root / reg['path'] if reg else None
+
+def main():
+    """명령행 실행"""
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__.split('사용법:')[1].rstrip())
+        return 1
+    command, rest = args[0], args[1:]
+    store = BackupStore()
+
+    options = {}
+    positional = []
+    i = 0
+    while i < len(rest):
+        if rest[i] in ('--output', '--keep-last', '--keep-days') and i + 1 < len(rest):
+            options[rest[i]] = rest[i + 1]
+            i += 1
+        else:
+            positional.append(rest[i])
+        i += 1
+
+    if command == 'save' and len(positional) == 2:
+        entry = store.save(positional[0], positional[1])
+        print(f"💾 백업 저장: {positional[0]} {entry['time']} ({entry['sha256'][:SHORT_HASH]})")
+    elif command == 'list':
+        index = store.load_index()
+        for code in (positional or sorted(index)):
+            for version in index.get(code, []):
+                print(f"{code:<8} {version['time']:<22}  {version['sha256'][:SHORT_HASH]}  "
+                      f"{version['size']:>9,}B → {version.get('stored', 0):>8,}B  {version.get('source', '')}")
+    elif command == 'restore' and positional:
+        code = positional[0]
+        timestamp = positional[1] if len(positional) > 1 else None
+        output = options.get('--output') or regulation_path(code)
+        if output is None:
+            print(f"❌ {code}의 파일 경로를 알 수 없습니다. --output으로 지정하세요.")
+            return 1
+        try:
+            entry = store.restore(code, timestamp, output)
+        except KeyError as e:
+            print(f"❌ {e.args[0]}")
+            return 1
+        print(f"♻️  복원 완료: {code} {entry['time']} → {output}")
+    elif command == 'prune':
+        removed = store.prune(int(options['--keep-last']) if '--keep-last' in options else None,
+                              float(options['--keep-days']) if '--keep-days' in options else None)
+        print(f"🗑️  정리된 버전 {removed}개 (규정별 최근 {store.keep_last}개 + {store.keep_days:g}일 유지)")
+    elif command == 'import-legacy':
+        count = store.import_legacy()
+        print(f"📦 기존 백업 파일 {count}개를 저장소로 옮김 ({store.backup_dir})")
+    elif command == 'stats':
+        s = store.stats()
+        ratio = s['stored_bytes'] / s['original_bytes'] * 100 if s['original_bytes'] else 0
+        print(f"📊 규정 {s['codes']}개, 버전 {s['versions']}개, 객체 {s['objects']}개")
+        print(f"   원본 {s['original_bytes'] / 1024 / 1024:.1f}MB → 저장 {s['stored_bytes'] / 1024 / 1024:.2f}MB ({ratio:.1f}%)")
+        print(f"   보존 정책: 규정별 최근 {s['keep_last']}개 + {s['keep_days']:g}일")
+    else:
+        print(__doc__.split('사용법:')[1].rstrip())
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
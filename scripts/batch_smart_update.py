@@ -6,11 +6,18 @@ regulations_source/new/ 폴더의 모든 PDF/DOCX 파일을 자동 처리
 
 사용법:
     python3 scripts/batch_smart_update.py
+    python3 scripts/batch_smart_update.py --jobs 4   # 4개 프로세스로 병렬 변환
+
+--jobs 2 이상이면 변환(pandoc)은 프로세스 풀에서 동시에 실행하고,
+규정 매칭(규정 카탈로그 조회)과 파일 쓰기는
+메인 프로세스에서 순서대로 적용합니다.
 """
 
 import os
 import sys
-import subprocess
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
@@ -24,7 +31,110 @@ def find_regulation_files(directory):
                 files.append(os.path.join(directory, file))
     return sorted(files)
 
+def convert_worker(file):
+    """프로세스 풀 작업: 파일 하나를 MD로 변환 (변환 결과 경로, 소요 시간 반환)"""
+    from smart_update import convert_to_md
+
+    start = time.perf_counter()
+    temp_md = convert_to_md(file)
+    return file, temp_md, time.perf_counter() - start
+
+def run_sequential(files):
+    """파일마다 smart_update.py를 순서대로 실행 (같은 프로세스에서 카탈로그/pandoc 서버 공유)"""
+    from regctl import run_step
+
+    results = []
+
+    for i, file in enumerate(files, 1):
+        print("=" * 80)
+        print(f"[{i}/{len(files)}] {os.path.basename(file)}")
+        print("=" * 80)
+
+        start = time.perf_counter()
+        try:
+            ok = run_step('update', [file]) == 0
+            print("✅ 성공" if ok else "❌ 실패")
+        except Exception as e:
+            ok = False
+            print(f"❌ 오류: {e}")
+
+        results.append((file, ok, None, time.perf_counter() - start))
+        print()
+
+    return results
+
+def run_parallel(files, jobs):
+    """변환은 프로세스 풀에서 병렬로, 매칭/쓰기는 메인 프로세스에서 순서대로 실행"""
+    from regulation_catalog import get_catalog
+    from smart_update import apply_update
+
+    print(f"📚 규정 카탈로그: {get_catalog().count()}개 규정")
+    print(f"⚙️  병렬 변환: {jobs}개 프로세스")
+    print()
+
+    converted = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(convert_worker, file) for file in files]
+        for future in as_completed(futures):
+            try:
+                file, temp_md, elapsed = future.result()
+            except Exception as e:
+                print(f"❌ 변환 작업 오류: {e}")
+                continue
+            converted[file] = (temp_md, elapsed)
+            status = "✅" if temp_md else "❌"
+            print(f"{status} 변환 {elapsed:6.1f}초  {os.path.basename(file)}")
+    print()
+
+    results = []
+    updated_codes = {}
+    for i, file in enumerate(files, 1):
+        print("=" * 80)
+        print(f"[{i}/{len(files)}] {os.path.basename(file)}")
+        print("=" * 80)
+
+        temp_md, convert_time = converted.get(file, (None, None))
+        start = time.perf_counter()
+        if not temp_md:
+            print("❌ 변환 실패")
+            ok = False
+        else:
+            try:
+                # smart_update.py와 같은 매칭/확인/업데이트/아카이브 (변환된 MD 재사용)
+                ok = apply_update(file, temp_md, updated_codes)[0] == 'updated'
+            except Exception as e:
+                ok = False
+                print(f"❌ 오류: {e}")
+            finally:
+                try:
+                    os.remove(temp_md)
+                except OSError:
+                    pass
+
+        results.append((file, ok, convert_time, time.perf_counter() - start))
+        print()
+
+    return results
+
+def print_timing_summary(results, wall_time):
+    """파일별 소요 시간 요약"""
+    print("=" * 80)
+    print("⏱️  파일별 소요 시간")
+    print("=" * 80)
+    print(f"{'결과':<4} {'변환(초)':>9} {'적용(초)':>9}  파일")
+    for file, ok, convert_time, apply_time in results:
+        convert_str = f"{convert_time:9.1f}" if convert_time is not None else f"{'-':>9}"
+        print(f"{'✅' if ok else '❌':<4} {convert_str} {apply_time:9.1f}  {os.path.basename(file)}")
+    print(f"전체 소요 시간: {wall_time:.1f}초")
+    print()
+
 def main():
+    parser = argparse.ArgumentParser(description="regulations_source/new/ 폴더의 PDF/DOCX 일괄 업데이트")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="병렬 변환 프로세스 수 (기본 1: 순차 실행, 0: CPU 코어 수)")
+    args = parser.parse_args()
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
     new_dir = "regulations_source/new"
 
     print("=" * 80)
@@ -55,36 +165,24 @@ def main():
         print(f"  - {os.path.basename(f)}")
     print()
 
-    # 처리
-    success_count = 0
-    failed_count = 0
-    failed_files = []
-
-    for i, file in enumerate(files, 1):
-        print("=" * 80)
-        print(f"[{i}/{len(files)}] {os.path.basename(file)}")
-        print("=" * 80)
-
-        try:
-            result = subprocess.run(
-                ['python3', 'scripts/smart_update.py', file],
-                capture_output=False,
-                text=True
-            )
-
-            if result.returncode == 0:
-                success_count += 1
-                print(f"✅ 성공")
-            else:
-                failed_count += 1
-                failed_files.append(os.path.basename(file))
-                print(f"❌ 실패")
-        except Exception as e:
-            failed_count += 1
-            failed_files.append(os.path.basename(file))
-            print(f"❌ 오류: {e}")
-
-        print()
+    # 처리 (pandoc 서버를 한 번 띄워 두면 변환 프로세스/smart_update.py가 모두 같은 서버 사용)
+    wall_start = time.perf_counter()
+    if len(files) > 1:
+        from pandoc_pool import get_pool
+        if get_pool().start():
+            print(f"🚀 pandoc 서버 사용: {os.environ['PANDOC_SERVER_URL']}")
+            print()
+    if jobs > 1 and len(files) > 1:
+        results = run_parallel(files, jobs)
+    else:
+        results = run_sequential(files)
+    wall_time = time.perf_counter() - wall_start
+
+    success_count = sum(1 for _, ok, _, _ in results if ok)
+    failed_count = len(results) - success_count
+    failed_files = [os.path.basename(file) for file, ok, _, _ in results if not ok]
+
+    print_timing_summary(results, wall_time)
 
     # 결과 요약
     print("=" * 80)
@@ -109,9 +207,10 @@ def main():
         print("   git push")
         print()
 
-        # 백업 파일 정리 안내
-        print("💡 백업 파일 정리:")
-        print("   find regulations -name '*.backup.*' -mtime +7 -delete  # 7일 이상 된 백업 삭제")
+        # 백업 저장소 안내
+        print("💡 백업 (규정별 버전, .cache/backups):")
+        print("   python3 scripts/backup_store.py list <코드>            # 버전 목록")
+        print("   python3 scripts/backup_store.py restore <코드> [시각]  # 되돌리기")
 
 if __name__ == "__main__":
     main()
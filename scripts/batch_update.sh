@@ -1,9 +1,31 @@
 #!/bin/bash
 # regulations_source/new/ 폴더의 모든 DOCX/MD 파일을 일괄 처리
+#
+# 사용법:
+#   ./scripts/batch_update.sh              # 순차 처리
+#   ./scripts/batch_update.sh --jobs 4     # DOCX → MD 변환을 4개씩 병렬 실행
 
 set -e
 
 NEW_DIR="regulations_source/new"
+JOBS=1
+
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -j|--jobs)
+            JOBS="$2"
+            shift 2
+            ;;
+        *)
+            echo "사용법: $0 [--jobs N]"
+            exit 1
+            ;;
+    esac
+done
+
+if [ "$JOBS" = "0" ]; then
+    JOBS=$(nproc 2>/dev/null || echo 1)
+fi
 
 if [ ! -d "$NEW_DIR" ]; then
     echo "❌ $NEW_DIR 폴더가 없습니다."
@@ -33,6 +55,19 @@ echo ""
 
 SUCCESS=0
 FAILED=0
+TIMINGS=""
+
+# 병렬 모드: DOCX → MD 변환을 먼저 동시에 실행 (규정 파일 쓰기는 아래에서 순서대로)
+PRECONVERT_DIR=""
+if [ "$JOBS" -gt 1 ]; then
+    PRECONVERT_DIR=$(mktemp -d)
+    trap 'rm -rf "$PRECONVERT_DIR"' EXIT
+    echo "⚙️  병렬 변환: $JOBS 개 프로세스"
+    find "$NEW_DIR" -maxdepth 1 -type f -name "*.docx" -print0 | \
+        xargs -0 -r -P "$JOBS" -I {} sh -c \
+            './scripts/convert_to_md.sh "$1" "$2/$(basename "$1").md" > /dev/null' _ {} "$PRECONVERT_DIR" || true
+    echo ""
+fi
 
 # regulations_source/new/ 폴더의 모든 DOCX/MD 파일 처리
 for file in "$NEW_DIR"/*.docx "$NEW_DIR"/*.md; do
@@ -52,7 +87,7 @@ for file in "$NEW_DIR"/*.docx "$NEW_DIR"/*.md; do
     if [ -z "$code" ]; then
         echo "⚠️  파일명에서 규정 코드를 추출할 수 없습니다: $filename"
         echo "   파일명을 '3-1-9_제목.docx' 형식으로 변경하세요."
-        ((FAILED++))
+        FAILED=$((FAILED + 1))
         continue
     fi
 
@@ -64,21 +99,40 @@ for file in "$NEW_DIR"/*.docx "$NEW_DIR"/*.md; do
         revision_date=$(date +%Y-%m-%d)
     fi
 
+    # 병렬 모드에서 미리 변환된 MD가 있으면 사용
+    source_file="$file"
+    if [ -n "$PRECONVERT_DIR" ] && [ -f "$PRECONVERT_DIR/$filename.md" ]; then
+        source_file="$PRECONVERT_DIR/$filename.md"
+    fi
+
     # 규정 업데이트
-    if ./scripts/update_regulation.sh "$code" "$file" "$revision_date 개정"; then
+    start_ns=$(date +%s%N)
+    if ./scripts/update_regulation.sh "$code" "$source_file" "$revision_date 개정"; then
         echo "✅ 성공: $filename → $code.md"
-        ((SUCCESS++))
+        SUCCESS=$((SUCCESS + 1))
 
         # 처리된 파일을 history로 이동
         mkdir -p "regulations_source/history/$(date +%Y)"
         mv "$file" "regulations_source/history/$(date +%Y)/"
+        result="✅"
     else
         echo "❌ 실패: $filename"
-        ((FAILED++))
+        FAILED=$((FAILED + 1))
+        result="❌"
     fi
+    elapsed=$(awk "BEGIN {printf \"%.1f\", ($(date +%s%N) - $start_ns) / 1000000000}")
+    TIMINGS="${TIMINGS}${result} ${elapsed}초  ${filename}\n"
     echo ""
 done
 
+if [ -n "$TIMINGS" ]; then
+    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+    echo "⏱️  파일별 소요 시간"
+    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+    printf "%b" "$TIMINGS"
+    echo ""
+fi
+
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 echo "📊 처리 결과"
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+트랜잭션 방식 일괄 파일 쓰기 (임시 파일 + os.replace + 저널)
+
+규정 여러 개를 한 파일씩 덮어쓰다가 중간에 멈추면 트리가 반쯤만 바뀐 상태로 남습니다.
+BatchWriter는 바뀐 파일을 모두 대상 폴더의 임시 파일로 먼저 만들어 두고(준비),
+한 번에 교체(적용)합니다.
+
+- 준비: 대상 옆에 <파일>.<트랜잭션>.tmp 로 쓰기 (같은 파일 시스템 → os.replace가 원자적)
+- 적용 직전: 임시 파일을 한 번에 fsync하고 저널(.cache/journal/<이름>.json)을 기록
+- 적용: 기존 파일을 <파일>.<트랜잭션>.orig 로 하드 링크해 두고 os.replace로 교체,
+  바뀐 폴더는 마지막에 폴더별로 한 번씩만 fsync
+- 완료: .orig 파일과 저널 삭제
+
+적용 도중 프로세스가 죽으면 저널이 남으며, 다음 실행 때 이어서 적용(resume)하거나
+적용 전 상태로 되돌릴(rollback) 수 있습니다. 남은 저널이 있으면 같은 이름의 새 일괄 작업은
+시작하지 않습니다 (PendingBatchError).
+
+사용 예:
+    with BatchWriter('split_and_update') as batch:
+        batch.write_text('regulations/.../3-1-3.md', content)
+        batch.copy('/tmp/변환결과.md', 'regulations/.../3-1-9.md')
+    # with 블록이 예외 없이 끝나면 적용, 예외가 나면 임시 파일만 지우고 기존 파일은 그대로
+
+환경 변수 REGULATION_WRITE_FSYNC=0 이면 fsync를 생략합니다 (CI 등 일회성 환경용).
+
+사용법:
+    python3 scripts/batch_writer.py status
+    python3 scripts/batch_writer.py resume [이름]
+    python3 scripts/batch_writer.py rollback [이름]
+    python3 scripts/batch_writer.py selfcheck          # 적용 도중 중단을 흉내 내어 resume/rollback 결과 확인
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from stage_trace import traced
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+project_root = Path(__file__).resolve().parent.parent
+
+DEFAULT_JOURNAL_DIR = project_root / '.cache' / 'journal'
+JOURNAL_VERSION = 1
+
+class PendingBatchError(RuntimeError):
+    """이전 일괄 작업의 저널이 남아 있음 (resume 또는 rollback 필요)"""
+
+def fsync_enabled():
+    return os.environ.get('REGULATION_WRITE_FSYNC', '1') != '0'
+
+def fsync_path(path, directory=False):
+    """파일 또는 폴더 fsync (폴더 fsync를 지원하지 않는 플랫폼은 생략)"""
+    try:
+        fd = os.open(path, os.O_RDONLY | (getattr(os, 'O_DIRECTORY', 0) if directory else 0))
+    except OSError:
+        if directory:
+            return
+        raise
+    try:
+        os.fsync(fd)
+    except OSError:
+        if not directory:
+            raise
+    finally:
+        os.close(fd)
+
+def journal_path(name, journal_dir=None):
+    return Path(journal_dir or DEFAULT_JOURNAL_DIR) / f"{name}.json"
+
+def load_journal(name, journal_dir=None):
+    """남아 있는 저널 (없으면 None)"""
+    try:
+        with open(journal_path(name, journal_dir), 'r', encoding='utf-8') as f:
+            journal = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return journal if journal.get('version') == JOURNAL_VERSION else None
+
+def pending_journals(journal_dir=None):
+    """남아 있는 저널 이름 목록"""
+    journal_dir = Path(journal_dir or DEFAULT_JOURNAL_DIR)
+    if not journal_dir.is_dir():
+        return []
+    return sorted(path.stem for path in journal_dir.glob('*.json'))
+
+def _remove(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+def _apply_entry(entry):
+    """저널 항목 하나 적용 (여러 번 실행해도 결과가 같음)"""
+    path, tmp, orig = entry['path'], entry['tmp'], entry['orig']
+    if not os.path.exists(tmp) and not entry['delete']:
+        return  # 이미 적용됨
+    if entry['existed'] and not os.path.exists(orig) and os.path.exists(path):
+        try:
+            os.link(path, orig)
+        except OSError:
+            shutil.copy2(path, orig)
+    if entry['delete']:
+        _remove(path)
+    else:
+        os.replace(tmp, path)
+
+def _rollback_entry(entry):
+    """저널 항목 하나를 적용 전 상태로 되돌림"""
+    path, tmp, orig = entry['path'], entry['tmp'], entry['orig']
+    _remove(tmp)
+    if os.path.exists(orig):
+        os.replace(orig, path)
+    elif not entry['existed']:
+        _remove(path)
+
+def _finish(journal, journal_file, durable):
+    """폴더 fsync 후 .orig와 저널 정리"""
+    if durable:
+        for directory in sorted({os.path.dirname(entry['path']) for entry in journal['entries']}):
+            fsync_path(directory, directory=True)
+    for entry in journal['entries']:
+        _remove(entry['orig'])
+    _remove(journal_file)
+
+@contextmanager
+def _locked(journal_dir, name):
+    """같은 이름의 일괄 작업이 동시에 적용되지 않도록 파일 잠금"""
+    journal_dir.mkdir(parents=True, exist_ok=True)
+    with open(journal_dir / f"{name}.lock", 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def recover(name, action='resume', journal_dir=None):
+    """남은 저널 처리 → 처리한 파일 수 (저널이 없으면 0)
+
+    action: 'resume' (나머지 파일까지 적용) 또는 'rollback' (적용 전 상태로 복원)
+    """
+    journal_dir = Path(journal_dir or DEFAULT_JOURNAL_DIR)
+    with _locked(journal_dir, name):
+        journal = load_journal(name, journal_dir)
+        if journal is None:
+            return 0
+        journal_file = journal_path(name, journal_dir)
+        if action == 'resume':
+            for entry in journal['entries']:
+                _apply_entry(entry)
+            _finish(journal, journal_file, fsync_enabled())
+        elif action == 'rollback':
+            for entry in reversed(journal['entries']):
+                _rollback_entry(entry)
+            _finish(journal, journal_file, fsync_enabled())
+        else:
+            raise ValueError(f"알 수 없는 복구 방식: {action}")
+        return len(journal['entries'])
+
+class BatchWriter:
+    """파일 여러 개를 준비한 뒤 한 번에 교체하는 일괄 쓰기"""
+
+    def __init__(self, name, journal_dir=None, fsync=None):
+        self.name = name
+        self.journal_dir = Path(journal_dir or DEFAULT_JOURNAL_DIR)
+        self.fsync = fsync_enabled() if fsync is None else fsync
+        self.txid = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{os.getpid()}"
+        self.entries = {}
+        self.committed = False
+        if load_journal(name, self.journal_dir) is not None:
+            raise PendingBatchError(
+                f"이전 '{name}' 작업이 적용 도중 중단되었습니다. "
+                f"python3 scripts/batch_writer.py resume {name} 또는 rollback {name} 을 먼저 실행하세요.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _entry(self, path, delete=False):
+        path = os.path.abspath(path)
+        if path in self.entries:
+            _remove(self.entries[path]['tmp'])
+        entry = {
+            'path': path,
+            'tmp': f"{path}.{self.txid}.tmp",
+            'orig': f"{path}.{self.txid}.orig",
+            'existed': os.path.exists(path),
+            'delete': delete,
+        }
+        self.entries[path] = entry
+        return entry
+
+    def temp_path(self, path):
+        """path 대신 쓸 임시 파일 경로 (호출한 쪽이 이 경로에 파일을 만듦, 링크 등)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return self._entry(path)['tmp']
+
+    def write_bytes(self, path, data):
+        with open(self.temp_path(path), 'wb') as f:
+            f.write(data)
+
+    def write_text(self, path, text, encoding='utf-8'):
+        self.write_bytes(path, text.encode(encoding))
+
+    def write_json(self, path, data, **kwargs):
+        kwargs.setdefault('ensure_ascii', False)
+        kwargs.setdefault('indent', 2)
+        self.write_text(path, json.dumps(data, **kwargs))
+
+    def copy(self, source, path):
+        shutil.copyfile(source, self.temp_path(path))
+
+    def remove(self, path):
+        """적용 시 path 삭제"""
+        if os.path.exists(path):
+            self._entry(path, delete=True)
+
+    def discard(self, path):
+        """준비한 path를 일괄 작업에서 뺌"""
+        entry = self.entries.pop(os.path.abspath(path), None)
+        if entry:
+            _remove(entry['tmp'])
+
+    def abort(self):
+        """준비한 임시 파일 삭제 (기존 파일은 건드리지 않음)"""
+        for entry in self.entries.values():
+            _remove(entry['tmp'])
+        self.entries = {}
+
+    @traced('write', document=lambda self: self.name)
+    def commit(self):
+        """준비한 파일을 모두 교체 → 교체한 파일 수"""
+        if self.committed:
+            return 0
+        self.committed = True
+        if not self.entries:
+            return 0
+        entries = list(self.entries.values())
+        journal = {
+            'version': JOURNAL_VERSION,
+            'name': self.name,
+            'txid': self.txid,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'entries': entries,
+        }
+        journal_file = journal_path(self.name, self.journal_dir)
+        with _locked(self.journal_dir, self.name):
+            # 1) 준비한 내용을 디스크에 내린 뒤 저널 기록 → 저널이 있으면 모든 임시 파일이 온전함
+            if self.fsync:
+                for entry in entries:
+                    if not entry['delete']:
+                        fsync_path(entry['tmp'])
+            tmp_journal = journal_file.with_suffix('.tmp')
+            with open(tmp_journal, 'w', encoding='utf-8') as f:
+                json.dump(journal, f, ensure_ascii=False, indent=2)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_journal, journal_file)
+            if self.fsync:
+                fsync_path(self.journal_dir, directory=True)
+
+            # 2) 교체 (오류가 나면 바로 되돌리고, 프로세스가 죽으면 저널로 resume / rollback)
+            try:
+                for entry in entries:
+                    _apply_entry(entry)
+            except Exception:
+                for entry in reversed(entries):
+                    _rollback_entry(entry)
+                _finish(journal, journal_file, self.fsync)
+                self.entries = {}
+                raise
+
+            # 3) 폴더 fsync 후 정리
+            _finish(journal, journal_file, self.fsync)
+        self.entries = {}
+        return len(entries)
+
+class SimulatedCrash(BaseException):
+    """selfcheck: 적용 도중 프로세스가 죽은 것처럼 중단 (commit의 except Exception 되돌리기를 건너뜀)"""
+
+@contextmanager
+def _crash_after(function_name, calls):
+    """모듈 함수가 calls번 호출된 뒤 다음 호출에서 SimulatedCrash"""
+    real = globals()[function_name]
+    count = [0]
+
+    def wrapper(*args, **kwargs):
+        if count[0] >= calls:
+            raise SimulatedCrash(function_name)
+        count[0] += 1
+        return real(*args, **kwargs)
+
+    globals()[function_name] = wrapper
+    try:
+        yield
+    finally:
+        globals()[function_name] = real
+
+def _snapshot(directory):
+    """폴더의 파일 이름 → 내용"""
+    return {path.name: path.read_bytes() for path in sorted(Path(directory).iterdir()) if path.is_file()}
+
+def selfcheck():
+    """저널 기록 후 k개 교체한 시점(및 정리 직전)에 중단된 일괄 작업을 resume / rollback하여
+    결과가 적용 후 / 적용 전 상태와 정확히 같은지 확인 → 실패한 경우 수"""
+    original = {'a.md': b'a1', 'b.md': b'b1', 'c.md': b'c1', 'e.md': b'e1'}
+    # a, b, c 변경, d 추가, e 삭제
+    updated = {'a.md': b'a2', 'b.md': b'b2\n', 'c.md': b'c2' * 1000, 'd.md': b'd2'}
+    crash_points = [('_apply_entry', k) for k in range(len(updated) + 1)] + [('_finish', 0)]
+    failures = []
+    for crash in crash_points:
+        for action in ('resume', 'rollback'):
+            # resume은 복구 도중 한 번 더 중단된 경우도 확인
+            for crash_again in ((False, True) if action == 'resume' else (False,)):
+                label = f"{crash[0]} {crash[1]}회 후 중단 → {action}" + (" (복구 중 재중단)" if crash_again else '')
+                with tempfile.TemporaryDirectory() as tmp:
+                    data_dir = Path(tmp) / 'data'
+                    journal_dir = Path(tmp) / 'journal'
+                    data_dir.mkdir()
+                    for name, content in original.items():
+                        (data_dir / name).write_bytes(content)
+
+                    batch = BatchWriter('selfcheck', journal_dir=journal_dir, fsync=False)
+                    for name, content in updated.items():
+                        batch.write_bytes(data_dir / name, content)
+                    batch.remove(data_dir / 'e.md')
+                    try:
+                        with _crash_after(*crash):
+                            batch.commit()
+                        failures.append(f"{label}: 중단되지 않음")
+                        continue
+                    except SimulatedCrash:
+                        pass
+
+                    problems = []
+                    try:
+                        BatchWriter('selfcheck', journal_dir=journal_dir)
+                        problems.append("남은 저널이 있는데 새 일괄 작업이 시작됨")
+                    except PendingBatchError:
+                        pass
+                    if crash_again:
+                        try:
+                            with _crash_after('_apply_entry', 1):
+                                recover('selfcheck', action, journal_dir)
+                        except SimulatedCrash:
+                            pass
+                    recover('selfcheck', action, journal_dir)
+                    expected = updated if action == 'resume' else original
+                    actual = _snapshot(data_dir)
+                    wrong = sorted(name for name in set(actual) | set(expected) if actual.get(name) != expected.get(name))
+                    if wrong:
+                        problems.append(f"기대한 상태와 다른 파일 {wrong} (.tmp/.orig 잔여 포함)")
+                    if load_journal('selfcheck', journal_dir) is not None:
+                        problems.append("저널이 남음")
+                    if recover('selfcheck', action, journal_dir) != 0:
+                        problems.append("두 번째 복구가 다시 적용됨")
+                    failures += [f"{label}: {problem}" for problem in problems]
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print(f"✅ 중단 지점 {len(crash_points)}곳 × resume(재중단 포함)/rollback: 모두 기대한 상태로 복구됨")
+    return len(failures)
+
+def main():
+    """명령행 실행"""
+    args = sys.argv[1:]
+    if not args or args[0] not in ('status', 'resume', 'rollback', 'selfcheck'):
+        print("사용법: python3 scripts/batch_writer.py status | resume [이름] | rollback [이름] | selfcheck")
+        return 1
+    if args[0] == 'selfcheck':
+        return 1 if selfcheck() else 0
+
+    names = pending_journals()
+    if args[0] == 'status':
+        if not names:
+            print("✅ 중단된 일괄 작업 없음")
+            return 0
+        for name in names:
+            journal = load_journal(name) or {}
+            entries = journal.get('entries', [])
+            applied = sum(1 for entry in entries if not entry['delete'] and not os.path.exists(entry['tmp']))
+            print(f"⚠️  {name}  {journal.get('created', '?')}  파일 {len(entries)}개 (교체됨 약 {applied}개)")
+        return 1
+
+    targets = args[1:] or names
+    if not targets:
+        print("✅ 중단된 일괄 작업 없음")
+        return 0
+    for name in targets:
+        count = recover(name, args[0])
+        label = '이어서 적용' if args[0] == 'resume' else '되돌림'
+        print(f"{'✅' if count else 'ℹ️ '} {name}: 파일 {count}개 {label}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
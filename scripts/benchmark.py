@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+파이프라인 벤치마크 (합성 규정집)
+
+실제 규정집과 같은 모양(제목 줄, 제 N 장, 제N조\\[제목\\], ①항, 개정 이력, pandoc HTML 표,
+{.underline} 속성, 이미지 참조)의 합성 규정집을 만들어 처리 단계별 시간을 잽니다.
+
+- generate: 규정 수(35 ~ 5,000)와 크기(5KB ~ 50MB)를 정해 합성 프로젝트를 만듦
+  (통합 MD rulebook.md, 규정별 이전 버전 regulations/<카테고리>/<코드>.md, regulations.json)
+- run: 프리셋별로 아래 단계를 repeat회 실행하여 최솟값/평균을 기록하고 JSON으로 저장
+    split_markdown_content   split_and_update.py  통합 MD 분리
+    find_regulation_by_title smart_update.py      제목 검색 (정확 일치 + 일부 글자를 바꾼 제목)
+    analyze_md_content       process_regulation.py  통합 문서 여부 판단
+    generate_diff_html       split_and_update.py  바뀐 규정의 조문 단위 diff HTML
+    sanitize_for_mdx         split_and_update.py  통합 MD 전체 MDX 정리
+    fix_mdx_first_pass       fix-mdx-issues.py    규정 파일 전체 정리 (수정 있음)
+    fix_mdx_second_pass      fix-mdx-issues.py    이미 정리된 파일 다시 검사 (수정 없음)
+    scan_regulations         regenerate_regulations_db.py  regulations 폴더 스캔
+- compare: 두 결과 JSON을 비교하여 느려진 단계를 표시 (느려진 단계가 있으면 종료 코드 1)
+
+합성 프로젝트는 .cache/benchmarks/rulebooks/ 에 (규정 수, 크기, 시드)별로 한 번만 만들고,
+결과는 .cache/benchmarks/<시각>-<커밋>.json 에 저장합니다.
+
+프리셋:
+    tiny    35개 규정, 5KB
+    ours    35개 규정, 5MB (현재 규정집 크기)
+    medium  500개 규정, 10MB
+    large   5,000개 규정, 50MB
+
+사용법:
+    python3 scripts/benchmark.py generate <출력 폴더> [--regulations N] [--size 5MB] [--seed N]
+    python3 scripts/benchmark.py run [--preset tiny,ours|all] [--regulations N --size 5MB] [--repeat 3] [--output 결과.json]
+    python3 scripts/benchmark.py compare <이전.json> <이후.json> [--threshold 0.2] [--min-ms 5]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import importlib
+import statistics
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+
+BENCH_DIR = project_root / '.cache' / 'benchmarks'
+RESULT_VERSION = 1
+GENERATOR_VERSION = 1
+
+PRESETS = {
+    'tiny': (35, 5 * 1024),
+    'ours': (35, 5 * 1024 * 1024),
+    'medium': (500, 10 * 1024 * 1024),
+    'large': (5000, 50 * 1024 * 1024),
+}
+DEFAULT_PRESETS = ('tiny', 'ours')
+
+# 제목 검색 횟수 (정확 일치 절반 + 변형 제목 절반)
+TITLE_QUERIES = 200
+
+# ── 합성 규정집 생성 ────────────────────────────────────────────
+
+CATEGORIES = [
+    ('1', '0', '1-학교법인'),
+    ('2', '0', '2-학칙'),
+    ('3', '1', '3-학사행정/1-일반행정'),
+    ('3', '2', '3-학사행정/2-인사보수행정'),
+    ('3', '3', '3-학사행정/3-교무행정'),
+    ('3', '4', '3-학사행정/4-학생행정'),
+    ('4', '1', '4-부속기관/1-도서관'),
+    ('4', '2', '4-부속기관/2-연구소'),
+    ('5', '0', '5-위원회'),
+]
+
+TITLE_SUBJECTS = ['교원', '직원', '학생', '조교', '연구원', '장학생', '대학원생', '외국인유학생', '계약직원',
+                  '시간강사', '명예교수', '겸임교원', '객원교수', '신입생', '졸업생', '교환학생', '기숙사생',
+                  '산학협력단', '평생교육원', '부설연구소']
+TITLE_TOPICS = ['인사', '복무', '보수', '포상', '징계', '임용', '승진', '연구년', '출장', '여비', '수당', '장학금',
+                '등록금', '휴학', '복학', '학점인정', '성적평가', '졸업', '논문심사', '안전관리', '보안', '시설사용',
+                '물품관리', '예산집행', '회계감사', '기록물관리', '개인정보보호', '고충처리', '성희롱예방', '윤리']
+TITLE_ACTIONS = ['', '관리', '운영', '심의', '평가', '지원', '선발', '위원회', '시행', '처리']
+TITLE_SUFFIXES = ['규정', '규칙', '지침', '내규']
+
+ARTICLE_TITLES = ['목적', '정의', '적용범위', '구성', '임무', '자격', '절차', '신청', '심사', '의결', '보고',
+                  '기간', '제한', '위임', '준용', '경비', '재심', '기록', '비밀유지', '시행세칙']
+SENTENCE_PARTS = [
+    '이 규정은 {subject}의 {topic}에 관한 사항을 정함을 목적으로 한다.',
+    '{subject}은(는) 총장의 승인을 받아 {topic} 업무를 수행할 수 있다.',
+    '{topic}에 관하여 이 규정에서 정하지 아니한 사항은 관계 법령과 학칙에 따른다.',
+    '위원회는 위원장을 포함한 7인 이상 11인 이내의 위원으로 구성한다.',
+    '제1항의 규정에 의한 신청은 소정의 서식에 의하여 소속 부서장을 거쳐 제출하여야 한다.',
+    '{subject}의 {topic}에 필요한 경비는 예산의 범위 안에서 지원할 수 있다.',
+    '그 밖에 필요한 사항은 총장이 따로 정한다.',
+    '위원은 재적위원 과반수의 출석과 출석위원 과반수의 찬성으로 의결한다.',
+]
+AMENDMENTS = ['(2012. 3. 01.개정)', '(2015. 4. 30.개정)', '(2019. 6. 01., 2025. 3. 31.개정)',
+              '(2021. 9. 01.신설)', '(2024. 2. 18.개정)']
+CIRCLED = '①②③④⑤⑥⑦⑧⑨⑩'
+
+def make_titles(count, rng):
+    """서로 다른 규정 제목 count개 (실제 제목처럼 주체 + 주제 + 동작 + 접미사)"""
+    titles = []
+    seen = set()
+    while len(titles) < count:
+        subject = rng.choice(TITLE_SUBJECTS)
+        topic = rng.choice(TITLE_TOPICS)
+        action = rng.choice(TITLE_ACTIONS)
+        suffix = rng.choice(TITLE_SUFFIXES)
+        # 절반은 띄어쓰기 있는 제목 ("교원 인사 관리 규정" 등), 나머지는 붙여 씀
+        if rng.random() < 0.5:
+            title = ' '.join(part for part in (subject, topic, action) if part) + ' ' + suffix
+        else:
+            title = f"{subject}{topic}{action}{suffix}"
+        key = title.replace(' ', '')
+        if key not in seen:
+            seen.add(key)
+            titles.append(title)
+    return titles
+
+def make_table(rng, rows):
+    """pandoc이 DOCX 표를 변환한 모양의 HTML 표"""
+    cols = rng.randint(3, 7)
+    lines = ['<table>', '<colgroup>'] + ['<col />'] * cols + ['</colgroup>', '<tbody>']
+    for row in range(rows):
+        lines.append('<tr>')
+        for col in range(cols):
+            cell = rng.choice(['구분', '지급액', '비고', '1~3호봉', '**합계**', '~~삭제~~', '월 100,000원', '해당 없음'])
+            style = ' style="text-align: center;"' if row == 0 and col == 0 else ''
+            lines.append(f'<td{style}>{cell}</td>')
+        lines.append('</tr>')
+    lines += ['</tbody>', '</table>']
+    return '\n'.join(lines)
+
+def make_article(number, subject, topic, rng):
+    """제N조\\[제목\\] 본문 (① ② 항, 개정 이력, 가끔 표/속성/이미지)"""
+    fill = {'subject': subject, 'topic': topic}
+    lines = [f"제{number}조\\[{rng.choice(ARTICLE_TITLES)}\\] " + rng.choice(SENTENCE_PARTS).format(**fill)]
+    for i in range(rng.randint(0, 4)):
+        clause = rng.choice(SENTENCE_PARTS).format(**fill)
+        if rng.random() < 0.3:
+            clause = clause[:-1] + rng.choice(AMENDMENTS) + '.'
+        if rng.random() < 0.1:
+            clause += ' [별표 1 참조]{.underline}'
+        lines.append(f"{CIRCLED[i]} {clause}")
+    if rng.random() < 0.05:
+        lines.append(make_table(rng, rng.randint(2, 12)))
+    if rng.random() < 0.02:
+        lines.append(f'![별지 서식](media/image{number}.png){{width="6.2in" height="3.1in"}}')
+    return '\n\n'.join(lines)
+
+def make_regulation(title, size, rng):
+    """제목 + 장/조 구조의 본문 (대략 size바이트, 최소 조문 1개)"""
+    subject = title.split()[0] if ' ' in title else title[:2]
+    topic = rng.choice(TITLE_TOPICS)
+    parts = [title]
+    written = len(title.encode('utf-8'))
+    article = 1
+    chapter = 1
+    while article == 1 or written < size:
+        if article == 1 or rng.random() < 0.08:
+            heading = f"제 {chapter} 장 {'총칙' if chapter == 1 else rng.choice(ARTICLE_TITLES)}"
+            parts.append(heading)
+            written += len(heading.encode('utf-8')) + 2
+            chapter += 1
+        text = make_article(article, subject, topic, rng)
+        parts.append(text)
+        written += len(text.encode('utf-8')) + 2
+        article += 1
+    parts.append('부칙')
+    parts.append('이 규정은 공포한 날부터 시행한다.')
+    return '\n\n'.join(parts) + '\n'
+
+def mutate(text, rng, ratio=0.1):
+    """이전 버전 만들기: 조문 일부의 문구를 바꿈 (diff 대상)"""
+    blocks = text.split('\n\n')
+    for i in range(1, len(blocks)):
+        if blocks[i].startswith('제') and '조\\[' in blocks[i][:8] and rng.random() < ratio:
+            blocks[i] = blocks[i].replace('한다.', '하여야 한다.', 1)
+    return '\n\n'.join(blocks)
+
+def parse_size(text):
+    """'5KB', '50MB', '1.5MB', '5000' → 바이트 수"""
+    text = str(text).strip().upper()
+    for unit, factor in (('KB', 1024), ('MB', 1024 ** 2), ('GB', 1024 ** 3), ('B', 1)):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+def format_size(size):
+    if size >= 1024 ** 2:
+        return f"{size / 1024 ** 2:.0f}MB" if size % 1024 ** 2 == 0 else f"{size / 1024 ** 2:.1f}MB"
+    return f"{size / 1024:.0f}KB"
+
+def generate_rulebook(out_dir, regulations=35, size=5 * 1024 * 1024, seed=0):
+    """합성 프로젝트 생성 → meta dict
+
+    out_dir/rulebook.md                      통합 MD (새 버전, 제목 줄에 # 없음 = pandoc 변환 결과 모양)
+    out_dir/regulations/<카테고리>/<코드>.md   규정별 이전 버전 (조문 약 10%가 다름)
+    out_dir/regulations.json
+    """
+    out_dir = Path(out_dir)
+    rng = random.Random(seed)
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    (out_dir / 'regulations').mkdir(parents=True)
+
+    titles = make_titles(regulations, rng)
+    # 규정 크기는 실제처럼 편차가 크게 (로그 정규분포 가중치)
+    weights = [rng.lognormvariate(0, 1) for _ in titles]
+    total_weight = sum(weights)
+
+    entries = []
+    counters = {}
+    with open(out_dir / 'rulebook.md', 'w', encoding='utf-8') as rulebook:
+        for title, weight in zip(titles, weights):
+            top, sub, category = CATEGORIES[rng.randrange(len(CATEGORIES))]
+            counters[category] = counters.get(category, 0) + 1
+            code = f"{top}-{sub}-{counters[category]}"
+            text = make_regulation(title, int(size * weight / total_weight), rng)
+            rulebook.write(text + '\n')
+
+            rel_path = f"regulations/{category}/{code}.md"
+            (out_dir / rel_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(out_dir / rel_path, 'w', encoding='utf-8') as f:
+                f.write(mutate(text, rng))
+            entries.append({
+                "code": code,
+                "title": title,
+                "title_normalized": title.replace(' ', ''),
+                "category": category,
+                "path": rel_path,
+                "filename": f"{code}.md",
+            })
+
+    with open(out_dir / 'regulations.json', 'w', encoding='utf-8') as f:
+        json.dump({"version": "1.0", "last_updated": "2026-01-01", "total_regulations": len(entries),
+                   "regulations": entries}, f, ensure_ascii=False, indent=2)
+
+    meta = {
+        'generator': GENERATOR_VERSION,
+        'regulations': regulations,
+        'target_size': size,
+        'seed': seed,
+        'rulebook_size': (out_dir / 'rulebook.md').stat().st_size,
+    }
+    # meta.json은 마지막에 기록 (있으면 생성이 끝난 것)
+    with open(out_dir / 'meta.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+def cached_rulebook(regulations, size, seed=0):
+    """.cache/benchmarks/rulebooks/ 의 합성 프로젝트 (없거나 생성기가 바뀌었으면 새로 생성) → (폴더, meta)"""
+    out_dir = BENCH_DIR / 'rulebooks' / f"{regulations}-{format_size(size)}-{seed}"
+    try:
+        with open(out_dir / 'meta.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('generator') == GENERATOR_VERSION:
+            return out_dir, meta
+    except (OSError, ValueError):
+        pass
+    print(f"   🏗️  합성 규정집 생성: {regulations}개 규정, {format_size(size)} → {out_dir}")
+    return out_dir, generate_rulebook(out_dir, regulations, size, seed)
+
+# ── 측정 ────────────────────────────────────────────────────────
+
+def measure(func, repeat, setup=None):
+    """func()를 repeat회 실행 (setup은 매회 실행 전, 시간에 포함하지 않음, 출력은 버림)"""
+    runs = []
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            runs.append(time.perf_counter() - start)
+    return {'best': min(runs), 'mean': statistics.mean(runs), 'runs': runs}, result
+
+def title_queries(regulations, rng):
+    """정확한 제목 절반 + 글자 하나를 빼거나 띄어쓰기를 바꾼 제목 절반"""
+    queries = []
+    for i in range(TITLE_QUERIES):
+        title = rng.choice(regulations)['title']
+        if i % 2:
+            chars = list(title.replace(' ', ''))
+            del chars[rng.randrange(len(chars) - 2)]
+            title = ' '.join(chars[:3]) + ''.join(chars[3:])
+        queries.append(title)
+    return queries
+
+def run_preset(name, regulations, size, repeat, seed=0):
+    """합성 프로젝트 하나로 모든 단계 측정 → 결과 dict"""
+    print(f"\n📏 {name}: {regulations}개 규정, {format_size(size)}")
+    project_dir, meta = cached_rulebook(regulations, size, seed)
+
+    # process_regulation은 import할 때 작업 폴더를 바꾸므로 먼저 import하고 합성 프로젝트로 이동
+    process_regulation = importlib.import_module('process_regulation')
+    import regulation_catalog
+    import title_index
+    import smart_update
+    import split_and_update
+    import regenerate_regulations_db
+    fix_mdx = importlib.import_module('fix-mdx-issues')
+
+    saved = (os.getcwd(), regulation_catalog.DEFAULT_JSON_PATH, title_index.DEFAULT_INDEX_PATH)
+    os.chdir(project_dir)
+    # 카탈로그/제목 색인도 합성 프로젝트 것을 사용 (실제 .cache를 건드리지 않음)
+    regulation_catalog.DEFAULT_JSON_PATH = project_dir / 'regulations.json'
+    title_index.DEFAULT_INDEX_PATH = project_dir / '.cache' / 'title_index.json'
+    try:
+        rulebook_path = project_dir / 'rulebook.md'
+        content = rulebook_path.read_text(encoding='utf-8')
+        regs = regulation_catalog.get_catalog().all()
+        results = {}
+
+        def record(bench, stats, items):
+            stats['items'] = items
+            results[bench] = stats
+            print(f"   {bench:<26} {stats['best'] * 1000:>10.1f}ms  (평균 {stats['mean'] * 1000:.1f}ms, {items}건)")
+
+        stats, split_result = measure(lambda: split_and_update.split_markdown_content(content, regs), repeat)
+        record('split_markdown_content', stats, len(split_result))
+
+        queries = title_queries(regs, random.Random(seed))
+        stats, _ = measure(lambda: [smart_update.find_regulation_by_title(q) for q in queries], repeat)
+        record('find_regulation_by_title', stats, len(queries))
+
+        stats, found = measure(lambda: process_regulation.analyze_md_content(str(rulebook_path), regs), repeat)
+        record('analyze_md_content', stats, found)
+
+        pairs = []
+        for reg in regs:
+            new_lines = split_result.get(reg['code'])
+            if new_lines is None:
+                continue
+            with open(reg['path'], 'r', encoding='utf-8') as f:
+                old_lines = f.read().splitlines()
+            # update_files()처럼 MDX 정리 후 비교
+            new_lines = split_and_update.sanitize_for_mdx('\n'.join(new_lines)).splitlines()
+            if old_lines != new_lines:
+                pairs.append((old_lines, new_lines, reg['title']))
+        stats, _ = measure(lambda: [split_and_update.generate_diff_html(*pair) for pair in pairs], repeat)
+        record('generate_diff_html', stats, len(pairs))
+
+        stats, _ = measure(lambda: split_and_update.sanitize_for_mdx(content), repeat)
+        record('sanitize_for_mdx', stats, content.count('\n'))
+
+        # fix-mdx-issues.py: 원본 규정 파일을 복사해 두고 매회 복사본에서 실행
+        work_dir = project_dir / '.cache' / 'fix_mdx'
+        files = sorted((project_dir / 'regulations').rglob('*.md'))
+
+        def fresh_copy():
+            shutil.rmtree(work_dir, ignore_errors=True)
+            shutil.copytree(project_dir / 'regulations', work_dir)
+
+        def fix_all():
+            return sum(1 for path in files if fix_mdx.fix_markdown_file(work_dir / path.relative_to(project_dir / 'regulations')))
+
+        stats, fixed = measure(fix_all, repeat, setup=fresh_copy)
+        record('fix_mdx_first_pass', stats, fixed)
+        stats, _ = measure(fix_all, repeat)
+        record('fix_mdx_second_pass', stats, len(files))
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+        # 규정 파일은 실제 트리처럼 제목 줄에 '#'이 없으므로 항목 수 대신 읽은 파일 수를 기록
+        stats, _ = measure(lambda: regenerate_regulations_db.scan_regulations('regulations', untitled=[]), repeat)
+        record('scan_regulations', stats, len(files))
+    finally:
+        os.chdir(saved[0])
+        regulation_catalog.DEFAULT_JSON_PATH, title_index.DEFAULT_INDEX_PATH = saved[1], saved[2]
+
+    return {
+        'name': name,
+        'regulations': regulations,
+        'target_size': size,
+        'rulebook_size': meta['rulebook_size'],
+        'seed': seed,
+        'results': results,
+    }
+
+def git_info():
+    """현재 커밋과 작업 트리 변경 여부 (git이 없으면 None)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=project_root,
+                               capture_output=True, text=True, check=True).stdout.strip() != ''
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {'commit': commit, 'dirty': dirty}
+
+def run_benchmarks(presets, repeat=3, output=None):
+    """프리셋 목록 [(이름, 규정 수, 크기)] 측정 후 결과 JSON 저장 → 저장 경로"""
+    git = git_info()
+    data = {
+        'version': RESULT_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'git': git,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'presets': [run_preset(name, regulations, size, repeat) for name, regulations, size in presets],
+    }
+    if output is None:
+        commit = git['commit'] + ('-dirty' if git['dirty'] else '') if git else 'nogit'
+        output = BENCH_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}-{commit}.json"
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, output)
+    return output
+
+def compare(before_path, after_path, threshold=0.2, min_ms=5.0):
+    """두 결과의 단계별 최솟값 비교 → 느려진 단계 수
+
+    threshold: 허용 비율, min_ms: 이전/이후 모두 이보다 짧으면 측정 오차로 보고 표시하지 않음
+    """
+    with open(before_path, 'r', encoding='utf-8') as f:
+        before = json.load(f)
+    with open(after_path, 'r', encoding='utf-8') as f:
+        after = json.load(f)
+
+    def label(data):
+        git = data.get('git') or {}
+        return git.get('commit', '?') + ('-dirty' if git.get('dirty') else '')
+
+    print(f"비교: {label(before)} ({before['created']}) → {label(after)} ({after['created']})")
+    old_presets = {preset['name']: preset for preset in before['presets']}
+    regressions = 0
+    for preset in after['presets']:
+        old = old_presets.get(preset['name'])
+        if old is None:
+            continue
+        print(f"\n📏 {preset['name']}: {preset['regulations']}개 규정, {format_size(preset['target_size'])}")
+        print(f"   {'단계':<26} {'이전':>10} {'이후':>10} {'배율':>7}")
+        for bench, result in preset['results'].items():
+            old_result = old['results'].get(bench)
+            if old_result is None:
+                continue
+            ratio = result['best'] / old_result['best'] if old_result['best'] else float('inf')
+            mark = ''
+            if max(result['best'], old_result['best']) * 1000 < min_ms:
+                pass
+            elif ratio > 1 + threshold:
+                mark = '  ⚠️  느려짐'
+                regressions += 1
+            elif ratio < 1 - threshold:
+                mark = '  ✅ 빨라짐'
+            print(f"   {bench:<26} {old_result['best'] * 1000:>8.1f}ms {result['best'] * 1000:>8.1f}ms "
+                  f"{ratio:>6.2f}x{mark}")
+    return regressions
+
+def parse_options(args):
+    """--이름 값 형식 옵션 → (dict, 나머지 인자)"""
+    options = {}
+    rest = []
+    args = iter(args)
+    for arg in args:
+        if arg.startswith('--'):
+            options[arg[2:]] = next(args, '')
+        else:
+            rest.append(arg)
+    return options, rest
+
+def main():
+    """명령행 실행"""
+    args = sys.argv[1:]
+    if not args or args[0] not in ('generate', 'run', 'compare'):
+        print(__doc__[__doc__.index('사용법:'):].rstrip())
+        return 1
+    command = args[0]
+    options, rest = parse_options(args[1:])
+
+    if command == 'generate':
+        if not rest:
+            print("❌ 출력 폴더를 지정하세요.")
+            return 1
+        meta = generate_rulebook(rest[0], int(options.get('regulations', 35)),
+                                 parse_size(options.get('size', '5MB')), int(options.get('seed', 0)))
+        print(f"✅ {rest[0]}: {meta['regulations']}개 규정, rulebook.md {format_size(meta['rulebook_size'])}")
+        return 0
+
+    if command == 'compare':
+        if len(rest) < 2:
+            print("❌ 비교할 결과 JSON 두 개를 지정하세요.")
+            return 1
+        regressions = compare(rest[0], rest[1], float(options.get('threshold', 0.2)),
+                              float(options.get('min-ms', 5.0)))
+        print()
+        print(f"⚠️  느려진 단계 {regressions}개" if regressions else "✅ 느려진 단계 없음")
+        return 1 if regressions else 0
+
+    if 'regulations' in options or 'size' in options:
+        regulations = int(options.get('regulations', 35))
+        size = parse_size(options.get('size', '5MB'))
+        presets = [(f"custom-{regulations}-{format_size(size)}", regulations, size)]
+    else:
+        names = options.get('preset', ','.join(DEFAULT_PRESETS))
+        names = list(PRESETS) if names == 'all' else [name.strip() for name in names.split(',') if name.strip()]
+        unknown = [name for name in names if name not in PRESETS]
+        if unknown:
+            print(f"❌ 알 수 없는 프리셋: {', '.join(unknown)} (사용 가능: {', '.join(PRESETS)}, all)")
+            return 1
+        presets = [(name, *PRESETS[name]) for name in names]
+
+    output = run_benchmarks(presets, int(options.get('repeat', 3)), options.get('output'))
+    print(f"\n💾 결과 저장: {output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+변환 결과 캐시 (PDF/DOCX → Markdown)
+
+기능:
+- 입력 파일 내용의 해시 + 변환기 버전 + 변환 옵션을 키로 변환 결과(MD) 저장
+- 캐시 적중 시 pdf2docx / pandoc 실행을 완전히 생략
+- 전체 크기 제한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 적중/실패/삭제 통계 기록
+
+캐시 위치는 기본적으로 <프로젝트 루트>/.cache/conversion 이며
+환경 변수로 조정할 수 있습니다.
+    CONVERSION_CACHE_DIR      캐시 폴더 경로
+    CONVERSION_CACHE_MAX_MB   최대 크기 (MB, 기본 512)
+    CONVERSION_CACHE_DISABLE  1 이면 캐시 사용 안 함
+
+사용법:
+    python3 scripts/conversion_cache.py stats
+    python3 scripts/conversion_cache.py clear
+    python3 scripts/conversion_cache.py convert <docx파일> <출력md파일>
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+project_root = Path(__file__).resolve().parent.parent
+
+DEFAULT_CACHE_DIR = project_root / '.cache' / 'conversion'
+DEFAULT_MAX_MB = 512
+
+_version_cache = {}
+
+def pandoc_version():
+    """설치된 pandoc 버전 (프로세스당 1회만 조회)"""
+    if 'pandoc' not in _version_cache:
+        try:
+            result = subprocess.run(['pandoc', '--version'], capture_output=True,
+                                    text=True, encoding='utf-8')
+            first_line = result.stdout.splitlines()[0] if result.stdout else ''
+            _version_cache['pandoc'] = first_line.strip() or 'unknown'
+        except (FileNotFoundError, OSError):
+            _version_cache['pandoc'] = 'unknown'
+    return _version_cache['pandoc']
+
+def pdf2docx_version():
+    """설치된 pdf2docx 버전 (패키지 import 없이 메타데이터로 조회)"""
+    if 'pdf2docx' not in _version_cache:
+        try:
+            from importlib.metadata import version
+            _version_cache['pdf2docx'] = version('pdf2docx')
+        except Exception:
+            _version_cache['pdf2docx'] = 'unknown'
+    return _version_cache['pdf2docx']
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ConversionCache:
+    """내용 기반(content-addressed) 변환 결과 캐시"""
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = Path(cache_dir or os.environ.get('CONVERSION_CACHE_DIR') or DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('CONVERSION_CACHE_MAX_MB', DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.enabled = os.environ.get('CONVERSION_CACHE_DISABLE', '') not in ('1', 'true', 'yes')
+        self.objects_dir = self.cache_dir / 'objects'
+        self.stats_path = self.cache_dir / 'stats.json'
+        self.lock_path = self.cache_dir / '.lock'
+
+    def make_key(self, input_path, pipeline, options=None):
+        """캐시 키 생성: 입력 해시 + 변환 파이프라인/버전 + 옵션"""
+        return self.make_key_from_digest(hash_file(input_path), pipeline, options)
+
+    def make_key_from_digest(self, digest, pipeline, options=None):
+        """이미 계산된 내용 해시(예: PDF 페이지 단위)로 캐시 키 생성"""
+        payload = {
+            'input': digest,
+            'pipeline': pipeline,
+            'options': options or {},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def _object_path(self, key):
+        return self.objects_dir / key[:2] / f"{key}.md"
+
+    @contextmanager
+    def _locked(self):
+        """여러 프로세스가 동시에 캐시를 갱신할 때를 위한 파일 잠금"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_stats(self):
+        try:
+            with open(self.stats_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _bump(self, field, amount=1):
+        with self._locked():
+            stats = self._load_stats()
+            stats[field] = stats.get(field, 0) + amount
+            with open(self.stats_path, 'w', encoding='utf-8') as f:
+                json.dump(stats, f)
+
+    def get(self, key):
+        """캐시된 MD 경로 반환 (없으면 None). 적중 시 LRU 순서 갱신"""
+        if not self.enabled:
+            return None
+        path = self._object_path(key)
+        if path.exists():
+            try:
+                os.utime(path)  # 최근 사용 시각 = mtime
+            except OSError:
+                pass
+            self._bump('hits')
+            return path
+        self._bump('misses')
+        return None
+
+    def put(self, key, md_path):
+        """변환 결과를 캐시에 저장하고 크기 제한 초과분 정리"""
+        if not self.enabled:
+            return
+        path = self._object_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 임시 파일에 복사 후 교체 (동시 실행 시 반쯤 쓰인 파일 방지)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        os.close(fd)
+        shutil.copyfile(md_path, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def put_text(self, key, text):
+        """문자열 결과를 캐시에 저장"""
+        if not self.enabled:
+            return
+        fd, tmp_path = tempfile.mkstemp(suffix='.md')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            self.put(key, tmp_path)
+        finally:
+            os.unlink(tmp_path)
+
+    def read_text(self, key):
+        """캐시된 결과를 문자열로 읽기 (get()으로 적중 확인 후 사용)"""
+        with open(self._object_path(key), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def copy_to_temp(self, key, suffix='.md'):
+        """캐시된 결과를 새 임시 파일로 복사 (호출한 쪽에서 자유롭게 삭제 가능)
+
+        get() 이후 다른 프로세스의 evict()로 항목이 사라졌으면 None (캐시 미적중으로 처리)
+        """
+        fd, temp_path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        try:
+            shutil.copyfile(self._object_path(key), temp_path)
+        except FileNotFoundError:
+            os.remove(temp_path)
+            return None
+        return temp_path
+
+    def _entries(self):
+        if not self.objects_dir.exists():
+            return []
+        entries = []
+        for path in self.objects_dir.glob('*/*.md'):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self):
+        """최대 크기를 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        with self._locked():
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                    total -= size
+                    evicted += 1
+                except OSError:
+                    pass
+        if evicted:
+            self._bump('evictions', evicted)
+        return evicted
+
+    def stats(self):
+        """적중/실패/삭제 횟수와 현재 크기"""
+        stats = self._load_stats()
+        entries = self._entries()
+        stats['entries'] = len(entries)
+        stats['bytes'] = sum(size for _, size, _ in entries)
+        stats['max_bytes'] = self.max_bytes
+        lookups = stats.get('hits', 0) + stats.get('misses', 0)
+        stats['hit_rate'] = stats.get('hits', 0) / lookups if lookups else 0.0
+        return stats
+
+    def stats_line(self):
+        """로그용 한 줄 요약"""
+        s = self.stats()
+        return (f"적중 {s.get('hits', 0)}회 / 실패 {s.get('misses', 0)}회 "
+                f"(적중률 {s['hit_rate'] * 100:.0f}%), "
+                f"{s['entries']}개 항목 {s['bytes'] / 1024 / 1024:.1f}MB / {s['max_bytes'] / 1024 / 1024:.0f}MB")
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._locked():
+            if self.objects_dir.exists():
+                shutil.rmtree(self.objects_dir)
+            if self.stats_path.exists():
+                self.stats_path.unlink()
+
+def pdf_pipeline():
+    """PDF → DOCX → Markdown 파이프라인 식별자"""
+    return f"pdf2docx {pdf2docx_version()} | {pandoc_version()} -t markdown"
+
+def docx_pipeline():
+    """DOCX → Markdown 파이프라인 식별자"""
+    return f"{pandoc_version()} -f docx -t markdown"
+
+def main():
+    """명령행 실행: stats / clear / convert"""
+    if len(sys.argv) < 2 or sys.argv[1] not in ('stats', 'clear', 'convert'):
+        print("사용법:")
+        print(f"  python3 {sys.argv[0]} stats")
+        print(f"  python3 {sys.argv[0]} clear")
+        print(f"  python3 {sys.argv[0]} convert <docx파일> <출력md파일>")
+        return 1
+
+    cache = ConversionCache()
+    command = sys.argv[1]
+
+    if command == 'stats':
+        print(f"📦 변환 캐시: {cache.cache_dir}")
+        print(f"   {cache.stats_line()}")
+        return 0
+
+    if command == 'clear':
+        cache.clear()
+        print(f"🗑️  변환 캐시 삭제: {cache.cache_dir}")
+        return 0
+
+    if len(sys.argv) < 4:
+        print(f"사용법: python3 {sys.argv[0]} convert <docx파일> <출력md파일>")
+        return 1
+
+    input_path, output_path = sys.argv[2], sys.argv[3]
+    key = cache.make_key(input_path, docx_pipeline())
+    if cache.get(key):
+        shutil.copyfile(cache._object_path(key), output_path)
+        print(f"♻️  변환 캐시 적중 (pandoc 생략): {output_path}")
+        return 0
+
+    # 상주 pandoc 서버(pandoc_pool.py serve)가 떠 있으면 서버로, 없으면 CLI로 변환
+    from pandoc_pool import convert_file, describe
+    result = convert_file(input_path, output_path, 'docx', 'markdown')
+    if not result['ok']:
+        print(f"❌ Pandoc 변환 실패: {result['error']}")
+        return 1
+
+    print(f"⏱️  pandoc 변환 {describe(result)}")
+    cache.put(key, output_path)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,12 @@
 #!/bin/bash
 # DOCX를 MD로 변환하는 스크립트
+# 변환 캐시(scripts/conversion_cache.py)를 사용하여 내용이 같은 파일은 다시 변환하지 않음
 
 set -e
 
 DOCX_FILE=$1
 OUTPUT_MD=${2:-output.md}
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 
 if [ -z "$DOCX_FILE" ]; then
     echo "사용법: $0 <docx파일> [출력md파일]"
@@ -19,8 +21,12 @@ fi
 
 echo "📄 변환 중: $DOCX_FILE → $OUTPUT_MD"
 
-# pandoc으로 변환
-pandoc -f docx -t markdown "$DOCX_FILE" -o "$OUTPUT_MD"
+# pandoc으로 변환 (캐시 적중 시 pandoc 생략, pandoc_pool.py serve로 띄운 서버가 있으면 서버 사용)
+if command -v python3 >/dev/null 2>&1; then
+    python3 "$SCRIPT_DIR/conversion_cache.py" convert "$DOCX_FILE" "$OUTPUT_MD"
+else
+    pandoc -f docx -t markdown "$DOCX_FILE" -o "$OUTPUT_MD"
+fi
 
 echo "✅ 변환 완료: $OUTPUT_MD"
 echo ""
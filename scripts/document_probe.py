@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+문서 사전 분석(probe) 모듈
+
+pandoc 변환 없이 원본 파일에서 바로 텍스트를 읽어
+- 첫 단락(제목) 추출
+- 문서에 포함된 규정 제목 탐지 (단일 규정 / 통합 문서 판단)
+을 빠르게 수행합니다.
+
+DOCX는 zip 안의 word/document.xml을 증분 XML 파서(iterparse)로
+스트리밍하므로 문서 전체를 메모리에 올리지 않습니다.
+
+PDF는 텍스트 레이어를 페이지 단위로 읽고 필요한 만큼만 읽은 뒤 멈춥니다.
+(pdf2docx가 사용하는 PyMuPDF를 그대로 사용하며, 없으면 pypdf를 시도합니다.
+ 스캔 이미지처럼 텍스트 레이어가 없으면 has_text_layer가 False입니다.)
+
+사용법:
+    python3 scripts/document_probe.py regulations_source/new/규정집.docx
+    python3 scripts/document_probe.py regulations_source/new/규정집.pdf
+"""
+
+import os
+import re
+import sys
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+
+from title_index import normalize_title
+from title_matcher import get_title_matcher
+from stage_trace import traced
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# 일반적인 규정 패턴: "XXX규정", "XXX규칙", "XXX지침", "XXX정관", "XXX내규"
+REG_PATTERN = re.compile(r'^[\s\d\.\-]*(.{2,30}(?:규정|규칙|지침|정관|내규|행동강령))[\s]*$')
+
+def iter_docx_paragraphs(docx_path):
+    """DOCX 단락을 순서대로 스트리밍 (제목 스타일 단락은 '# ' 접두어)
+
+    호출한 쪽에서 반복을 멈추면 나머지 XML은 읽지 않습니다.
+    """
+    with zipfile.ZipFile(docx_path) as zf:
+        with zf.open('word/document.xml') as xml_file:
+            texts = []
+            is_heading = False
+            depth = 0
+            for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    if tag == W_NS + 'p':
+                        depth += 1
+                        if depth == 1:
+                            texts = []
+                            is_heading = False
+                    continue
+
+                if tag == W_NS + 't':
+                    texts.append(elem.text or '')
+                elif tag == W_NS + 'tab':
+                    texts.append('\t')
+                elif tag == W_NS + 'pStyle':
+                    style = elem.get(W_NS + 'val', '')
+                    if style.lower().startswith(('heading', 'title')) or style.isdigit():
+                        is_heading = True
+                elif tag == W_NS + 'p':
+                    depth -= 1
+                    if depth == 0:
+                        text = ''.join(texts).strip()
+                        elem.clear()
+                        yield f"# {text}" if is_heading and text else text
+                elif tag == W_NS + 'body':
+                    elem.clear()
+
+def iter_pdf_pages(pdf_path):
+    """PDF 텍스트 레이어를 페이지 단위로 스트리밍 (페이지별 라인 리스트)"""
+    try:
+        try:
+            import pymupdf as fitz
+        except ImportError:
+            import fitz
+    except ImportError:
+        fitz = None
+
+    if fitz is not None:
+        doc = fitz.open(pdf_path)
+        try:
+            for page in doc:
+                yield page.get_text('text').splitlines()
+        finally:
+            doc.close()
+        return
+
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError("PDF 텍스트 추출 도구가 없습니다 (pip install pdf2docx 또는 pypdf)")
+
+    for page in PdfReader(pdf_path).pages:
+        yield (page.extract_text() or '').splitlines()
+
+def find_titles_in_lines(lines, regulations, verbose=True):
+    """텍스트 라인에서 regulations.json에 등록된 규정 제목 탐지
+
+    1. Markdown 헤딩(# 제목)
+    2. 일반 텍스트 라인 (헤딩이 없는 경우)
+    3. 규정/규칙 패턴
+    """
+    # 제목 매핑 (정규화된 제목 -> 규정)과 포함 여부 검사용 오토마톤
+    matcher = get_title_matcher(regulations, normalize_title)
+    title_map = matcher.by_key
+
+    if not isinstance(lines, list):
+        lines = list(lines)
+    found_titles = set()  # 중복 방지
+
+    # 방법 1: Markdown 헤딩에서 찾기 (# 제목)
+    for line in lines:
+        if line.strip().startswith('#'):
+            title = re.sub(r'^#+\s*', '', line.strip())
+            normalized = normalize_title(title)
+            if normalized in title_map:
+                found_titles.add(title_map[normalized]['title'])
+
+    # 방법 2: 일반 텍스트에서 규정 제목 매칭 (PDF 변환 후 헤딩이 없는 경우)
+    if len(found_titles) < 3:
+        if verbose:
+            print("   📝 헤딩에서 제목을 찾지 못해 전체 텍스트 검색 중...")
+        for line in lines:
+            line_normalized = normalize_title(line)
+            if len(line.strip()) < 80:
+                # 라인 내에 제목이 포함된 경우 (짧은 라인만, 정확히 일치 포함)
+                for norm_title in matcher.contained(line_normalized):
+                    found_titles.add(title_map[norm_title]['title'])
+            elif line_normalized in title_map:
+                # 라인이 규정 제목과 정확히 일치하는 경우
+                found_titles.add(title_map[line_normalized]['title'])
+
+    # 방법 3: 규정/규칙 패턴으로 추가 탐지
+    if len(found_titles) < 3:
+        if verbose:
+            print("   📝 규정 패턴 기반 검색 중...")
+        for line in lines:
+            match = REG_PATTERN.match(line.strip())
+            if match:
+                potential_title = match.group(1).strip()
+                norm_potential = normalize_title(potential_title)
+                if norm_potential in title_map:
+                    found_titles.add(title_map[norm_potential]['title'])
+
+    return found_titles
+
+def first_meaningful_line(lines):
+    """의미 있는 첫 줄 (3글자 이상, 헤딩 기호 제거)"""
+    for line in lines:
+        line = re.sub(r'^#+\s*', '', line.strip()).strip('*').strip()
+        if line and len(line) > 2:
+            return line
+    return None
+
+def probe_docx(docx_path, regulations=None, max_paragraphs=20):
+    """DOCX 사전 분석 (pandoc 미사용)
+
+    반환: {
+        'title': 의미 있는 첫 단락,
+        'paragraphs': 처음 max_paragraphs개의 비어 있지 않은 단락,
+        'matched_titles': 문서에서 발견된 규정 제목 (regulations가 주어진 경우),
+        'paragraph_count': 읽은 단락 수,
+        'elapsed': 소요 시간(초),
+    }
+    regulations를 주지 않으면 첫 단락들만 읽고 바로 멈춥니다.
+    """
+    start = time.perf_counter()
+    paragraphs = []
+    lines = []
+
+    for text in iter_docx_paragraphs(docx_path):
+        if text:
+            if len(paragraphs) < max_paragraphs:
+                paragraphs.append(text)
+            lines.append(text)
+        if regulations is None and len(paragraphs) >= max_paragraphs:
+            break
+
+    matched_titles = set()
+    if regulations is not None:
+        matched_titles = find_titles_in_lines(lines, regulations, verbose=False)
+
+    return {
+        'title': first_meaningful_line(paragraphs),
+        'paragraphs': paragraphs,
+        'matched_titles': sorted(matched_titles),
+        'paragraph_count': len(lines),
+        'elapsed': time.perf_counter() - start,
+    }
+
+def probe_pdf(pdf_path, regulations=None, max_paragraphs=20, stop_after=None):
+    """PDF 사전 분석 (pdf2docx/pandoc 미사용, 텍스트 레이어만 사용)
+
+    반환값은 probe_docx와 같고 다음 항목이 추가됩니다.
+        'page_count': 읽은 페이지 수,
+        'first_title_page': 규정 제목이 처음 나온 페이지 (0부터),
+        'has_text_layer': 텍스트 레이어 존재 여부,
+    stop_after개 이상의 규정 제목을 찾으면 나머지 페이지는 읽지 않습니다.
+    regulations를 주지 않으면 첫 단락들만 읽고 바로 멈춥니다.
+    """
+    start = time.perf_counter()
+    paragraphs = []
+    matched_titles = set()
+    first_title_page = None
+    line_count = 0
+    page_count = 0
+
+    for page_no, page_lines in enumerate(iter_pdf_pages(pdf_path)):
+        page_count += 1
+        page_lines = [line.strip() for line in page_lines if line.strip()]
+        line_count += len(page_lines)
+        for line in page_lines:
+            if len(paragraphs) >= max_paragraphs:
+                break
+            paragraphs.append(line)
+
+        if regulations is None:
+            if len(paragraphs) >= max_paragraphs:
+                break
+            continue
+
+        page_titles = find_titles_in_lines(page_lines, regulations, verbose=False)
+        if page_titles and first_title_page is None:
+            first_title_page = page_no
+        matched_titles |= page_titles
+        if stop_after and len(matched_titles) >= stop_after:
+            break
+
+    return {
+        'title': first_meaningful_line(paragraphs),
+        'paragraphs': paragraphs,
+        'matched_titles': sorted(matched_titles),
+        'paragraph_count': line_count,
+        'page_count': page_count,
+        'first_title_page': first_title_page,
+        'has_text_layer': line_count > 0,
+        'elapsed': time.perf_counter() - start,
+    }
+
+@traced('probe', document=0)
+def probe_file(path, regulations=None, **kwargs):
+    """확장자에 따라 DOCX/PDF 사전 분석"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.docx':
+        return probe_docx(path, regulations, **kwargs)
+    if ext == '.pdf':
+        return probe_pdf(path, regulations, **kwargs)
+    raise ValueError(f"지원하지 않는 파일 형식: {ext}")
+
+def main():
+    """명령행 실행: DOCX/PDF 사전 분석 결과 출력"""
+    if len(sys.argv) < 2:
+        print(f"사용법: python3 {sys.argv[0]} <docx/pdf 파일>")
+        return 1
+
+    input_path = sys.argv[1]
+    if os.path.splitext(input_path)[1].lower() not in ('.docx', '.pdf'):
+        print("❌ DOCX/PDF 파일만 지원합니다.")
+        return 1
+
+    from regulation_catalog import get_catalog
+
+    regulations = get_catalog().all() or None
+
+    result = probe_file(input_path, regulations)
+    print(f"📄 제목: {result['title']}")
+    print(f"📊 단락 {result['paragraph_count']}개, 발견된 규정 제목 {len(result['matched_titles'])}개 "
+          f"({result['elapsed'] * 1000:.1f}ms)")
+    for title in result['matched_titles']:
+        print(f"   - {title}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+RAG용 조문 단위 청크 내보내기 (JSONL)
+
+regulations_for_rag/의 파일 전체를 검색기가 임의 길이로 자르면 조문이 중간에 끊기므로,
+regulation_parser의 조문 트리를 이용해 조/항 경계에 맞춰 청크를 만듭니다.
+
+- 조문 하나가 토큰 예산 이하면 한 청크, 넘으면 항 → 호 → 문단 순으로 나눠 묶음
+- 각 청크: 규정 코드, 제목, 카테고리, 조문 번호/제목, 항 범위, 개정·신설 날짜, 본문
+- 청크 ID는 (규정 코드, 조문, 본문)의 내용 해시 → 내용이 같으면 ID도 같음
+- 내용 해시가 바뀐 규정만 다시 나누고, 새로 생긴 청크만 delta.jsonl에,
+  없어진 청크 ID는 deleted.json에 기록하여 해당 청크만 다시 임베딩
+
+토큰 수는 tiktoken이 설치되어 있으면 cl100k_base로 세고,
+없으면 한글 1글자 = 1토큰, 그 외 4글자 = 1토큰으로 추정합니다.
+
+사용법:
+    python3 scripts/export_rag_chunks.py [--max-tokens 512] [--output .cache/rag_chunks]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+from pathlib import Path
+
+from regulation_parser import get_article_index, project_root, KEY, TITLE, PARENT, START, END, LINE
+from search_index import document_nodes
+from regulation_catalog import get_catalog
+
+DEFAULT_OUTPUT_DIR = project_root / '.cache' / 'rag_chunks'
+DEFAULT_MAX_TOKENS = 512
+CHUNK_VERSION = 1
+
+# (2005. 12. 19., 2025. 3. 31.개정) 안의 날짜
+DATE_PATTERN = re.compile(r'(\d{4})\.\s*(\d{1,2})\.\s*(\d{1,2})\.?')
+AMENDMENT_PATTERN = re.compile(r'\(([^()]*?\d{4}\.\s*\d{1,2}\.\s*\d{1,2}\.?[^()]*?)(개정|신설|삭제|전문개정)\)')
+HANGUL = re.compile(r'[가-힣]')
+
+_encoder = []
+
+def count_tokens(text):
+    """토큰 수 (tiktoken이 있으면 정확히, 없으면 추정)"""
+    if not _encoder:
+        try:
+            import tiktoken
+            _encoder.append(tiktoken.get_encoding('cl100k_base'))
+        except Exception:
+            _encoder.append(None)
+    if _encoder[0] is not None:
+        return len(_encoder[0].encode(text))
+    hangul = len(HANGUL.findall(text))
+    others = len(text) - hangul - text.count(' ') - text.count('\n')
+    return hangul + max(0, others) // 4 + 1
+
+def amendment_dates(text):
+    """본문의 개정/신설/삭제 날짜 → {'개정': [YYYY-MM-DD, ...], ...}"""
+    flat = re.sub(r'\s+', ' ', text)
+    result = {}
+    for body, kind in AMENDMENT_PATTERN.findall(flat):
+        for year, month, day in DATE_PATTERN.findall(body):
+            date = f"{year}-{int(month):02d}-{int(day):02d}"
+            dates = result.setdefault(kind, [])
+            if date not in dates:
+                dates.append(date)
+    return {kind: sorted(dates) for kind, dates in result.items()}
+
+def line_ranges(data, start, end):
+    """줄 단위 바이트 범위"""
+    ranges = []
+    position = start
+    for line in data[start:end].splitlines(keepends=True):
+        ranges.append((position, position + len(line), ''))
+        position += len(line)
+    return ranges
+
+def paragraph_ranges(data, start, end, max_tokens):
+    """빈 줄 기준 문단 바이트 범위 (예산을 넘는 문단은 줄 단위)"""
+    ranges = []
+    block_start = start
+    position = start
+    for line in data[start:end].splitlines(keepends=True):
+        position += len(line)
+        if not line.strip() or position == end:
+            if position > block_start:
+                if count_tokens(data[block_start:position].decode('utf-8', errors='replace')) > max_tokens:
+                    ranges += line_ranges(data, block_start, position)
+                else:
+                    ranges.append((block_start, position, ''))
+            block_start = position
+    if block_start < end:
+        ranges.append((block_start, end, ''))
+    return ranges
+
+def split_range(data, nodes, children, index, start, end, max_tokens):
+    """노드 범위를 예산 이하 조각 [(시작, 끝, 항/호 라벨)]으로 분할 (항 → 호 → 문단)"""
+    if count_tokens(data[start:end].decode('utf-8', errors='replace')) <= max_tokens:
+        return [(start, end, '')]
+
+    kids = [kid for kid in children.get(index, []) if start <= nodes[kid][START] < end]
+    if not kids:
+        return paragraph_ranges(data, start, end, max_tokens)
+
+    pieces = []
+    first = nodes[kids[0]][START]
+    # "제4조\[기강확립\] ① ..."처럼 첫 자식이 제목 줄에서 시작하면 제목 줄은 그 자식에 포함
+    head_on_same_line = b'\n' not in data[start:first]
+    if first > start and not head_on_same_line:
+        pieces.append((start, first, ''))
+    for n, kid in enumerate(kids):
+        kid_start = start if n == 0 and head_on_same_line else nodes[kid][START]
+        kid_end = nodes[kids[n + 1]][START] if n + 1 < len(kids) else end
+        label = nodes[kid][KEY].rsplit(' ', 1)[-1]
+        for piece_start, piece_end, sub_label in split_range(data, nodes, children, kid,
+                                                             kid_start, kid_end, max_tokens):
+            pieces.append((piece_start, piece_end, f"{label} {sub_label}" if sub_label else label))
+    return pieces
+
+def group_pieces(data, pieces, max_tokens):
+    """연속된 조각을 예산 안에서 묶음 → [(시작, 끝, [라벨...])]"""
+    groups = []
+    for start, end, label in pieces:
+        if groups:
+            g_start, _, labels = groups[-1]
+            text = data[g_start:end].decode('utf-8', errors='replace')
+            if count_tokens(text) <= max_tokens:
+                groups[-1] = (g_start, end, labels + ([label] if label and label not in labels else []))
+                continue
+        groups.append((start, end, [label] if label else []))
+    return groups
+
+def chunk_regulation(path, info, reg, max_tokens):
+    """규정 하나를 청크 목록으로 변환"""
+    with open(project_root / path, 'rb') as f:
+        data = f.read()
+    nodes = info['nodes']
+    children = {}
+    for i, node in enumerate(nodes):
+        if node[PARENT] >= 0:
+            children.setdefault(node[PARENT], []).append(i)
+
+    code = info['code']
+    title = reg.get('title') if reg else None
+    chunks = []
+    position = {id(node): i for i, node in enumerate(nodes)}
+    for node in document_nodes(nodes):
+        pieces = split_range(data, nodes, children, position[id(node)], node[START], node[END], max_tokens)
+        groups = group_pieces(data, pieces, max_tokens)
+        for part, (start, end, labels) in enumerate(groups, 1):
+            text = data[start:end].decode('utf-8', errors='replace').strip()
+            if not text:
+                continue
+            if title is None:
+                title = text.splitlines()[0]
+            chunk_id = hashlib.sha256(f"{code}\0{node[KEY]}\0{text}".encode('utf-8')).hexdigest()[:24]
+            chunks.append({
+                'id': chunk_id,
+                'code': code,
+                'title': title,
+                'category': reg.get('category', '') if reg else '',
+                'path': path,
+                'article': node[KEY],
+                'article_title': node[TITLE],
+                'clauses': labels,
+                'part': part,
+                'parts': len(groups),
+                'amendments': amendment_dates(text),
+                'line': node[LINE],
+                'start': start,
+                'end': end,
+                'tokens': count_tokens(text),
+                'text': text,
+            })
+    return chunks
+
+def load_previous(output_dir):
+    """이전 내보내기 결과 → (매니페스트, 규정 코드별 청크)"""
+    try:
+        with open(output_dir / 'manifest.json', 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}, {}
+    previous = {}
+    try:
+        with open(output_dir / 'chunks.jsonl', 'r', encoding='utf-8') as f:
+            for line in f:
+                chunk = json.loads(line)
+                previous.setdefault(chunk['path'], []).append(chunk)
+    except (OSError, ValueError):
+        return {}, {}
+    return manifest, previous
+
+def export_chunks(output_dir=None, max_tokens=DEFAULT_MAX_TOKENS):
+    """바뀐 규정만 다시 청크로 나누고 chunks.jsonl / delta.jsonl / deleted.json 저장"""
+    start = time.perf_counter()
+    output_dir = Path(output_dir or DEFAULT_OUTPUT_DIR)
+    manifest, previous = load_previous(output_dir)
+    settings = {'version': CHUNK_VERSION, 'max_tokens': max_tokens}
+    if manifest.get('settings') != settings:
+        manifest, previous = {}, {}
+    old_files = manifest.get('files', {})
+
+    try:
+        reg_map = {reg['code']: reg for reg in get_catalog().all()}
+    except (OSError, ValueError, KeyError, sqlite3.Error):
+        reg_map = {}
+
+    article_index = get_article_index()
+    files = {}
+    all_chunks = []
+    stats = {'rechunked': 0, 'reused': 0}
+    for path, info in sorted(article_index.files.items()):
+        reg = reg_map.get(info['code'])
+        signature = [info['sha256'], reg]
+        if old_files.get(path) == signature and path in previous:
+            chunks = previous[path]
+            stats['reused'] += 1
+        else:
+            chunks = chunk_regulation(path, info, reg, max_tokens)
+            stats['rechunked'] += 1
+        files[path] = signature
+        all_chunks += chunks
+
+    old_ids = {chunk['id'] for chunks in previous.values() for chunk in chunks}
+    new_ids = {chunk['id'] for chunk in all_chunks}
+    delta = [chunk for chunk in all_chunks if chunk['id'] not in old_ids]
+    deleted = sorted(old_ids - new_ids)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name, rows in (('chunks.jsonl', all_chunks), ('delta.jsonl', delta)):
+        tmp_path = output_dir / f"{name}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for chunk in rows:
+                f.write(json.dumps(chunk, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, output_dir / name)
+    with open(output_dir / 'deleted.json', 'w', encoding='utf-8') as f:
+        json.dump(deleted, f, ensure_ascii=False, indent=2)
+    with open(output_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump({'settings': settings, 'files': files}, f, ensure_ascii=False)
+
+    stats.update({
+        'chunks': len(all_chunks),
+        'added': len(delta),
+        'deleted': len(deleted),
+        'over_budget': sum(1 for chunk in all_chunks if chunk['tokens'] > max_tokens),
+        'elapsed': time.perf_counter() - start,
+    })
+    return stats
+
+def main():
+    """명령행 실행"""
+    max_tokens = DEFAULT_MAX_TOKENS
+    output_dir = DEFAULT_OUTPUT_DIR
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        if args[i] == '--max-tokens' and i + 1 < len(args):
+            max_tokens = int(args[i + 1])
+            i += 1
+        elif args[i] == '--output' and i + 1 < len(args):
+            output_dir = Path(args[i + 1])
+            i += 1
+        i += 1
+
+    stats = export_chunks(output_dir, max_tokens)
+    print(f"✅ RAG 청크 {stats['chunks']}개 (규정 재분할 {stats['rechunked']} / 재사용 {stats['reused']}, "
+          f"{stats['elapsed']:.2f}초)")
+    print(f"   새 청크 {stats['added']}개 → {output_dir / 'delta.jsonl'}")
+    print(f"   삭제 청크 {stats['deleted']}개 → {output_dir / 'deleted.json'}")
+    if stats['over_budget']:
+        print(f"⚠️  예산({max_tokens}토큰)을 넘는 청크 {stats['over_budget']}개 (나눌 경계가 없는 긴 줄)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+MDX 호환 정리기 (한 번 훑기, 스트리밍)
+
+fix-mdx-issues.py의 정규식 10여 개와 split_and_update.sanitize_for_mdx()의 규칙을
+토큰 하나짜리 정규식으로 합쳐 텍스트를 한 번만 훑으며 모두 적용합니다.
+
+- Pandoc 속성 구문 제거: {.underline}, {#id .class}, {width="..." height="..."}
+  ('{'가 있는 부분만 먼저 지움 — 칸 강조는 속성을 지운 뒤 모양으로 판단하므로)
+- HTML 태그의 style 속성 제거 (React는 style을 객체로 기대함)
+- 표 칸(<td>, <th>) 안의 ~ → &#126; (취소선으로 해석되지 않도록)
+- <td>~~text~~</td>, <td>**text**</td>, <td>*text*</td> → <td>text</td> (안쪽 text에도 나머지 규칙 적용)
+- 누락된 이미지 참조 ![alt](media/...) → <!-- 이미지: alt (원본 파일 누락) -->
+- <td> 바로 뒤 <p>/<blockquote>, </p>/</blockquote> 바로 뒤 </td>는 줄을 나눔 (MDX 중첩 오류)
+
+기존 방식은 <t[dh][^>]*>.*?</t[dh]> (DOTALL)처럼 파일 전체를 여러 번 다시 훑었지만,
+여기서는 표 칸 안인지를 상태로 들고 다니므로 입력 크기에 비례하는 시간이 걸립니다.
+입력은 조각(chunk) 단위로 넣을 수 있고, 빈 줄 경계까지만 처리하고 나머지는 다음 조각과 이어 처리합니다.
+
+사용법:
+    python3 scripts/mdx_sanitizer.py <md 파일>...          # 정리 결과를 표준 출력으로
+    python3 scripts/mdx_sanitizer.py bench [파일 수]        # 가장 큰 규정 파일로 기존 방식과 속도 비교
+    python3 scripts/mdx_sanitizer.py verify [md 파일...]    # 기존 방식과 결과가 바이트 단위로 같은지 확인
+                                                            # (파일을 주지 않으면 regulations/ 전체 + 표 위주/칸 강조 예시)
+"""
+
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+
+# 모든 갈래가 글자 하나로 시작해야 정규식 엔진이 후보 위치를 빠르게 건너뜀 (갈래를 그룹으로 감싸지 않음)
+# 태그는 표 칸/문단 태그와 style 속성이 있는 태그만 토큰 (나머지는 일반 텍스트)
+TOKEN_PATTERN = re.compile(r'''
+    !\[(?P<alt>[^\]]*)\]\(media/[\w.]+\)(?:\{[^}]*\})?
+  | <td>(?P<mark>~~|\*\*|\*)(?P<inner>(?:(?!</?t[dh][\s>]).)+?)(?P=mark)</td>
+  | <(?P<cell>t[dh])(?P<cell_attrs>\s[^<>]*)?>(?P<body>[^<{]*(?:<(?!/?t[dh][\s>])[^<{]*)*)(?P<cell_end></t[dh]>)
+  | <(?P<close>/?)(?P<name>td|th|p|blockquote)(?P<attrs>(?:\s[^<>]*)?)>
+  | <(?P<styled>[A-Za-z][\w-]*)(?P<styled_attrs>\s[^<>]*?style=[^<>]*)>
+''', re.VERBOSE)
+# Pandoc 속성 구문: 기존 규칙과 같은 세 정규식을 같은 순서로 ('{'로 시작하므로 빠르게 훑음)
+# 칸 강조(<td>**…**</td>) 판단은 속성을 지운 뒤의 텍스트로 해야 기존 방식과 같아지므로 토큰보다 먼저 적용
+ATTR_PATTERNS = (
+    re.compile(r'\{\.[\w-]+\}'),
+    re.compile(r'\{[#\.][\w\s="\'-]*\}'),
+    re.compile(r'\{[\w\s=".\-:]+\}'),
+)
+STYLE_ATTR = re.compile(r'''\s+style=(?:"[^"]*"|'[^']*')''')
+CELL_MARKS = ('~~', '**', '*')
+CELL_TAGS = ('td', 'th')
+BLOCK_TAGS = ('p', 'blockquote')
+# 이만큼 쌓이도록 빈 줄이 없으면 줄 경계에서라도 처리 (긴 HTML 표 등)
+MAX_PENDING = 1 << 20
+# verify에서 쓰는 조각 크기 (빈 줄/태그 중간에서 잘리도록 일부러 어중간한 크기 포함)
+VERIFY_CHUNK_SIZES = (97, 777, 1 << 16)
+
+class MdxSanitizer:
+    """조각 단위로 넣으면 정리된 텍스트를 돌려주는 상태 기계
+
+    fixes: 항목별 수정 횟수 {'attr', 'style', 'tilde', 'cell_markup', 'media', 'nesting'}
+    """
+
+    def __init__(self):
+        self.pending = ''
+        self.in_cell = False
+        self.last_tag = None
+        self.fixes = {}
+
+    def _count(self, kind, n=1):
+        if n:
+            self.fixes[kind] = self.fixes.get(kind, 0) + n
+
+    def _text(self, text, out):
+        if not text:
+            return
+        if self.in_cell and '~' in text:
+            self._count('tilde', text.count('~'))
+            text = text.replace('~', '&#126;')
+        out.append(text)
+        self.last_tag = None
+
+    def _tag(self, close, name, attrs, out):
+        tag = f"<{close}{name}{attrs}>"
+        if 'style=' in attrs:
+            attrs, removed = STYLE_ATTR.subn('', attrs)
+            if removed:
+                self._count('style', removed)
+                tag = f"<{close}{name}{attrs}>"
+
+        if (not close and name in BLOCK_TAGS and self.last_tag == 'td') or \
+                (close and name == 'td' and self.last_tag in ('/p', '/blockquote')):
+            self._count('nesting')
+            out.append('\n')
+        out.append(tag)
+
+        if name in CELL_TAGS:
+            self.in_cell = not close
+        self.last_tag = close + name
+
+    def _cell_markup(self, match, out):
+        inner = match.group('inner')
+        # 기존 규칙처럼 ~~ → ** → * 순서로 한 겹씩 벗김
+        for mark in CELL_MARKS[CELL_MARKS.index(match.group('mark')) + 1:]:
+            if len(inner) > 2 * len(mark) and inner.startswith(mark) and inner.endswith(mark):
+                inner = inner[len(mark):-len(mark)]
+        self._count('cell_markup')
+        # 칸 안의 이미지, style, ~, <p> 줄 나눔도 똑같이 정리되도록 내용을 다시 토큰 단위로 처리
+        self._tag('', 'td', '', out)
+        self._tokens(inner, out)
+        self._tag('/', 'td', '', out)
+
+    def _whole_cell(self, name, attrs, body, end, out):
+        """<td>...</td>를 한 번에 처리 (칸 안의 ~, 앞뒤 <p> 줄 나눔)"""
+        self._tag('', name, attrs, out)
+        if name == 'td' and body.startswith(('<p>', '<blockquote>')):
+            self._count('nesting')
+            out.append('\n')
+        if '~' in body:
+            self._count('tilde', body.count('~'))
+            body = body.replace('~', '&#126;')
+        out.append(body)
+        if end == '</td>' and body.endswith(('</p>', '</blockquote>')):
+            self._count('nesting')
+            out.append('\n')
+        out.append(end)
+        self.in_cell = False
+        self.last_tag = end[1:-1]
+
+    def _process(self, text):
+        for pattern in ATTR_PATTERNS:
+            if '{' not in text:
+                break
+            text, removed = pattern.subn('', text)
+            self._count('attr', removed)
+        out = []
+        self._tokens(text, out)
+        return ''.join(out)
+
+    def _tokens(self, text, out):
+        position = 0
+        while True:
+            match = TOKEN_PATTERN.search(text, position)
+            if match is None:
+                break
+            if match.start() > position:
+                self._text(text[position:match.start()], out)
+            position = match.end()
+            kind = match.lastgroup
+            if kind == 'cell_end':
+                name, attrs, body, end = match.group('cell', 'cell_attrs', 'body', 'cell_end')
+                if self.in_cell or '![' in body or 'style=' in body:
+                    # 칸 안에 다른 토큰이 있으면 여는 태그만 처리하고 내용은 토큰 단위로
+                    self._tag('', name, attrs or '', out)
+                    position = match.start('body')
+                else:
+                    self._whole_cell(name, attrs or '', body, end, out)
+            elif kind == 'attrs':
+                self._tag(*match.group('close', 'name', 'attrs'), out)
+            elif kind == 'styled_attrs':
+                self._tag('', *match.group('styled', 'styled_attrs'), out)
+            elif kind == 'inner':
+                self._cell_markup(match, out)
+            else:
+                self._count('media')
+                alt = match.group('alt')
+                if self.in_cell and '~' in alt:
+                    # 기존 방식은 칸 안의 ~를 이미지 참조를 바꾸기 전에 치환
+                    self._count('tilde', alt.count('~'))
+                    alt = alt.replace('~', '&#126;')
+                out.append(f"<!-- 이미지: {alt} (원본 파일 누락) -->")
+                self.last_tag = None
+        self._text(text[position:], out)
+
+    def feed(self, chunk):
+        """조각을 넣고, 빈 줄 경계까지 정리된 텍스트를 반환"""
+        self.pending += chunk
+        cut = self.pending.rfind('\n\n')
+        if cut < 0 and len(self.pending) > MAX_PENDING:
+            cut = self.pending.rfind('\n')
+        if cut < 0:
+            return ''
+        ready, self.pending = self.pending[:cut + 1], self.pending[cut + 1:]
+        return self._process(ready)
+
+    def close(self):
+        """남은 텍스트를 정리하여 반환"""
+        ready, self.pending = self.pending, ''
+        return self._process(ready)
+
+def sanitize_stream(chunks, sanitizer=None):
+    """텍스트 조각 반복자 → 정리된 텍스트 조각 생성기"""
+    sanitizer = sanitizer or MdxSanitizer()
+    for chunk in chunks:
+        piece = sanitizer.feed(chunk)
+        if piece:
+            yield piece
+    piece = sanitizer.close()
+    if piece:
+        yield piece
+
+def sanitize_text(text):
+    """문자열 전체 정리"""
+    sanitizer = MdxSanitizer()
+    return sanitizer.feed(text) + sanitizer.close()
+
+def sanitize_file(src, dst, chunk_size=1 << 16):
+    """파일을 조각 단위로 읽어 정리한 결과를 dst(열린 파일)에 쓰고 수정 항목 반환"""
+    sanitizer = MdxSanitizer()
+    with open(src, 'r', encoding='utf-8') as f:
+        for piece in sanitize_stream(iter(lambda: f.read(chunk_size), ''), sanitizer):
+            dst.write(piece)
+    return sanitizer.fixes
+
+def legacy_sanitize(content):
+    """기존 fix-mdx-issues.py + sanitize_for_mdx()의 여러 번 훑는 정규식 (벤치마크 비교용)"""
+    content = re.sub(r'\{\.[\w-]+\}', '', content)
+    content = re.sub(r'\{[#\.][\w\s="\'-]*\}', '', content)
+    content = re.sub(r'\{[\w\s=".\-:]+\}', '', content)
+    content = re.sub(r'<td>~~(.+?)~~</td>', r'<td>\1</td>', content)
+    content = re.sub(r'<td>\*\*(.+?)\*\*</td>', r'<td>\1</td>', content)
+    content = re.sub(r'<td>\*(.+?)\*</td>', r'<td>\1</td>', content)
+    content = re.sub(r'<(\w+)\s+style="[^"]*"([^>]*)>', r'<\1\2>', content)
+    content = re.sub(r'<(\w+)\s+style=\'[^\']*\'([^>]*)>', r'<\1\2>', content)
+    content = re.sub(r'<(\w+)\s+style="[^"]*"\s*/>', r'<\1 />', content)
+    content = re.sub(r'<(\w+)\s+style=\'[^\']*\'\s*/>', r'<\1 />', content)
+    content = re.sub(r'<t[dh][^>]*>.*?</t[dh]>', lambda m: m.group(0).replace('~', '&#126;'),
+                     content, flags=re.DOTALL)
+    content = re.sub(r'!\[([^\]]*)\]\(media/[\w\.]+\)\{[^}]*\}', r'<!-- 이미지: \1 (원본 파일 누락) -->', content)
+    content = re.sub(r'!\[([^\]]*)\]\(media/[\w\.]+\)', r'<!-- 이미지: \1 (원본 파일 누락) -->', content)
+    content = re.sub(r' style="[^"]*"', '', content)
+    content = re.sub(r'(</p>|</blockquote>)</td>', r'\1\n</td>', content)
+    content = re.sub(r'(<td[^>]*>)(<p>|<blockquote>)', r'\1\n\2', content)
+    return content
+
+def table_heavy_sample(lines, closed=True):
+    """규정 본문 줄을 HTML 표 칸으로 감싼 표 위주 문서 (pandoc 복잡한 표 변환 결과 모사)
+
+    closed=False면 </td>가 빠진 깨진 표 (기존 DOTALL 정규식이 칸마다 파일 끝까지 훑는 경우)
+    """
+    close = '</td>' if closed else ''
+    rows = ['<table>']
+    for i in range(0, len(lines) - 1, 2):
+        rows.append('<tr>')
+        rows.append(f'<td style="width: 30%"><p>{lines[i]} ~ </p>{close}')
+        rows.append(f'<td rowspan="2">{lines[i + 1]}{close}')
+        rows.append('</tr>')
+    rows.append('</table>')
+    return '\n'.join(rows)
+
+def benchmark(count=3, repeat=3):
+    """가장 큰 규정 파일들(+ 표 위주 문서)로 기존 방식과 한 번 훑기 방식 비교"""
+    files = sorted((project_root / 'regulations').rglob('*.md'), key=lambda p: p.stat().st_size, reverse=True)
+    samples = [(p.name, p.read_text(encoding='utf-8')) for p in files[:count]]
+    if samples:
+        lines = [line for line in samples[0][1].splitlines() if line.strip()]
+        samples.append((f"{samples[0][0]} (표 {len(lines) // 2}행)", table_heavy_sample(lines)))
+        samples.append((f"{samples[0][0]} (깨진 표 1000행)", table_heavy_sample(lines[:2000], closed=False)))
+
+    print(f"{'파일':<28} {'크기':>9} {'기존':>9} {'한 번 훑기':>10} {'배율':>6}")
+    for name, text in samples:
+        timings = []
+        for func in (legacy_sanitize, sanitize_text):
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func(text)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings.append(best)
+        print(f"{name:<28} {len(text.encode('utf-8')) / 1024:>7.0f}KB "
+              f"{timings[0] * 1000:>7.1f}ms {timings[1] * 1000:>8.1f}ms {timings[0] / timings[1]:>5.1f}x")
+
+# 칸 강조 안에 다른 정리 대상이 섞인 경우 (강조만 벗기고 안쪽을 그대로 두면 안 됨)
+CELL_MARKUP_CASES = (
+    '<td>**[a]{.underline}**</td>',
+    '<td>*![a](media/image1.png)*</td>',
+    '<td>**x**{.underline}</td>',
+    '<td>~~![b~](media/i2.png){width="1in" height="2in"}w{.mark}~~</td>',
+    '<td>*<p>t</p>![b~](media/i2.png){width="1in"}*</td>',
+    '<td>***x***</td>',
+    '<td>~~a ~ b~~</td>',
+    '<td>**<span style="color:red">s</span>**</td>',
+)
+CELL_MARKUP_FRAGMENTS = (
+    '가나', 'a ~ b', '~', '**x**', '*y*', '~~z~~', '[a]{.underline}', '{#id .c}', 'w{.mark}',
+    '![a](media/image1.png)', '![b~](media/i2.png){width="1in" height="2in"}',
+    '<p>t</p>', '<blockquote>q</blockquote>', '<span style="color:red">s</span>', ' ',
+)
+
+def cell_markup_sample(count=3000, seed=16):
+    """칸 강조 + 속성/이미지/style/~/<p>를 섞은 표 (한 줄에 칸 하나, 같은 seed면 같은 문서)
+
+    기존 정규식의 .+?는 한 줄 안에서 다음 칸까지 넘어가 짝을 맞추므로 칸마다 줄을 나눔
+    """
+    rng = random.Random(seed)
+    rows = ['<table>', *CELL_MARKUP_CASES]
+    for _ in range(count):
+        body = ''.join(rng.choice(CELL_MARKUP_FRAGMENTS) for _ in range(rng.randint(0, 3)))
+        if rng.random() < 0.5:
+            mark = rng.choice(CELL_MARKS)
+            body = mark + body + mark
+        tag = rng.choice(('<td>', '<td style="width: 30%">', '<th>', '<td rowspan="2">'))
+        rows.append(f"{tag}{body}</{tag[1:3]}>")
+    rows.append('</table>')
+    return '\n'.join(rows) + '\n'
+
+def first_difference(expected, actual):
+    """두 문자열이 처음 달라지는 위치 (같으면 None)"""
+    if expected == actual:
+        return None
+    for i, (a, b) in enumerate(zip(expected, actual)):
+        if a != b:
+            return i
+    return min(len(expected), len(actual))
+
+def verify(paths=None, chunk_sizes=VERIFY_CHUNK_SIZES):
+    """기존 정규식(legacy_sanitize)과 sanitize_text, 조각 단위 sanitize_stream 결과 비교 → 다른 항목 수"""
+    if paths:
+        samples = [(str(path), Path(path).read_text(encoding='utf-8')) for path in paths]
+    else:
+        files = sorted((project_root / 'regulations').rglob('*.md'))
+        samples = [(str(path.relative_to(project_root)), path.read_text(encoding='utf-8')) for path in files]
+        if samples:
+            lines = [line for _, text in samples[:3] for line in text.splitlines() if line.strip()]
+            samples.append(("(표 위주 예시)", table_heavy_sample(lines[:4000])))
+        samples.append(("(칸 강조 예시)", cell_markup_sample()))
+
+    failures = 0
+    for name, text in samples:
+        expected = legacy_sanitize(text)
+        results = [('sanitize_text', sanitize_text(text))]
+        for size in chunk_sizes:
+            chunks = (text[i:i + size] for i in range(0, len(text), size))
+            results.append((f"sanitize_stream({size}자)", ''.join(sanitize_stream(chunks))))
+        for label, actual in results:
+            offset = first_difference(expected, actual)
+            if offset is not None:
+                failures += 1
+                print(f"❌ {name}: {label} 결과가 기존 방식과 다름 ({offset}번째 글자부터)")
+                print(f"   기존: {expected[max(0, offset - 40):offset + 40]!r}")
+                print(f"   결과: {actual[max(0, offset - 40):offset + 40]!r}")
+    if failures:
+        print(f"❌ {len(samples)}개 문서 중 불일치 {failures}건")
+    else:
+        print(f"✅ {len(samples)}개 문서: 기존 방식과 결과 동일 "
+              f"(전체 문자열, 조각 {', '.join(f'{size}자' for size in chunk_sizes)})")
+    return failures
+
+def main():
+    """명령행 실행"""
+    args = sys.argv[1:]
+    if not args:
+        print(f"사용법: python3 {sys.argv[0]} <md 파일>... | bench [파일 수] | verify [md 파일...]")
+        return 1
+    if args[0] == 'bench':
+        benchmark(int(args[1]) if len(args) > 1 else 3)
+        return 0
+    if args[0] == 'verify':
+        return 1 if verify(args[1:]) else 0
+    for path in args:
+        fixes = sanitize_file(path, sys.stdout)
+        print(f"{path}: {fixes}", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+규정 간 유사 중복 탐지 (shingling + MinHash + LSH)
+
+강사/초빙교원/겸임교원 규정처럼 조문이 규정 사이에 복사되어 있거나,
+분리 오류로 규정집 전체가 한 파일에 들어간 경우(3-1-10.md 등)를 찾습니다.
+
+- 조문 본문(공백/기호 제거)을 문자 5-gram shingle로 만들고
+  One Permutation Hashing 방식 MinHash(64칸)로 서명 생성 → shingle당 해시 1회
+- LSH(16 밴드 × 4 행)로 후보 쌍만 추린 뒤 서명으로 Jaccard 유사도 추정
+  → 모든 조문 쌍을 비교하지 않으므로 조문 수에 대해 준선형
+- 부칙 조문("이 규정은 공포한 날부터 시행한다" 등)은 기본적으로 제외
+- 같은 조문 번호가 (부칙 밖에서) 반복되는 파일은 여러 규정이 합쳐진 것으로 의심
+
+split_and_update.update_files()는 파일을 쓰기 전에 SplitGuard로 규정마다
+새 내용이 다른 규정 파일과 거의 같거나, 합쳐진 규정으로 보이면 쓰기를 건너뜁니다.
+
+사용법:
+    python3 scripts/near_duplicates.py [--threshold 0.8] [--include-addenda] [--report <경로>]
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from regulation_parser import get_article_index, parse_regulation, project_root, KIND, KEY, START, END, LINE
+from search_index import normalize_text, document_nodes
+
+SHINGLE_SIZE = 5
+NUM_BINS = 64
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+DEFAULT_THRESHOLD = 0.8
+# 정규화 후 이보다 짧은 조문은 비교하지 않음 ("삭제", "시행일" 등)
+MIN_CHARS = 40
+DEFAULT_REPORT_PATH = project_root / '.cache' / 'duplicates_report.json'
+# 부칙 밖에서 같은 조문 번호가 이만큼 이상 반복되고 비율도 높으면 합쳐진 규정으로 의심
+REPEATED_MIN = 5
+REPEATED_RATIO = 0.3
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """정규화된 텍스트의 문자 shingle 해시 집합"""
+    s = normalize_text(text)
+    if len(s) <= size:
+        return {zlib.crc32(s.encode('utf-8'))} if s else set()
+    return {zlib.crc32(s[i:i + size].encode('utf-8')) for i in range(len(s) - size + 1)}
+
+def minhash(hashes, bins=NUM_BINS):
+    """One Permutation Hashing MinHash 서명 (빈 칸은 다음 칸 값으로 채움)"""
+    empty = 1 << 32
+    signature = [empty] * bins
+    for value in hashes:
+        # crc32 하위 비트가 고르게 섞이도록 곱셈 해시 후 칸/값 분리
+        mixed = (value * 0x9E3779B1) & 0xFFFFFFFF
+        slot = mixed % bins
+        rest = mixed // bins
+        if rest < signature[slot]:
+            signature[slot] = rest
+    filled = [i for i, v in enumerate(signature) if v != empty]
+    if not filled or len(filled) == bins:
+        return tuple(signature)
+    # 빈 칸은 오른쪽으로 가장 가까운 채워진 칸 값을 빌려 옴 (거리를 더해 칸마다 구분)
+    result = list(signature)
+    for i in range(bins):
+        offset = 1
+        while result[i] == empty:
+            borrowed = signature[(i + offset) % bins]
+            if borrowed != empty:
+                result[i] = borrowed + offset * empty
+            offset += 1
+    return tuple(result)
+
+def similarity(a, b):
+    """서명으로 추정한 Jaccard 유사도"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+class LSHIndex:
+    """밴드별 버킷으로 유사 후보 쌍을 찾는 색인"""
+
+    def __init__(self, bands=BANDS, rows=ROWS):
+        self.bands = bands
+        self.rows = rows
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key, signature):
+        self.signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self.buckets[band].setdefault(band_key, []).append(key)
+
+    def query(self, signature):
+        """서명과 한 밴드 이상 겹치는 항목"""
+        found = set()
+        for band, band_key in self._band_keys(signature):
+            found.update(self.buckets[band].get(band_key, ()))
+        return found
+
+    def candidate_pairs(self):
+        """같은 버킷에 들어간 모든 쌍"""
+        pairs = set()
+        for buckets in self.buckets:
+            for keys in buckets.values():
+                if len(keys) < 2:
+                    continue
+                for i in range(len(keys)):
+                    for j in range(i + 1, len(keys)):
+                        pairs.add((keys[i], keys[j]) if keys[i] < keys[j] else (keys[j], keys[i]))
+        return pairs
+
+def is_addenda_node(node):
+    return node[KIND] == 'addenda' or node[KEY].startswith('부칙')
+
+def repeated_articles(nodes):
+    """(부칙 밖에서 번호가 반복된 조문 수, 부칙 밖 조문 수)"""
+    articles = [node for node in nodes if node[KIND] == 'article' and not is_addenda_node(node)]
+    return sum(1 for node in articles if '#' in node[KEY]), len(articles)
+
+def looks_like_compendium(nodes):
+    repeated, total = repeated_articles(nodes)
+    return repeated >= REPEATED_MIN and repeated >= REPEATED_RATIO * total
+
+def collect_articles(include_addenda=False):
+    """색인된 모든 규정의 조문 → [(id, 코드, 조문 key, 줄, 서명)]"""
+    article_index = get_article_index()
+    records = []
+    for path, info in sorted(article_index.files.items()):
+        with open(project_root / path, 'rb') as f:
+            data = f.read()
+        for node in document_nodes(info['nodes']):
+            if node[KIND] == 'preamble' or (not include_addenda and is_addenda_node(node)):
+                continue
+            text = data[node[START]:node[END]].decode('utf-8', errors='replace')
+            hashes = shingle_hashes(text)
+            if len(hashes) < MIN_CHARS - SHINGLE_SIZE:
+                continue
+            records.append((len(records), info['code'], node[KEY], node[LINE], minhash(hashes)))
+    return article_index, records
+
+def find_near_duplicates(records, threshold=DEFAULT_THRESHOLD):
+    """LSH 후보 중 추정 유사도가 threshold 이상인 쌍 → [(유사도, id1, id2)]"""
+    lsh = LSHIndex()
+    for record_id, _, _, _, signature in records:
+        lsh.add(record_id, signature)
+    pairs = []
+    for a, b in lsh.candidate_pairs():
+        score = similarity(records[a][4], records[b][4])
+        if score >= threshold:
+            pairs.append((score, a, b))
+    return sorted(pairs, reverse=True)
+
+def group_duplicates(pairs):
+    """유사 쌍을 연결 요소(그룹)로 묶음"""
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for _, a, b in pairs:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+    groups = {}
+    for x in list(parent):
+        groups.setdefault(find(x), []).append(x)
+    return [sorted(members) for members in groups.values()]
+
+def build_report(threshold=DEFAULT_THRESHOLD, include_addenda=False):
+    """유사 중복 보고서 (dict)"""
+    start = time.perf_counter()
+    article_index, records = collect_articles(include_addenda)
+    pairs = find_near_duplicates(records, threshold)
+    groups = group_duplicates(pairs)
+
+    def describe(record_id):
+        _, code, key, line, _ = records[record_id]
+        return {'code': code, 'article': key, 'line': line}
+
+    cross_file = []
+    within_file = []
+    for members in groups:
+        codes = {records[m][1] for m in members}
+        entry = {'size': len(members), 'articles': [describe(m) for m in members]}
+        (cross_file if len(codes) > 1 else within_file).append(entry)
+
+    file_overlap = {}
+    for score, a, b in pairs:
+        if records[a][1] != records[b][1]:
+            (x, y) = (a, b) if records[a][1] < records[b][1] else (b, a)
+            file_overlap.setdefault(records[x][1], {}).setdefault(records[y][1], set()).add(x)
+
+    compendium = []
+    for path, info in sorted(article_index.files.items()):
+        repeated, total = repeated_articles(info['nodes'])
+        if looks_like_compendium(info['nodes']):
+            compendium.append({'code': info['code'], 'path': path,
+                               'repeated_articles': repeated, 'articles': total})
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'threshold': threshold,
+        'articles_compared': len(records),
+        'similar_pairs': len(pairs),
+        'elapsed': round(time.perf_counter() - start, 3),
+        'compendium_suspects': compendium,
+        'file_overlap': [
+            {'code': code, 'other': other, 'shared_articles': len(ids)}
+            for code, others in sorted(file_overlap.items())
+            for other, ids in sorted(others.items(), key=lambda item: -len(item[1]))
+        ],
+        'cross_file_groups': sorted(cross_file, key=lambda g: -g['size']),
+        'within_file_groups': sorted(within_file, key=lambda g: -g['size']),
+    }
+
+def document_signature(text):
+    """문서 전체 MinHash 서명"""
+    return minhash(shingle_hashes(text))
+
+class SplitGuard:
+    """현재 규정 파일들의 문서 서명을 들고 있다가 분리된 규정을 하나씩 검사
+
+    - 새 내용이 다른 규정의 현재 파일과 거의 같고 자기 파일과는 다름 (잘못 분리됨)
+    - 새 내용에서 부칙 밖 조문 번호 반복이 현재 파일보다 크게 늘어남 (규정집이 통째로 들어감)
+
+    파일 내용은 들고 있지 않으므로 규정을 하나씩 흘려 보내는 분리(스트리밍)에도 쓸 수 있습니다.
+    """
+
+    def __init__(self, regulations, project_root_path, threshold=0.9):
+        self.reg_map = {reg['code']: reg for reg in regulations}
+        self.project_root = project_root_path
+        self.threshold = threshold
+        self.lsh = LSHIndex()
+        for reg in regulations:
+            text = self._read_current(reg['code'])
+            if text is not None:
+                self.lsh.add(reg['code'], document_signature(text))
+
+    def _read_current(self, code):
+        file_path = os.path.join(self.project_root, self.reg_map[code]['path'])
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def check(self, code, new_lines):
+        """분리된 규정 하나 검사 → 사유 목록 (문제 없으면 빈 목록)"""
+        if code not in self.reg_map:
+            return []
+        new_text = '\n'.join(new_lines)
+        current_text = self._read_current(code)
+        if current_text is not None and new_text.strip() == current_text.strip():
+            return []
+        reasons = []
+
+        signatures = self.lsh.signatures
+        signature = document_signature(new_text)
+        own = similarity(signature, signatures[code]) if code in signatures else 0.0
+        for other in sorted(self.lsh.query(signature) - {code}):
+            score = similarity(signature, signatures[other])
+            if score >= self.threshold and score > own + 0.2:
+                reasons.append(f"{self.reg_map[other]['title']}({other}) 파일과 {score * 100:.0f}% 유사 "
+                               f"(기존 파일과는 {own * 100:.0f}%)")
+
+        new_repeated, new_total = repeated_articles(parse_regulation(new_text.encode('utf-8')))
+        old_repeated = 0
+        if current_text is not None:
+            old_repeated, _ = repeated_articles(parse_regulation(current_text.encode('utf-8')))
+        if (new_repeated >= REPEATED_MIN and new_repeated >= REPEATED_RATIO * new_total
+                and new_repeated > 2 * old_repeated + REPEATED_MIN):
+            reasons.append(f"조문 번호 반복 {new_repeated}개 (기존 {old_repeated}개) - 여러 규정이 합쳐진 것으로 보임")
+        return reasons
+
+def guard_split_result(split_result, regulations, project_root_path, threshold=0.9):
+    """분리 결과 전체를 쓰기 전에 검사 → {코드: 사유} (문제 있는 규정만)"""
+    guard = SplitGuard(regulations, project_root_path, threshold)
+    problems = {}
+    for code, new_lines in split_result.items():
+        reasons = guard.check(code, new_lines)
+        if reasons:
+            problems[code] = reasons
+    return problems
+
+def main():
+    """명령행 실행: 유사 중복 보고서"""
+    threshold = DEFAULT_THRESHOLD
+    include_addenda = False
+    report_path = DEFAULT_REPORT_PATH
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        if args[i] == '--threshold' and i + 1 < len(args):
+            threshold = float(args[i + 1])
+            i += 1
+        elif args[i] == '--include-addenda':
+            include_addenda = True
+        elif args[i] == '--report' and i + 1 < len(args):
+            report_path = Path(args[i + 1])
+            i += 1
+        i += 1
+
+    report = build_report(threshold, include_addenda)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"🔍 조문 {report['articles_compared']}개 비교, 유사 쌍 {report['similar_pairs']}개 "
+          f"(유사도 {threshold * 100:.0f}% 이상, {report['elapsed']:.2f}초)")
+    if report['compendium_suspects']:
+        print("\n⚠️  여러 규정이 합쳐진 것으로 의심되는 파일:")
+        for item in report['compendium_suspects']:
+            print(f"   {item['code']:<8} 조문 {item['articles']}개 중 번호 반복 {item['repeated_articles']}개 ({item['path']})")
+    if report['file_overlap']:
+        print("\n📎 규정 간 공유 조문:")
+        for item in report['file_overlap'][:20]:
+            print(f"   {item['code']:<8} ↔ {item['other']:<8} {item['shared_articles']}개")
+    print(f"\n📊 규정 간 중복 그룹 {len(report['cross_file_groups'])}개, "
+          f"같은 파일 안 중복 그룹 {len(report['within_file_groups'])}개")
+    print(f"📝 보고서: {report_path}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+상주 pandoc 서버 풀 (pandoc-server, CLI 대체)
+
+변환할 때마다 pandoc 프로세스를 새로 띄우면 Haskell 런타임 시작 비용이
+문서 수만큼 반복됩니다. 이 모듈은 pandoc 서버(pandoc-server 또는 `pandoc server`)를
+한 번 띄워 두고 HTTP로 변환을 요청합니다.
+
+- 서버 N개(PANDOC_SERVERS, 기본 1)를 띄우고 문서를 묶음(/batch) 단위로 나누어 보냄
+  (문서 하나만 변환할 때는 떠 있는 서버가 없으면 새로 띄우지 않고 CLI 사용)
+- 띄운 서버 주소는 환경 변수 PANDOC_SERVER_URL로 내보내므로 자식 프로세스
+  (batch_smart_update.py의 작업 프로세스 등)는 새로 띄우지 않고 같은 서버를 사용
+- `serve`로 띄운 상주 서버가 있으면(.cache/pandoc_server.json) 그것을 사용
+- 서버를 띄울 수 없거나(구버전 pandoc, 미설치) 요청이 실패하면 해당 문서만 pandoc CLI로 변환
+- 문서별 소요 시간(요청부터 결과까지)과 처리 방식(server/cli)을 기록
+
+환경 변수:
+    PANDOC_SERVER_URL      사용할 서버 주소 (쉼표로 여러 개, 지정하면 새로 띄우지 않음)
+    PANDOC_SERVERS         직접 띄울 서버 수 (기본 1)
+    PANDOC_BATCH_SIZE      /batch 요청 하나에 담을 문서 수 (기본 8)
+    PANDOC_SERVER_DISABLE  1 이면 항상 CLI 사용
+
+사용법:
+    python3 scripts/pandoc_pool.py convert <입력> <출력> [--from docx] [--to markdown]
+    python3 scripts/pandoc_pool.py bench <docx파일...> [--repeat N]   # CLI와 서버 소요 시간 비교
+    python3 scripts/pandoc_pool.py serve [--servers N]                # 상주 서버 (Ctrl+C로 종료)
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import base64
+import signal
+import socket
+import threading
+import subprocess
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from stage_trace import stage
+
+project_root = Path(__file__).resolve().parent.parent
+
+STATE_PATH = project_root / '.cache' / 'pandoc_server.json'
+DEFAULT_BATCH_SIZE = 8
+STARTUP_TIMEOUT = 10.0
+REQUEST_TIMEOUT = 300
+# 입력이 바이너리라 base64로 보내야 하는 형식
+BINARY_FORMATS = {'docx', 'odt', 'epub', 'pptx', 'xlsx', 'docx+styles'}
+# pandoc 3.x: 별도 실행 파일 또는 하위 명령
+SERVER_COMMANDS = (['pandoc-server'], ['pandoc', 'server'])
+
+def free_port():
+    """사용 가능한 로컬 포트"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _die_with_parent():
+    """서버 프로세스가 부모가 죽을 때 함께 종료되도록 설정 (Linux, 실패해도 무시)"""
+    try:
+        import ctypes
+        ctypes.CDLL('libc.so.6', use_errno=True).prctl(1, signal.SIGTERM)  # PR_SET_PDEATHSIG
+    except Exception:
+        pass
+
+def server_alive(url, timeout=1.0):
+    """서버가 응답하는지 (/version)"""
+    try:
+        with urllib.request.urlopen(f"{url}/version", timeout=timeout) as response:
+            return response.status == 200
+    except (OSError, ValueError):
+        return False
+
+def start_server():
+    """pandoc 서버 하나 실행 → (프로세스, 주소), 실패하면 (None, None)"""
+    for command in SERVER_COMMANDS:
+        port = free_port()
+        try:
+            process = subprocess.Popen(
+                command + ['--port', str(port), '--timeout', str(REQUEST_TIMEOUT)],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                preexec_fn=_die_with_parent if sys.platform.startswith('linux') else None,
+            )
+        except OSError:
+            continue
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline and process.poll() is None:
+            if server_alive(url, timeout=0.5):
+                return process, url
+            time.sleep(0.05)
+        if process.poll() is None:
+            process.terminate()
+            process.wait()
+    return None, None
+
+def load_state():
+    """`serve`로 띄운 상주 서버 주소 (살아 있을 때만)"""
+    try:
+        with open(STATE_PATH, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        os.kill(state['pid'], 0)
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
+    return [url for url in state.get('urls', []) if server_alive(url)]
+
+def run_cli(job):
+    """pandoc CLI로 문서 하나 변환 → (출력 텍스트 또는 None, 오류)"""
+    command = ['pandoc', '-f', job['from'], '-t', job['to'], job['input']]
+    if job.get('output'):
+        command += ['-o', job['output']]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, encoding='utf-8')
+    except FileNotFoundError:
+        return None, "Pandoc이 설치되어 있지 않습니다."
+    if result.returncode != 0:
+        return None, result.stderr.strip() or f"pandoc 종료 코드 {result.returncode}"
+    return (None if job.get('output') else result.stdout), None
+
+def make_request(job):
+    """변환 작업 → pandoc 서버 요청 본문"""
+    with open(job['input'], 'rb') as f:
+        data = f.read()
+    if job['from'] in BINARY_FORMATS:
+        text = base64.b64encode(data).decode('ascii')
+    else:
+        text = data.decode('utf-8')
+    return {'text': text, 'from': job['from'], 'to': job['to']}
+
+def decode_response(result):
+    """서버 응답 하나 → 출력 텍스트/바이트 (오류면 RuntimeError)"""
+    if isinstance(result, str):
+        return result
+    if not isinstance(result, dict) or 'output' not in result:
+        message = result.get('error') if isinstance(result, dict) else result
+        raise RuntimeError(f"pandoc 서버 오류: {message}")
+    if result.get('base64'):
+        return base64.b64decode(result['output'])
+    return result['output']
+
+def post_json(url, payload):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json', 'Accept': 'application/json'})
+    with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+def write_output(job, output):
+    """결과를 출력 파일에 저장 (CLI -o와 같게 텍스트는 줄바꿈으로 끝나게)"""
+    if isinstance(output, bytes):
+        with open(job['output'], 'wb') as f:
+            f.write(output)
+        return
+    if not output.endswith('\n'):
+        output += '\n'
+    with open(job['output'], 'w', encoding='utf-8') as f:
+        f.write(output)
+
+class PandocPool:
+    """pandoc 서버 풀 (서버가 없으면 CLI)"""
+
+    def __init__(self, servers=None, batch_size=None):
+        self.servers = servers or int(os.environ.get('PANDOC_SERVERS', 1))
+        self.batch_size = batch_size or int(os.environ.get('PANDOC_BATCH_SIZE', DEFAULT_BATCH_SIZE))
+        self.disabled = os.environ.get('PANDOC_SERVER_DISABLE', '') in ('1', 'true', 'yes')
+        self.processes = []
+        self.urls = []
+        self.searched = False
+        self.spawn_failed = False
+        self.records = []
+        self._lock = threading.Lock()
+
+    def start(self, spawn=True):
+        """서버 준비 (이미 떠 있는 서버 → 상주 서버 → spawn이면 새로 실행) → 사용 가능 여부
+
+        문서 하나만 변환할 때는 서버를 새로 띄우는 비용이 CLI 한 번과 비슷하므로
+        이미 떠 있는 서버만 사용합니다 (spawn=False).
+        """
+        with self._lock:
+            if self.urls or self.disabled:
+                return bool(self.urls)
+            if not self.searched:
+                self.searched = True
+                shared = [url for url in os.environ.get('PANDOC_SERVER_URL', '').split(',') if url]
+                self.urls = [url for url in shared if server_alive(url)] or load_state()
+            if not self.urls and spawn and not self.spawn_failed:
+                for _ in range(self.servers):
+                    process, url = start_server()
+                    if not process:
+                        break
+                    self.processes.append(process)
+                    self.urls.append(url)
+                self.spawn_failed = not self.processes
+                if self.processes:
+                    atexit.register(self.close)
+            if self.urls:
+                # 자식 프로세스도 같은 서버 사용
+                os.environ['PANDOC_SERVER_URL'] = ','.join(self.urls)
+            return bool(self.urls)
+
+    def close(self):
+        """직접 띄운 서버 종료"""
+        for process in self.processes:
+            if process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+        if self.processes and os.environ.get('PANDOC_SERVER_URL') == ','.join(self.urls):
+            del os.environ['PANDOC_SERVER_URL']
+        self.processes = []
+        self.urls = []
+        self.searched = False
+
+    def _finish(self, job, output, error, backend, latency):
+        result = {
+            'input': job['input'],
+            'output': job.get('output'),
+            'text': None,
+            'ok': error is None,
+            'backend': backend,
+            'latency': latency,
+            'error': error,
+        }
+        if error is None and output is not None:
+            if job.get('output'):
+                write_output(job, output)
+            else:
+                result['text'] = output
+        with self._lock:
+            self.records.append(result)
+        return result
+
+    def _run_cli(self, job):
+        started = time.perf_counter()
+        output, error = run_cli(job)
+        return self._finish(job, output, error, 'cli', time.perf_counter() - started)
+
+    def _convert_batch(self, url, jobs):
+        """묶음 하나를 서버로 변환 (실패한 문서는 하나씩 다시, 그래도 실패하면 CLI)
+
+        소요 시간은 문서마다 따로 잽니다. /batch 응답은 문서별 시간을 알 수 없으므로
+        요청 시간을 입력 파일 크기 비율로 나누어 문서마다 배정합니다 (누적 시간이 아님).
+        """
+        results = []
+        outputs = None
+        shares = None
+        if len(jobs) > 1:
+            started = time.perf_counter()
+            try:
+                outputs = post_json(f"{url}/batch", [make_request(job) for job in jobs])
+                if not isinstance(outputs, list) or len(outputs) != len(jobs):
+                    outputs = None
+            except (OSError, ValueError):
+                outputs = None
+            if outputs is not None:
+                elapsed = time.perf_counter() - started
+                sizes = [os.path.getsize(job['input']) for job in jobs]
+                total = sum(sizes)
+                shares = [elapsed * (size / total if total else 1 / len(jobs)) for size in sizes]
+        for n, job in enumerate(jobs):
+            started = time.perf_counter()
+            try:
+                if outputs is not None:
+                    output = decode_response(outputs[n])
+                    latency = shares[n]
+                else:
+                    output = decode_response(post_json(url, make_request(job)))
+                    latency = time.perf_counter() - started
+                results.append(self._finish(job, output, None, 'server', latency))
+            except (OSError, ValueError, RuntimeError):
+                results.append(self._run_cli(job))
+        return results
+
+    def convert_many(self, jobs, spawn=None):
+        """변환 작업 목록 [{'input', 'from', 'to', 'output'(선택)}] → 결과 목록 (입력 순서)
+
+        output이 없으면 결과의 'text'에 변환 결과를 담습니다.
+        spawn: 떠 있는 서버가 없을 때 새로 띄울지 (기본: 문서가 2개 이상일 때)
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return []
+        document = jobs[0]['input'] if len(jobs) == 1 else f"{len(jobs)}개 문서"
+        with stage('pandoc', document=document, documents=len(jobs)):
+            # 문서별 소요 시간에는 서버 시작 비용을 넣지 않음 (처음 한 번뿐)
+            if not self.start(len(jobs) > 1 if spawn is None else spawn):
+                return [self._run_cli(job) for job in jobs]
+
+            batches = [jobs[i:i + self.batch_size] for i in range(0, len(jobs), self.batch_size)]
+            with ThreadPoolExecutor(max_workers=min(len(self.urls), len(batches))) as executor:
+                futures = [executor.submit(self._convert_batch, self.urls[n % len(self.urls)], batch)
+                           for n, batch in enumerate(batches)]
+                return [result for future in futures for result in future.result()]
+
+    def convert(self, input_path, output_path=None, from_format='docx', to_format='markdown'):
+        """문서 하나 변환 → 결과 dict"""
+        job = {'input': str(input_path), 'from': from_format, 'to': to_format}
+        if output_path:
+            job['output'] = str(output_path)
+        return self.convert_many([job])[0]
+
+    def latency_summary(self):
+        """처리 방식별 문서 수, 평균/최대 소요 시간"""
+        summary = {}
+        for record in self.records:
+            entry = summary.setdefault(record['backend'], {'documents': 0, 'failed': 0, 'total': 0.0, 'max': 0.0})
+            entry['documents'] += 1
+            entry['failed'] += 0 if record['ok'] else 1
+            entry['total'] += record['latency']
+            entry['max'] = max(entry['max'], record['latency'])
+        for entry in summary.values():
+            entry['mean'] = entry['total'] / entry['documents']
+        return summary
+
+_pool = []
+
+def get_pool():
+    """프로세스 공용 풀"""
+    if not _pool:
+        _pool.append(PandocPool())
+    return _pool[0]
+
+def convert_file(input_path, output_path=None, from_format='docx', to_format='markdown'):
+    """공용 풀로 문서 하나 변환 → {'ok', 'backend', 'latency', 'error', 'text', ...}"""
+    return get_pool().convert(input_path, output_path, from_format, to_format)
+
+def describe(result):
+    """로그용: "0.42초 (pandoc 서버)" """
+    backend = 'pandoc 서버' if result['backend'] == 'server' else 'pandoc CLI'
+    return f"{result['latency']:.2f}초 ({backend})"
+
+def serve(servers):
+    """상주 서버 실행 (다른 프로세스는 .cache/pandoc_server.json으로 찾아 사용)"""
+    pool = PandocPool(servers=servers)
+    os.environ.pop('PANDOC_SERVER_URL', None)
+    if not pool.start():
+        print("❌ pandoc 서버를 실행할 수 없습니다 (pandoc 3.0 이상의 pandoc-server 필요).")
+        return 1
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(STATE_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'pid': os.getpid(), 'urls': pool.urls}, f)
+    print(f"✅ pandoc 서버 {len(pool.urls)}개 실행 중: {', '.join(pool.urls)} (Ctrl+C로 종료)")
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        while all(process.poll() is None for process in pool.processes):
+            time.sleep(1)
+        print("⚠️  pandoc 서버가 종료되었습니다.")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.close()
+        try:
+            STATE_PATH.unlink()
+        except OSError:
+            pass
+    return 0
+
+def bench(files, repeat):
+    """같은 문서들을 CLI와 서버로 변환하여 문서당 소요 시간 비교"""
+    jobs = [{'input': path, 'from': 'docx', 'to': 'markdown'} for path in files] * repeat
+    cli_times = []
+    for job in jobs:
+        start = time.perf_counter()
+        _, error = run_cli(job)
+        if error:
+            print(f"❌ {job['input']}: {error}")
+            return 1
+        cli_times.append(time.perf_counter() - start)
+
+    pool = PandocPool()
+    start = time.perf_counter()
+    ready = pool.start()
+    startup = time.perf_counter() - start
+    start = time.perf_counter()
+    results = pool.convert_many(jobs)
+    elapsed = time.perf_counter() - start
+    pool.close()
+
+    print(f"📄 문서 {len(jobs)}개")
+    print(f"   CLI:  합계 {sum(cli_times):.2f}초, 문서당 평균 {sum(cli_times) / len(jobs) * 1000:.0f}ms")
+    if not ready:
+        print("   서버: 실행 불가 → CLI로 대체됨")
+    print(f"   풀:   합계 {elapsed:.2f}초 (서버 시작 {startup:.2f}초 별도), "
+          f"문서당 {elapsed / len(jobs) * 1000:.0f}ms, "
+          f"처리 방식 {sorted({result['backend'] for result in results})}")
+    return 0
+
+def main():
+    """명령행 실행"""
+    args = sys.argv[1:]
+    if not args or args[0] not in ('convert', 'bench', 'serve'):
+        print("사용법:")
+        print("  python3 scripts/pandoc_pool.py convert <입력> <출력> [--from docx] [--to markdown]")
+        print("  python3 scripts/pandoc_pool.py bench <docx파일...> [--repeat N]")
+        print("  python3 scripts/pandoc_pool.py serve [--servers N]")
+        return 1
+
+    command = args[0]
+    options = {'--from': 'docx', '--to': 'markdown', '--repeat': '1', '--servers': None}
+    positional = []
+    i = 1
+    while i < len(args):
+        if args[i] in options and i + 1 < len(args):
+            options[args[i]] = args[i + 1]
+            i += 1
+        else:
+            positional.append(args[i])
+        i += 1
+
+    if command == 'serve':
+        return serve(int(options['--servers']) if options['--servers'] else None)
+    if command == 'bench':
+        if not positional:
+            print("❌ 비교할 DOCX 파일을 지정하세요.")
+            return 1
+        return bench(positional, int(options['--repeat']))
+
+    if len(positional) < 2:
+        print("❌ 입력과 출력 파일을 지정하세요.")
+        return 1
+    result = convert_file(positional[0], positional[1], options['--from'], options['--to'])
+    if not result['ok']:
+        print(f"❌ 변환 실패: {result['error']}")
+        return 1
+    print(f"✅ 변환 완료: {positional[1]} ({describe(result)})")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+페이지 단위 병렬 PDF → Markdown 변환
+
+기능:
+- PDF 페이지 범위를 여러 작업 프로세스에 나누어 pdf2docx 변환,
+  DOCX → Markdown은 모든 페이지를 모아 상주 pandoc 서버에 묶음으로 요청 (pandoc_pool.py)
+- 페이지별 내용 해시(콘텐츠 스트림 + 이미지)로 변환 결과를 캐시
+  → 일부 페이지만 바뀐 규정집을 다시 받으면 바뀐 페이지만 변환
+- 페이지 순서대로 결과를 이어 붙여 하나의 Markdown으로 출력
+
+주의: 페이지마다 따로 변환하므로 여러 페이지에 걸친 표는
+페이지 경계에서 나뉠 수 있습니다. (전체 변환은 process_regulation.py 기본 모드)
+
+사용법:
+    python3 scripts/pdf_page_converter.py <pdf파일> <출력md파일> [작업 수]
+"""
+
+import os
+import sys
+import time
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from conversion_cache import ConversionCache, pdf_pipeline
+from pandoc_pool import get_pool
+from stage_trace import stage
+
+def open_pdf(pdf_path):
+    """PyMuPDF 문서 열기 (pdf2docx 설치 시 함께 설치됨)"""
+    try:
+        import pymupdf as fitz
+    except ImportError:
+        import fitz
+    return fitz.open(pdf_path)
+
+def page_digests(pdf_path, start_page=0, end_page=None):
+    """페이지별 내용 해시 목록 (페이지 크기 + 콘텐츠 스트림 + 이미지 데이터)"""
+    digests = []
+    doc = open_pdf(pdf_path)
+    try:
+        end_page = doc.page_count if end_page is None else min(end_page, doc.page_count)
+        for page_no in range(start_page, end_page):
+            page = doc[page_no]
+            digest = hashlib.sha256()
+            digest.update(repr(tuple(page.rect)).encode('ascii'))
+            digest.update(page.read_contents())
+            for image in page.get_images(full=True):
+                try:
+                    digest.update(doc.xref_stream_raw(image[0]) or b'')
+                except Exception:
+                    digest.update(str(image).encode('utf-8'))
+            digests.append(digest.hexdigest())
+    finally:
+        doc.close()
+    return digests
+
+def convert_page_range(pdf_path, pages):
+    """작업 프로세스: 페이지 목록을 한 페이지씩 DOCX로 변환하여 [(페이지, DOCX 경로, 소요 시간)] 반환
+
+    DOCX → Markdown은 메인 프로세스에서 모든 페이지를 모아 pandoc 서버로 한꺼번에 보냅니다.
+    """
+    from pdf2docx import Converter
+
+    results = []
+    for page_no in pages:
+        start = time.perf_counter()
+        fd, temp_docx = tempfile.mkstemp(suffix='.docx')
+        os.close(fd)
+        try:
+            with stage('pdf2docx', document=f"{pdf_path} p{page_no + 1}"):
+                cv = Converter(pdf_path)
+                try:
+                    cv.convert(temp_docx, start=page_no, end=page_no + 1)
+                finally:
+                    cv.close()
+        except Exception:
+            os.unlink(temp_docx)
+            for _, done_docx, _ in results:
+                os.unlink(done_docx)
+            raise
+        results.append((page_no, temp_docx, time.perf_counter() - start))
+    return results
+
+def pages_to_markdown(page_docx):
+    """[(페이지, DOCX 경로, pdf2docx 소요 시간)] → {페이지: (MD, 페이지 소요 시간)} (DOCX는 삭제)
+
+    pandoc은 페이지마다 새로 실행하지 않고 상주 서버 풀(pandoc_pool.py)에 묶음으로 보냅니다.
+    """
+    jobs = [{'input': temp_docx, 'from': 'docx', 'to': 'markdown'} for _, temp_docx, _ in page_docx]
+    try:
+        results = get_pool().convert_many(jobs)
+    finally:
+        for _, temp_docx, _ in page_docx:
+            try:
+                os.unlink(temp_docx)
+            except OSError:
+                pass
+    pages = {}
+    for (page_no, _, docx_seconds), result in zip(page_docx, results):
+        if not result['ok']:
+            raise RuntimeError(f"{page_no + 1}페이지 Pandoc 변환 실패: {result['error']}")
+        pages[page_no] = (result['text'], docx_seconds + result['latency'])
+    return pages
+
+def discard_page_docx(futures):
+    """묶음 하나가 실패했을 때 정리: 시작 전 묶음은 취소하고, 끝난 묶음의 DOCX는 삭제"""
+    for future in futures:
+        future.cancel()
+    for future in futures:
+        if future.cancelled():
+            continue
+        try:
+            page_docx = future.result()
+        except Exception:
+            continue  # 실패한 묶음은 작업 프로세스에서 이미 정리함
+        for _, temp_docx, _ in page_docx:
+            try:
+                os.unlink(temp_docx)
+            except OSError:
+                pass
+
+def split_into_chunks(pages, jobs):
+    """연속된 페이지 묶음으로 분할 (작업 프로세스마다 하나씩)"""
+    if not pages:
+        return []
+    size = max(1, -(-len(pages) // jobs))
+    return [pages[i:i + size] for i in range(0, len(pages), size)]
+
+def convert_pdf_by_pages(pdf_path, output_md, start_page=0, jobs=None, cache=None):
+    """PDF를 페이지 단위로 병렬 변환하고 순서대로 이어 붙여 output_md에 저장
+
+    반환: {'pages', 'cached', 'converted', 'elapsed', 'page_seconds': {페이지 번호(1부터): 소요 시간}}
+    """
+    start = time.perf_counter()
+    jobs = jobs or os.cpu_count() or 1
+    cache = cache or ConversionCache()
+    pipeline = pdf_pipeline()
+
+    digests = page_digests(pdf_path, start_page)
+    page_numbers = list(range(start_page, start_page + len(digests)))
+    keys = {page_no: cache.make_key_from_digest(digest, pipeline, {'unit': 'page'})
+            for page_no, digest in zip(page_numbers, digests)}
+
+    page_md = {}
+    for page_no in page_numbers:
+        if cache.get(keys[page_no]):
+            page_md[page_no] = cache.read_text(keys[page_no])
+
+    pending = [page_no for page_no in page_numbers if page_no not in page_md]
+    print(f"   📄 {len(page_numbers)}페이지 중 캐시 {len(page_md)}페이지, 변환 {len(pending)}페이지 "
+          f"({min(jobs, max(len(pending), 1))}개 프로세스)")
+
+    page_seconds = {}
+    if pending:
+        chunks = split_into_chunks(pending, jobs)
+        page_docx = []
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            futures = [executor.submit(convert_page_range, pdf_path, chunk) for chunk in chunks]
+            try:
+                for future in futures:
+                    page_docx += future.result()
+            except BaseException:
+                discard_page_docx(futures)
+                raise
+        for page_no, (md_text, seconds) in sorted(pages_to_markdown(page_docx).items()):
+            page_md[page_no] = md_text
+            page_seconds[page_no + 1] = seconds
+            cache.put_text(keys[page_no], md_text)
+
+    with open(output_md, 'w', encoding='utf-8') as f:
+        f.write('\n\n'.join(page_md[page_no].rstrip('\n') for page_no in page_numbers))
+        f.write('\n')
+
+    return {
+        'pages': len(page_numbers),
+        'cached': len(page_numbers) - len(pending),
+        'converted': len(pending),
+        'elapsed': time.perf_counter() - start,
+        'page_seconds': page_seconds,
+    }
+
+def main():
+    """명령행 실행"""
+    if len(sys.argv) < 3:
+        print(f"사용법: python3 {sys.argv[0]} <pdf파일> <출력md파일> [작업 수]")
+        return 1
+
+    jobs = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    stats = convert_pdf_by_pages(sys.argv[1], sys.argv[2], jobs=jobs)
+    print(f"✅ 변환 완료: {sys.argv[2]} ({stats['pages']}페이지, "
+          f"캐시 {stats['cached']} / 변환 {stats['converted']}, {stats['elapsed']:.1f}초)")
+    if stats['page_seconds']:
+        slowest = sorted(stats['page_seconds'].items(), key=lambda item: -item[1])[:3]
+        print("   가장 오래 걸린 페이지: " + ", ".join(f"{page}쪽 {seconds:.2f}초" for page, seconds in slowest))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
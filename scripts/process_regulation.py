@@ -11,40 +11,64 @@
     python scripts/process_regulation.py <FILE_PATH>
     python scripts/process_regulation.py regulations_source/new/규정집.pdf
     python scripts/process_regulation.py regulations_source/new/규정집.docx
+
+    # PDF를 페이지 단위로 나누어 병렬 변환 (0 = CPU 코어 수, 페이지별 캐시 사용)
+    python scripts/process_regulation.py regulations_source/new/규정집.pdf --page-jobs 0
 """
 
 import os
 import sys
-import json
-import re
-import subprocess
 import tempfile
+import time
 from pathlib import Path
 
+from conversion_cache import ConversionCache, pdf_pipeline, docx_pipeline
+from document_probe import find_titles_in_lines, probe_docx, probe_pdf
+from pdf_page_converter import convert_pdf_by_pages
+from pandoc_pool import convert_file, describe
+from regulation_catalog import get_catalog
+from stage_trace import stage, traced
+
 # 프로젝트 루트로 이동
 script_dir = Path(__file__).parent
 project_root = script_dir.parent
 os.chdir(project_root)
 
 def load_regulations_db():
-    """regulations.json 파일 로드"""
-    json_path = project_root / 'regulations.json'
+    """규정 목록 (규정 카탈로그, regulation_catalog.py)"""
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data['regulations']
+        return get_catalog().all()
     except Exception as e:
         print(f"❌ regulations.json 로드 실패: {e}")
         sys.exit(1)
 
-def normalize_title(title):
-    """제목 정규화 (공백 제거, 소문자 변환)"""
-    return re.sub(r'[\s\.\·\-]', '', title).lower()
-
-def convert_to_md(input_path):
-    """PDF/DOCX를 임시 MD 파일로 변환"""
+def convert_to_md(input_path, start_page=0, page_jobs=1):
+    """PDF/DOCX를 임시 MD 파일로 변환 (변환 캐시 적중 시 pdf2docx/pandoc 생략)
+    → (임시 MD 경로, 실제로 변환했는지 여부)
+    
+    start_page: PDF에서 변환을 시작할 페이지 (0부터, 앞쪽 표지 등 건너뛰기)
+    page_jobs: 1이 아니면 PDF를 페이지 단위로 병렬 변환 (0 = CPU 코어 수)
+    """
     # 파일 확장자 확인
     ext = os.path.splitext(input_path)[1].lower()
+    page_parallel = ext == '.pdf' and page_jobs != 1
+    
+    cache = ConversionCache()
+    cache_key = None
+    if ext in ('.pdf', '.docx'):
+        options = {}
+        if ext == '.pdf' and start_page:
+            options['start_page'] = start_page
+        if page_parallel:
+            options['unit'] = 'page'
+        cache_key = cache.make_key(input_path, pdf_pipeline() if ext == '.pdf' else docx_pipeline(), options)
+        cached_md = cache.copy_to_temp(cache_key) if cache.get(cache_key) else None
+        if cached_md:
+            print(f"♻️  변환 캐시 적중 (pdf2docx/pandoc 생략): {input_path}")
+            return cached_md, False
+    
+    if page_parallel:
+        return convert_pdf_pages_to_md(input_path, start_page, page_jobs, cache, cache_key), True
     
     temp_files_to_cleanup = []
     
@@ -60,12 +84,16 @@ def convert_to_md(input_path):
             temp_docx.close()
             temp_files_to_cleanup.append(temp_docx_path)
             
-            print("   1/2: PDF → DOCX 변환...")
+            if start_page:
+                print(f"   1/2: PDF → DOCX 변환 ({start_page + 1}페이지부터)...")
+            else:
+                print("   1/2: PDF → DOCX 변환...")
             try:
                 from pdf2docx import Converter
-                cv = Converter(input_path)
-                cv.convert(temp_docx_path)
-                cv.close()
+                with stage('pdf2docx', document=input_path):
+                    cv = Converter(input_path)
+                    cv.convert(temp_docx_path, start=start_page)
+                    cv.close()
                 print("   ✅ PDF → DOCX 변환 완료")
             except Exception as e:
                 print(f"❌ PDF → DOCX 변환 실패: {e}")
@@ -96,21 +124,18 @@ def convert_to_md(input_path):
         temp_md_path = temp_md.name
         temp_md.close()
         
-        result = subprocess.run(
-            ['pandoc', '-f', input_format, '-t', 'markdown', input_file, '-o', temp_md_path],
-            capture_output=True,
-            text=True,
-            encoding='utf-8'
-        )
+        # 상주 pandoc 서버가 있으면 서버로, 없으면 CLI로 변환 (pandoc_pool.py)
+        result = convert_file(input_file, temp_md_path, input_format, 'markdown')
         
-        if result.returncode != 0:
-            print(f"❌ Pandoc 변환 실패: {result.stderr}")
+        if not result['ok']:
+            print(f"❌ Pandoc 변환 실패: {result['error']}")
             for f in temp_files_to_cleanup:
                 try:
                     os.unlink(f)
                 except:
                     pass
             sys.exit(1)
+        print(f"   ⏱️  pandoc 변환 {describe(result)}")
         
         # 중간 파일 정리
         for f in temp_files_to_cleanup:
@@ -118,8 +143,11 @@ def convert_to_md(input_path):
                 os.unlink(f)
             except:
                 pass
+        
+        if cache_key:
+            cache.put(cache_key, temp_md_path)
             
-        return temp_md_path
+        return temp_md_path, True
         
     except FileNotFoundError:
         print("❌ Pandoc이 설치되어 있지 않습니다.")
@@ -131,6 +159,43 @@ def convert_to_md(input_path):
                 pass
         sys.exit(1)
 
+def print_found_titles(found_titles):
+    """발견된 규정 제목 출력"""
+    print(f"📊 발견된 규정 제목: {len(found_titles)}개")
+    if found_titles:
+        for title in list(found_titles)[:5]:  # 최대 5개만 표시
+            print(f"   - {title}")
+        if len(found_titles) > 5:
+            print(f"   ... 외 {len(found_titles) - 5}개")
+
+def convert_pdf_pages_to_md(input_path, start_page, page_jobs, cache, cache_key):
+    """PDF를 페이지 단위로 병렬 변환 (바뀐 페이지만 다시 변환)"""
+    print(f"📄 PDF → Markdown 페이지 단위 병렬 변환 중: {input_path}")
+    
+    temp_md = tempfile.NamedTemporaryFile(mode='w', suffix='.md', 
+                                           delete=False, encoding='utf-8')
+    temp_md_path = temp_md.name
+    temp_md.close()
+    
+    try:
+        stats = convert_pdf_by_pages(input_path, temp_md_path, start_page=start_page,
+                                     jobs=page_jobs or None, cache=cache)
+    except FileNotFoundError:
+        print("❌ Pandoc이 설치되어 있지 않습니다.")
+        print("   설치: https://pandoc.org/installing.html")
+        os.unlink(temp_md_path)
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ 페이지 단위 변환 실패: {e}")
+        os.unlink(temp_md_path)
+        sys.exit(1)
+    
+    print(f"   ✅ {stats['pages']}페이지 변환 완료 (캐시 {stats['cached']}페이지 재사용, "
+          f"{stats['elapsed']:.1f}초)")
+    cache.put(cache_key, temp_md_path)
+    return temp_md_path
+
+@traced('classify', document=0)
 def analyze_md_content(md_path, regulations):
     """MD 파일 내용을 분석하여 규정 개수 판단"""
     print("🔍 파일 내용 분석 중...")
@@ -138,96 +203,76 @@ def analyze_md_content(md_path, regulations):
     with open(md_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # 제목 매핑 생성 (정규화된 제목 -> 원본 제목)
-    title_map = {}
-    for reg in regulations:
-        normalized = normalize_title(reg['title'])
-        title_map[normalized] = reg['title']
+    found_titles = find_titles_in_lines(content.splitlines(), regulations)
+    print_found_titles(found_titles)
     
-    lines = content.splitlines()
-    found_titles = set()  # 중복 방지
+    return len(found_titles)
+
+@traced('probe', document=0)
+def analyze_docx_content(docx_path, regulations):
+    """DOCX를 변환하지 않고 document.xml을 직접 읽어 규정 개수 판단"""
+    print("🔍 파일 내용 분석 중 (DOCX 직접 분석, pandoc 미사용)...")
     
-    # 방법 1: Markdown 헤딩에서 찾기 (# 제목)
-    for line in lines:
-        if line.strip().startswith('#'):
-            title = re.sub(r'^#+\s*', '', line.strip())
-            normalized = normalize_title(title)
-            if normalized in title_map:
-                found_titles.add(title_map[normalized])
+    result = probe_docx(docx_path, regulations)
+    print(f"   ⚡ 단락 {result['paragraph_count']}개 분석: {result['elapsed'] * 1000:.0f}ms")
+    print_found_titles(result['matched_titles'])
     
-    # 방법 2: 일반 텍스트에서 규정 제목 매칭 (PDF 변환 후 헤딩이 없는 경우)
-    if len(found_titles) < 3:
-        print("   📝 헤딩에서 제목을 찾지 못해 전체 텍스트 검색 중...")
-        for line in lines:
-            line_normalized = normalize_title(line)
-            # 라인이 규정 제목과 정확히 일치하거나 매우 유사한 경우
-            for norm_title, orig_title in title_map.items():
-                # 정확히 일치하거나 라인이 제목으로 끝나는 경우
-                if norm_title == line_normalized:
-                    found_titles.add(orig_title)
-                # 라인 내에 제목이 포함된 경우 (짧은 라인만)
-                elif len(line.strip()) < 80 and norm_title in line_normalized:
-                    found_titles.add(orig_title)
+    return len(result['matched_titles'])
+
+@traced('probe', document=0)
+def analyze_pdf_content(pdf_path, regulations):
+    """PDF 텍스트 레이어만 읽어 규정 개수 판단 (pdf2docx 미사용)
     
-    # 방법 3: 규정/규칙 패턴으로 추가 탐지
-    if len(found_titles) < 3:
-        print("   📝 규정 패턴 기반 검색 중...")
-        # 일반적인 규정 패턴: "XXX규정", "XXX규칙", "XXX지침", "XXX정관", "XXX내규"
-        reg_pattern = re.compile(r'^[\s\d\.\-]*(.{2,30}(?:규정|규칙|지침|정관|내규|행동강령))[\s]*$')
-        for line in lines:
-            match = reg_pattern.match(line.strip())
-            if match:
-                potential_title = match.group(1).strip()
-                norm_potential = normalize_title(potential_title)
-                if norm_potential in title_map:
-                    found_titles.add(title_map[norm_potential])
+    반환: (규정 개수, 첫 규정 제목 페이지). 텍스트 레이어가 없으면 (None, None)
+    """
+    print("🔍 파일 내용 분석 중 (PDF 텍스트 레이어, pdf2docx 미사용)...")
     
-    print(f"📊 발견된 규정 제목: {len(found_titles)}개")
-    if found_titles:
-        for title in list(found_titles)[:5]:  # 최대 5개만 표시
-            print(f"   - {title}")
-        if len(found_titles) > 5:
-            print(f"   ... 외 {len(found_titles) - 5}개")
+    # 통합 문서 여부는 제목 2개만 찾으면 판단 가능하므로 그 이후 페이지는 읽지 않음
+    result = probe_pdf(pdf_path, regulations, stop_after=2)
+    if not result['has_text_layer']:
+        print("   ⚠️  텍스트 레이어가 없습니다 (스캔 문서). 변환 후 분석합니다.")
+        return None, None
     
-    return len(found_titles)
+    print(f"   ⚡ {result['page_count']}페이지 분석: {result['elapsed'] * 1000:.0f}ms")
+    print_found_titles(result['matched_titles'])
+    if len(result['matched_titles']) >= 2:
+        print("   (2개 이상 발견되어 나머지 페이지 분석 생략)")
+    
+    return len(result['matched_titles']), result['first_title_page']
 
-def process_single_regulation(input_path):
-    """단일 규정 처리 (smart_update.py 호출)"""
+def process_single_regulation(input_path, md_path):
+    """단일 규정 처리 (smart_update.py를 같은 프로세스에서 실행, 변환된 MD 재사용)"""
     print("\n✅ 단일 규정으로 판단 → smart_update.py 실행")
     print("=" * 60)
     
-    smart_update_script = project_root / 'scripts' / 'smart_update.py'
-    
-    result = subprocess.run(
-        [sys.executable, str(smart_update_script), input_path],
-        cwd=project_root
-    )
-    
-    return result.returncode
+    from regctl import run_step
+    return run_step('update', [input_path, '--md', md_path])
 
-def process_multiple_regulations(input_path):
-    """통합 문서 처리 (split_and_update.py 호출)"""
+def process_multiple_regulations(input_path, md_path):
+    """통합 문서 처리 (split_and_update.py를 같은 프로세스에서 실행, 변환된 MD 재사용)"""
     print("\n✅ 통합 문서(여러 규정)로 판단 → split_and_update.py 실행")
     print("=" * 60)
     
-    # 1. PDF/DOCX → MD 변환
-    temp_md_path = convert_to_md(input_path)
-    
-    # 2. split_and_update.py 실행
-    split_update_script = project_root / 'scripts' / 'split_and_update.py'
-    
-    result = subprocess.run(
-        [sys.executable, str(split_update_script), temp_md_path],
-        cwd=project_root
-    )
-    
-    # 3. 임시 파일 정리
-    try:
-        os.unlink(temp_md_path)
-    except:
-        pass
-    
-    return result.returncode
+    from regctl import run_step
+    return run_step('split', [md_path])
+
+def report_conversion_savings(elapsed, skipped):
+    """변환 결과 재사용으로 절약된 시간 출력"""
+    print()
+    print(f"⏱️  변환 1회: {elapsed:.1f}초")
+    print(f"   재사용으로 생략된 변환: {skipped}회 (약 {elapsed * skipped:.1f}초 절약)")
+
+def parse_args(argv):
+    """명령행 인자 해석: <FILE_PATH> [--page-jobs N]"""
+    input_path = None
+    page_jobs = 1
+    args = iter(argv)
+    for arg in args:
+        if arg == '--page-jobs':
+            page_jobs = int(next(args, '0'))
+        elif input_path is None:
+            input_path = arg
+    return input_path, page_jobs
 
 def main():
     """메인 실행 함수"""
@@ -236,17 +281,17 @@ def main():
     print("=" * 60)
     
     # 인자 확인
-    if len(sys.argv) < 2:
+    input_path, page_jobs = parse_args(sys.argv[1:])
+    if not input_path:
         print("\n사용법:")
-        print(f"  python {sys.argv[0]} <FILE_PATH>")
+        print(f"  python {sys.argv[0]} <FILE_PATH> [--page-jobs N]")
         print("\n예시:")
         print(f"  python {sys.argv[0]} regulations_source/new/규정집.pdf")
         print(f"  python {sys.argv[0]} regulations_source/new/규정집.docx")
         print(f"  python {sys.argv[0]} regulations_source/new/교직원포상규정.pdf")
+        print(f"  python {sys.argv[0]} regulations_source/new/규정집.pdf --page-jobs 0")
         sys.exit(1)
     
-    input_path = sys.argv[1]
-    
     # 파일 존재 확인
     if not os.path.exists(input_path):
         print(f"❌ 파일을 찾을 수 없습니다: {input_path}")
@@ -265,30 +310,62 @@ def main():
     regulations = load_regulations_db()
     print(f"📚 규정 데이터베이스: {len(regulations)}개 규정 로드됨")
     
-    # PDF/DOCX → MD 변환 (분석용)
-    temp_md_path = convert_to_md(input_path)
+    # 변환 없이 원본에서 바로 분석 (실패하면 변환 결과로 분석)
+    regulation_count = None
+    start_page = 0
+    if ext == '.docx':
+        try:
+            regulation_count = analyze_docx_content(input_path, regulations)
+        except Exception as e:
+            print(f"⚠️  DOCX 직접 분석 실패, 변환 후 분석합니다: {e}")
+    elif ext == '.pdf':
+        try:
+            regulation_count, first_title_page = analyze_pdf_content(input_path, regulations)
+            # 통합 문서는 첫 규정 제목 이전 페이지(표지 등)를 변환하지 않음
+            # (split_and_update.py도 첫 제목 이전 내용은 사용하지 않음)
+            if regulation_count and regulation_count >= 2 and first_title_page:
+                start_page = first_title_page
+        except Exception as e:
+            print(f"⚠️  PDF 텍스트 분석 실패, 변환 후 분석합니다: {e}")
     
-    # 내용 분석
-    regulation_count = analyze_md_content(temp_md_path, regulations)
+    # PDF/DOCX → MD 변환 (1회만 수행하고 분석/분리/업데이트 단계에서 재사용)
+    convert_start = time.perf_counter()
+    temp_md_path, converted = convert_to_md(input_path, start_page=start_page, page_jobs=page_jobs)
+    convert_elapsed = time.perf_counter() - convert_start
     
-    # 임시 파일 정리
+    # 변환 결과를 쓰는 단계 수 (분리/업데이트 단계 + 원본 분석이 안 됐으면 내용 분석)
+    md_uses = 1
     try:
-        os.unlink(temp_md_path)
-    except:
-        pass
+        # 내용 분석
+        if regulation_count is None:
+            regulation_count = analyze_md_content(temp_md_path, regulations)
+            md_uses += 1
+        
+        # 판단 및 처리
+        if regulation_count >= 2:
+            # 2개 이상 → 통합 문서
+            exit_code = process_multiple_regulations(input_path, temp_md_path)
+        elif regulation_count == 1:
+            # 1개 → 단일 규정
+            exit_code = process_single_regulation(input_path, temp_md_path)
+        else:
+            # 0개 → 매칭 실패, 단일 규정으로 간주 (smart_update가 제목 기반 매칭 시도)
+            print("\n⚠️  regulations.json에서 매칭되는 제목을 찾지 못했습니다.")
+            print("   단일 규정으로 간주하여 제목 기반 매칭을 시도합니다.")
+            exit_code = process_single_regulation(input_path, temp_md_path)
+    finally:
+        # 임시 파일 정리
+        try:
+            os.unlink(temp_md_path)
+        except:
+            pass
+    
+    # 분석용 변환을 분리/업데이트 단계에서 재사용한 경우만 (캐시 적중이나 단계 실패는 제외)
+    if converted and exit_code == 0 and md_uses > 1:
+        report_conversion_savings(convert_elapsed, skipped=md_uses - 1)
+    print(f"📦 변환 캐시: {ConversionCache().stats_line()}")
     
-    # 판단 및 처리
-    if regulation_count >= 2:
-        # 2개 이상 → 통합 문서
-        return process_multiple_regulations(input_path)
-    elif regulation_count == 1:
-        # 1개 → 단일 규정
-        return process_single_regulation(input_path)
-    else:
-        # 0개 → 매칭 실패, 단일 규정으로 간주 (smart_update가 제목 기반 매칭 시도)
-        print("\n⚠️  regulations.json에서 매칭되는 제목을 찾지 못했습니다.")
-        print("   단일 규정으로 간주하여 제목 기반 매칭을 시도합니다.")
-        return process_single_regulation(input_path)
+    return exit_code
 
 if __name__ == '__main__':
     try:
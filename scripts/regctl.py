@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+규정 처리 통합 명령 (regctl)
+
+단계마다 python3를 새로 띄우면 매번 인터프리터 시작, 모듈 import, 카탈로그 열기를 다시 합니다.
+regctl은 한 프로세스 안에서 각 스크립트의 main()을 바로 호출하므로
+- 규정 카탈로그(regulation_catalog.get_catalog), pandoc 서버 풀 등을 단계끼리 공유하고
+- 하위 명령에 필요한 모듈만 처음 쓸 때 import합니다 (pdf2docx 등 무거운 의존성은 각 모듈 안에서 지연 import)
+
+하위 명령 (인자는 기존 스크립트와 같음):
+    process <파일> [--page-jobs N]       process_regulation.py
+    split <통합 md> [--stream]           split_and_update.py
+    update <파일> [--md 변환결과.md]     smart_update.py
+    batch [--jobs N]                     batch_smart_update.py
+    regenerate [--incremental|--check]   regenerate_regulations_db.py
+    sync-rag [--link-mode ...]           sync_rag_folder.py
+    fix-mdx [md 파일...]                 fix-mdx-issues.py
+    catalog <get|title|...>              regulation_catalog.py
+    cache <stats|clear|convert>          conversion_cache.py
+    watch [--regenerate] [--poll N]      watch_new.py (new/ 폴더 감시, Ctrl+C로 종료)
+
+' + '로 여러 단계를 한 프로세스에서 이어서 실행합니다 (실패한 단계가 있으면 중단).
+--timings를 주거나 REGCTL_TIMINGS=1이면 인터프리터 시작 시간과 단계별 import/실행 시간을 출력합니다.
+(모듈별 import 시간을 더 자세히 보려면 python3 -X importtime scripts/regctl.py ...)
+--trace는 처리 단계별/문서별 시간과 메모리를 Chrome trace JSON으로 기록하고 (stage_trace.py),
+--budgets <예산.json>을 주면 예산을 넘은 단계가 있을 때 종료 코드 1로 끝납니다.
+
+사용법:
+    python3 scripts/regctl.py [--timings] [--trace] [--budgets 예산.json] <명령> [인자...] [+ <명령> [인자...] ...]
+    python3 scripts/regctl.py --timings process regulations_source/new/규정집.pdf + regenerate --incremental + sync-rag
+"""
+
+import os
+import sys
+import time
+import importlib
+import traceback
+from pathlib import Path
+
+START = time.perf_counter()
+
+project_root = Path(__file__).resolve().parent.parent
+
+# 하위 명령 → 모듈
+COMMANDS = {
+    'process': 'process_regulation',
+    'split': 'split_and_update',
+    'update': 'smart_update',
+    'batch': 'batch_smart_update',
+    'regenerate': 'regenerate_regulations_db',
+    'sync-rag': 'sync_rag_folder',
+    'fix-mdx': 'fix-mdx-issues',
+    'catalog': 'regulation_catalog',
+    'cache': 'conversion_cache',
+    'watch': 'watch_new',
+}
+
+# 실행한 단계 기록 [{'command', 'depth', 'import', 'run', 'exit'}]
+timings = []
+_depth = 0
+
+def process_age():
+    """프로세스 시작 후 경과 시간 (초, Linux /proc 기준, 알 수 없으면 None)"""
+    try:
+        with open('/proc/self/stat', 'r') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime', 'r') as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def exit_status(code):
+    """main() 반환값 / SystemExit 코드 → 종료 코드"""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code)
+    return 1
+
+def run_step(command, argv=()):
+    """하위 명령을 현재 프로세스에서 실행 → 종료 코드
+
+    스크립트의 main()은 sys.argv를 읽으므로 실행하는 동안만 바꿔 두고,
+    sys.exit()는 종료 코드로 바꿔 다음 단계가 이어서 실행될 수 있게 합니다.
+    """
+    global _depth
+    module_name = COMMANDS[command]
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    imported = time.perf_counter()
+
+    from stage_trace import stage
+
+    saved_argv = sys.argv
+    sys.argv = [module.__file__, *argv]
+    record = {'command': command, 'depth': _depth, 'import': imported - start}
+    timings.append(record)
+    _depth += 1
+    try:
+        with stage(f"regctl {command}", document=argv[0] if argv else None):
+            code = exit_status(module.main())
+    except SystemExit as e:
+        code = exit_status(e.code)
+    except KeyboardInterrupt:
+        raise
+    except Exception as e:
+        print(f"\n❌ 오류 발생 ({command}): {e}")
+        traceback.print_exc()
+        code = 1
+    finally:
+        _depth -= 1
+        sys.argv = saved_argv
+    record['run'] = time.perf_counter() - imported
+    record['exit'] = code
+    return code
+
+def split_steps(args):
+    """'+'로 나뉜 인자 → [(명령, 인자 목록)]"""
+    steps = [[]]
+    for arg in args:
+        if arg == '+':
+            steps.append([])
+        else:
+            steps[-1].append(arg)
+    return [(step[0], step[1:]) for step in steps if step]
+
+def print_timings(total):
+    """단계별 소요 시간 출력"""
+    print()
+    print("=" * 60)
+    print("⏱️  regctl 소요 시간")
+    print("=" * 60)
+    age = process_age()
+    if age is not None:
+        # 프로세스 시작 ~ 지금까지에서 regctl 진입 이후 시간을 빼면 인터프리터 시작 시간
+        print(f"   인터프리터 시작: {max(0.0, age - (time.perf_counter() - START)):.2f}초")
+    print(f"   {'단계':<14} {'import':>8} {'실행':>8}  종료 코드")
+    for record in timings:
+        name = '  ' * record['depth'] + record['command']
+        print(f"   {name:<14} {record['import']:7.2f}초 {record.get('run', 0.0):7.2f}초  {record.get('exit', '-')}")
+    print(f"   전체: {total:.2f}초")
+
+def usage():
+    print(__doc__[__doc__.index('하위 명령 ('):].rstrip())
+
+def main():
+    """명령행 실행"""
+    args = sys.argv[1:]
+    show_timings = os.environ.get('REGCTL_TIMINGS', '0') != '0'
+    while args and args[0] in ('--timings', '--trace', '--budgets'):
+        if args[0] == '--timings':
+            show_timings = True
+        else:
+            os.environ.setdefault('REGULATION_TRACE', '1')
+            if args[0] == '--budgets' and len(args) > 1:
+                os.environ['REGULATION_TRACE_BUDGETS'] = os.path.abspath(args[1])
+                args = args[1:]
+        args = args[1:]
+
+    steps = split_steps(args)
+    if not steps or any(command not in COMMANDS for command, _ in steps):
+        unknown = [command for command, _ in steps if command not in COMMANDS]
+        if unknown:
+            print(f"❌ 알 수 없는 명령: {', '.join(unknown)}")
+        usage()
+        return 1
+
+    # 추적 설정은 하위 모듈보다 먼저 읽어야 작업 프로세스까지 같은 실행으로 기록됨
+    import stage_trace
+
+    # 기존 스크립트들은 프로젝트 루트 기준 경로를 사용
+    os.chdir(project_root)
+
+    code = 0
+    try:
+        for command, argv in steps:
+            code = run_step(command, argv)
+            if code != 0:
+                if len(steps) > 1:
+                    print(f"\n❌ {command} 단계 실패 (종료 코드 {code}), 나머지 단계를 건너뜁니다.")
+                break
+    except KeyboardInterrupt:
+        print("\n\n⚠️  사용자가 중단했습니다.")
+        code = 130
+
+    if show_timings:
+        print_timings(time.perf_counter() - START)
+    if stage_trace.finish() and code == 0:
+        code = 1
+    return code
+
+if __name__ == '__main__':
+    # 하위 스크립트가 'import regctl'로 run_step을 쓰므로 같은 모듈(같은 시간 기록)을 사용
+    import regctl
+    regctl.START = START
+    sys.exit(regctl.main())
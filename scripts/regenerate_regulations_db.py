@@ -2,93 +2,315 @@
 """
 regulations.json 재생성 스크립트
 
-regulations/ 폴더의 모든 MD 파일을 스캔하여
-regulations.json 파일을 다시 생성합니다.
+regulations/ 폴더의 모든 MD 파일을 스캔하여 규정 카탈로그(.cache/regulations.sqlite,
+regulation_catalog.py)에 반영하고 regulations.json 파일을 다시 생성합니다.
+
+--incremental 모드에서는 파일별 mtime/크기/내용 해시를 매니페스트
+(.cache/regulations_manifest.json)에 저장해 두고,
+- mtime과 크기가 같으면 파일을 열지 않고 이전 결과 재사용
+- mtime만 바뀌고 내용 해시가 같으면 제목 추출 생략
+- 새로 생겼거나 바뀐 파일만 다시 읽기 (많으면 스레드 풀로 병렬 처리)
+- 삭제된 파일은 매니페스트와 결과에서 제거
+합니다.
+
+스캔 후에는 regulations.json과 디스크 사이의 불일치(drift)를 보고합니다.
+- 첫 줄이 제목처럼 보이지만 '#'이 없어 건너뛴 파일
+- regulations.json에는 있지만 파일이 없는 규정
+- 파일은 있지만 regulations.json에 없는 규정
+- 제목이 바뀐 규정
+
+사용법:
+    python3 scripts/regenerate_regulations_db.py [--incremental] [--check]
+      --incremental  매니페스트 기반 증분 스캔
+      --check        regulations.json을 저장하지 않고 불일치만 확인 (있으면 종료 코드 1)
 """
 
 import os
+import sys
 import json
 import re
-from datetime import datetime
+import hashlib
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from title_index import normalize_title
+from document_probe import REG_PATTERN
+from regulation_catalog import RegulationCatalog, get_catalog
+from stage_trace import traced
+
+MANIFEST_PATH = Path('.cache') / 'regulations_manifest.json'
+MANIFEST_VERSION = 1
+# 다시 읽을 파일이 이보다 많으면 스레드 풀 사용
+PARALLEL_THRESHOLD = 16
+
 def extract_title_from_md(filepath):
     """MD 파일에서 첫 번째 헤딩(제목) 추출"""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith('#'):
-                    # # 제거하고 제목만 추출
-                    title = re.sub(r'^#+\s*', '', line).strip()
-                    if title:
-                        return title
-        return None
+            return extract_title_from_lines(f)
     except Exception as e:
         print(f"⚠️  {filepath} 읽기 실패: {e}")
         return None
 
-def normalize_title(title):
-    """제목 정규화 (공백, 특수문자 제거, 소문자 변환)"""
-    if not title:
-        return ""
-    return re.sub(r'[\s\.\·\-]', '', title).lower()
+def extract_title_from_lines(lines):
+    """라인들에서 첫 번째 헤딩(제목) 추출"""
+    for line in lines:
+        line = line.strip()
+        if line.startswith('#'):
+            # # 제거하고 제목만 추출
+            title = re.sub(r'^#+\s*', '', line).strip()
+            if title:
+                return title
+    return None
+
+def first_nonempty_line(lines):
+    """비어 있지 않은 첫 줄 (drift 검사용)"""
+    for line in lines:
+        line = line.strip()
+        if line:
+            return line
+    return None
+
+def read_title(filepath):
+    """첫 헤딩까지만 읽어 (제목, 비어 있지 않은 첫 줄) 반환 (제목이 없으면 끝까지 읽음)"""
+    first_line = None
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if first_line is None:
+                first_line = line
+            if line.startswith('#'):
+                title = re.sub(r'^#+\s*', '', line).strip()
+                if title:
+                    return title, first_line
+    return None, first_line
+
+def analyze_file(filepath, cached=None):
+    """파일의 크기/mtime/내용 해시와 제목, 첫 줄 반환 (증분 스캔용)
+
+    cached(매니페스트 항목)와 내용 해시가 같으면 디코딩/제목 추출 없이 이전 결과를 재사용합니다.
+    """
+    st = os.stat(filepath)
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    info = {
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size,
+        'sha256': hashlib.sha256(data).hexdigest(),
+    }
+    if cached and cached.get('sha256') == info['sha256']:
+        info['title'] = cached.get('title')
+        info['first_line'] = cached.get('first_line')
+        return info
+    lines = data.decode('utf-8').splitlines()
+    info['title'] = extract_title_from_lines(lines)
+    info['first_line'] = first_nonempty_line(lines)
+    return info
+
+def iter_regulation_files(regulations_dir='regulations'):
+    """regulations 폴더의 규정 MD 파일 (백업 파일 제외)"""
+    for root, dirs, files in os.walk(regulations_dir):
+        for file in files:
+            if file.endswith('.md') and '.backup.' not in file:
+                yield os.path.join(root, file), file
+
+def make_entry(filepath, file, title):
+    """regulations.json 항목 생성"""
+    relative_path = os.path.relpath(filepath, start='.')
+    # 카테고리 (regulations/ 이후 경로)
+    category = os.path.dirname(relative_path).replace('regulations/', '').replace('regulations\\', '')
+    return {
+        # 규정 코드 (파일명에서 .md 제거)
+        "code": file.replace('.md', ''),
+        "title": title,
+        "title_normalized": normalize_title(title),
+        "category": category,
+        "path": relative_path.replace('\\', '/'),  # Windows 경로 → Unix 경로
+        "filename": file
+    }
 
-def scan_regulations(regulations_dir='regulations'):
-    """regulations 폴더를 스캔하여 모든 규정 파일 정보 수집"""
+def scan_regulations(regulations_dir='regulations', untitled=None):
+    """regulations 폴더를 스캔하여 모든 규정 파일 정보 수집
+
+    untitled 리스트를 주면 제목이 없는 파일의 (경로, 첫 줄)을 추가합니다.
+    """
     regulations = []
     
-    for root, dirs, files in os.walk(regulations_dir):
-        # 백업 파일 제외
-        files = [f for f in files if f.endswith('.md') and '.backup.' not in f]
+    for filepath, file in iter_regulation_files(regulations_dir):
+        relative_path = os.path.relpath(filepath, start='.')
+        try:
+            title, first_line = read_title(filepath)
+        except Exception as e:
+            print(f"⚠️  {filepath} 읽기 실패: {e}")
+            continue
         
-        for file in files:
-            filepath = os.path.join(root, file)
-            relative_path = os.path.relpath(filepath, start='.')
-            
-            # 규정 코드 (파일명에서 .md 제거)
-            code = file.replace('.md', '')
-            
-            # 제목 추출
-            title = extract_title_from_md(filepath)
-            
-            if not title:
-                print(f"⚠️  제목 없음: {relative_path}")
-                continue
-            
-            # 카테고리 (regulations/ 이후 경로)
-            category = os.path.dirname(relative_path).replace('regulations/', '').replace('regulations\\', '')
-            
-            regulations.append({
-                "code": code,
-                "title": title,
-                "title_normalized": normalize_title(title),
-                "category": category,
-                "path": relative_path.replace('\\', '/'),  # Windows 경로 → Unix 경로
-                "filename": file
-            })
+        if not title:
+            print(f"⚠️  제목 없음: {relative_path}")
+            if untitled is not None:
+                untitled.append((relative_path.replace('\\', '/'), first_line))
+            continue
+        
+        regulations.append(make_entry(filepath, file, title))
     
     return regulations
 
-def save_regulations_db(regulations, output_file='regulations.json'):
-    """regulations.json 파일 저장"""
-    # 코드 순으로 정렬
-    regulations_sorted = sorted(regulations, key=lambda x: x['code'])
-    
-    data = {
-        "version": "1.0",
-        "last_updated": datetime.now().strftime('%Y-%m-%d'),
-        "total_regulations": len(regulations_sorted),
-        "regulations": regulations_sorted
+def load_manifest(manifest_path=MANIFEST_PATH):
+    """매니페스트 로드 (없거나 버전이 다르면 빈 매니페스트)"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == MANIFEST_VERSION:
+            return data.get('files', {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+def save_manifest(files, manifest_path=MANIFEST_PATH):
+    """매니페스트 저장 (임시 파일에 쓴 뒤 교체)"""
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': files}, f, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+
+def scan_regulations_incremental(regulations_dir='regulations', manifest_path=MANIFEST_PATH, untitled=None):
+    """매니페스트를 이용한 증분 스캔
+
+    반환: (규정 목록, 통계 {'unchanged', 'touched', 'reread', 'removed'})
+    """
+    old_files = load_manifest(manifest_path)
+    new_files = {}
+    pending = []
+    stats = {'unchanged': 0, 'touched': 0, 'reread': 0, 'removed': 0}
+
+    for filepath, file in iter_regulation_files(regulations_dir):
+        relative_path = os.path.relpath(filepath, start='.').replace('\\', '/')
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            continue
+        cached = old_files.get(relative_path)
+        if cached and cached['mtime_ns'] == st.st_mtime_ns and cached['size'] == st.st_size:
+            new_files[relative_path] = cached
+            stats['unchanged'] += 1
+        else:
+            pending.append((relative_path, filepath, file))
+
+    def reread(item):
+        relative_path, filepath, file = item
+        try:
+            return item, analyze_file(filepath, old_files.get(relative_path)), None
+        except Exception as e:
+            return item, None, e
+
+    if len(pending) > PARALLEL_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as executor:
+            results = list(executor.map(reread, pending))
+    else:
+        results = [reread(item) for item in pending]
+
+    for (relative_path, filepath, file), info, error in results:
+        if error is not None:
+            print(f"⚠️  {filepath} 읽기 실패: {error}")
+            continue
+        cached = old_files.get(relative_path)
+        if cached and cached['sha256'] == info['sha256'] and 'entry' in cached:
+            stats['touched'] += 1  # mtime만 바뀜 (체크아웃 등) → 이전 제목/항목 재사용
+            info['entry'] = cached['entry']
+        else:
+            stats['reread'] += 1
+            info['entry'] = make_entry(filepath, file, info['title']) if info['title'] else None
+        new_files[relative_path] = info
+
+    stats['removed'] = len(set(old_files) - set(new_files))
+    save_manifest(new_files, manifest_path)
+
+    reread_paths = {item[0] for item in pending}
+    regulations = []
+    for relative_path, info in sorted(new_files.items()):
+        if info.get('entry'):
+            regulations.append(info['entry'])
+        else:
+            if relative_path in reread_paths:
+                print(f"⚠️  제목 없음: {relative_path}")
+            if untitled is not None:
+                untitled.append((relative_path, info.get('first_line')))
+    return regulations, stats
+
+def looks_like_title(line, catalog_titles):
+    """'#' 없이 쓰인 제목 줄인지 판단 (등록된 제목이거나 규정 이름 패턴)"""
+    if not line:
+        return False
+    plain = line.strip('*').strip()
+    return normalize_title(plain) in catalog_titles or bool(REG_PATTERN.match(plain))
+
+def detect_drift(regulations, untitled, db_path='regulations.json'):
+    """regulations.json과 디스크 스캔 결과 비교
+
+    반환: {'unheaded', 'missing', 'unlisted', 'retitled'} 각 항목 리스트
+    """
+    try:
+        catalog = get_catalog(db_path).all()
+    except (OSError, ValueError, sqlite3.Error):
+        catalog = []
+
+    catalog_by_path = {reg['path']: reg for reg in catalog}
+    catalog_titles = {normalize_title(reg['title']) for reg in catalog}
+    scanned_by_path = {reg['path']: reg for reg in regulations}
+
+    drift = {
+        'unheaded': [(path, line) for path, line in untitled if looks_like_title(line, catalog_titles)],
+        'missing': sorted(path for path in catalog_by_path
+                          if path not in scanned_by_path and not os.path.exists(path)),
+        'unlisted': sorted(path for path in scanned_by_path if path not in catalog_by_path),
+        'retitled': sorted((path, catalog_by_path[path]['title'], reg['title'])
+                           for path, reg in scanned_by_path.items()
+                           if path in catalog_by_path and catalog_by_path[path]['title'] != reg['title']),
     }
+    return drift
+
+def print_drift(drift):
+    """불일치 보고 출력 (불일치 항목 수 반환)"""
+    total = sum(len(items) for items in drift.values())
+    if not total:
+        print("✅ regulations.json과 디스크가 일치합니다.")
+        return 0
+
+    print(f"⚠️  regulations.json과 디스크 불일치: {total}건")
+    for path, line in drift['unheaded']:
+        print(f"   [# 없음]   {path}: \"{line}\" (제목 줄에 '#'을 붙여야 인식됩니다)")
+    for path in drift['missing']:
+        print(f"   [파일 없음] {path}")
+    for path in drift['unlisted']:
+        print(f"   [미등록]   {path}")
+    for path, old_title, new_title in drift['retitled']:
+        print(f"   [제목 변경] {path}: {old_title} → {new_title}")
+    return total
+
+def save_regulations_db(regulations, output_file='regulations.json'):
+    """스캔 결과를 카탈로그(.cache/regulations.sqlite)에 반영하고 regulations.json으로 내보내기"""
+    catalog = RegulationCatalog(json_path=output_file)
+    stats = catalog.upsert(regulations, prune=True)
+    print(f"🗂️  카탈로그 반영: 추가 {stats['inserted']}, 변경 {stats['updated']}, "
+          f"삭제 {stats['deleted']}, 동일 {stats['unchanged']}")
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # 코드 순으로 정렬하여 임시 파일에 쓴 뒤 교체 (batch_writer.py)
+    count = catalog.export_json(output_file)
+    catalog.close()
     
-    print(f"✅ {output_file} 생성 완료: {len(regulations_sorted)}개 규정")
+    print(f"✅ {output_file} 생성 완료: {count}개 규정")
 
-def main():
+@traced('regenerate')
+def main(argv=None):
     """메인 실행 함수"""
+    argv = sys.argv[1:] if argv is None else argv
+    incremental = '--incremental' in argv
+    check_only = '--check' in argv
+
     print("=" * 60)
     print("🔄 regulations.json 재생성")
     print("=" * 60)
@@ -101,8 +323,23 @@ def main():
         return 1
     
     # 규정 파일 스캔
-    print("📂 regulations 폴더 스캔 중...")
-    regulations = scan_regulations()
+    untitled = []
+    if incremental:
+        print("📂 regulations 폴더 증분 스캔 중...")
+        regulations, stats = scan_regulations_incremental(untitled=untitled)
+        print(f"   변경 없음 {stats['unchanged']}개, 내용 동일 {stats['touched']}개, "
+              f"다시 읽음 {stats['reread']}개, 삭제 {stats['removed']}개")
+    else:
+        print("📂 regulations 폴더 스캔 중...")
+        regulations = scan_regulations(untitled=untitled)
+    print()
+    
+    # regulations.json과 디스크 비교
+    drift_count = print_drift(detect_drift(regulations, untitled))
+    print()
+    
+    if check_only:
+        return 1 if drift_count else 0
     
     if not regulations:
         print("❌ 규정 파일을 찾을 수 없습니다.")
@@ -132,7 +369,6 @@ def main():
     return 0
 
 if __name__ == '__main__':
-    import sys
     try:
         exit_code = main()
         sys.exit(exit_code)
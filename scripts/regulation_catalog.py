@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+규정 카탈로그 (SQLite 색인)
+
+스크립트마다 regulations.json 전체를 읽어 목록을 처음부터 훑는 대신
+.cache/regulations.sqlite 카탈로그에 색인을 두고 필요한 규정만 조회합니다.
+
+- 테이블 regulations: 코드(기본 키), 제목, 정규화된 제목, 카테고리, 경로, 파일명, 원본 항목(JSON)
+- 색인: 코드, 정규화된 제목, 카테고리, 경로
+- regenerate_regulations_db.py가 스캔 결과를 카탈로그에 반영(upsert)하고,
+  사이트/사이드바용 regulations.json은 카탈로그에서 내보냄(export)
+- regulations.json이 카탈로그보다 새로우면(git pull, 직접 수정 등) 조회할 때 자동으로 다시 가져옴
+  (mtime/크기가 같으면 파일을 읽지 않고, 다르면 내용 해시까지 비교)
+
+사용법:
+    python3 scripts/regulation_catalog.py get <코드>
+    python3 scripts/regulation_catalog.py title <제목>
+    python3 scripts/regulation_catalog.py category <카테고리>
+    python3 scripts/regulation_catalog.py import            # regulations.json → 카탈로그
+    python3 scripts/regulation_catalog.py export [경로]     # 카탈로그 → regulations.json
+    python3 scripts/regulation_catalog.py stats
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+from title_index import normalize_title
+
+project_root = Path(__file__).resolve().parent.parent
+
+DEFAULT_JSON_PATH = project_root / 'regulations.json'
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS regulations (
+    code TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    normalized_title TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT '',
+    path TEXT NOT NULL DEFAULT '',
+    filename TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_regulations_normalized_title ON regulations(normalized_title);
+CREATE INDEX IF NOT EXISTS idx_regulations_category ON regulations(category);
+CREATE INDEX IF NOT EXISTS idx_regulations_path ON regulations(path);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def file_signature(path):
+    """변경 감지용 "mtime_ns:크기" (없으면 None)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+class RegulationCatalog:
+    """SQLite 규정 카탈로그"""
+
+    def __init__(self, db_path=None, json_path=None):
+        self.json_path = Path(json_path or DEFAULT_JSON_PATH)
+        # regulations.json마다 카탈로그 하나 (<json 폴더>/.cache/regulations.sqlite)
+        self.db_path = Path(db_path) if db_path else self.json_path.resolve().parent / '.cache' / 'regulations.sqlite'
+        self._conn = None
+        self._writes = 0
+        self._all_cache = None
+        self._json_signature = None
+
+    def _open(self):
+        """DB 연결 (스키마 버전이 다르면 다시 만듦)"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.row_factory = sqlite3.Row
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.executescript('DROP TABLE IF EXISTS regulations; DROP TABLE IF EXISTS meta;')
+                conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    @property
+    def conn(self):
+        """DB 연결 (처음 열 때 regulations.json 변경 확인)"""
+        if self._conn is None:
+            self._open()
+            self.sync_from_json()
+        return self._conn
+
+    def refresh(self):
+        """regulations.json이 마지막 확인 이후 바뀌었으면 다시 가져옴 → DB 연결
+
+        상주 프로세스(watch_new.py, regctl 여러 단계)가 git pull/직접 수정/다른 스크립트의
+        변경을 놓치지 않도록 조회할 때마다 stat 한 번으로 확인합니다.
+        """
+        conn = self.conn
+        if file_signature(self.json_path) != self._json_signature:
+            self.sync_from_json()
+        return conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _meta(self, key):
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._conn.execute('INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)', (key, value))
+
+    def sync_from_json(self, force=False):
+        """regulations.json이 바뀌었으면 카탈로그에 다시 가져옴 → 가져왔는지 여부"""
+        conn = self._open()
+        signature = file_signature(self.json_path)
+        if signature is None:
+            return False
+        if not force and signature == self._meta('json_signature'):
+            self._json_signature = signature
+            return False
+        with open(self.json_path, 'rb') as f:
+            raw = f.read()
+        digest = hash_bytes(raw)
+        with conn:
+            if not force and digest == self._meta('json_sha256'):
+                self._set_meta('json_signature', signature)
+                self._json_signature = signature
+                return False
+            data = json.loads(raw.decode('utf-8'))
+            self._replace_all(data.get('regulations', []))
+            self._set_meta('json_signature', signature)
+            self._set_meta('json_sha256', digest)
+            self._set_meta('version', str(data.get('version', '1.0')))
+            self._set_meta('last_updated', str(data.get('last_updated', '')))
+        self._json_signature = signature
+        self._writes += 1
+        return True
+
+    def _row(self, reg):
+        title = reg.get('title', '')
+        return (
+            reg['code'],
+            title,
+            normalize_title(title),
+            reg.get('category', ''),
+            reg.get('path', ''),
+            reg.get('filename', ''),
+            json.dumps(reg, ensure_ascii=False),
+        )
+
+    def _replace_all(self, regulations):
+        self._conn.execute('DELETE FROM regulations')
+        self._conn.executemany('INSERT OR REPLACE INTO regulations VALUES (?, ?, ?, ?, ?, ?, ?)',
+                               [self._row(reg) for reg in regulations])
+
+    def upsert(self, regulations, prune=False):
+        """규정 항목 반영 → {'inserted', 'updated', 'unchanged', 'deleted'}
+
+        prune이면 regulations에 없는 코드는 삭제합니다 (전체 스캔 결과를 반영할 때).
+        """
+        conn = self.conn
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0}
+        existing = {row['code']: row['data'] for row in conn.execute('SELECT code, data FROM regulations')}
+        with conn:
+            for reg in regulations:
+                row = self._row(reg)
+                old = existing.get(reg['code'])
+                if old == row[-1]:
+                    stats['unchanged'] += 1
+                    continue
+                conn.execute('INSERT OR REPLACE INTO regulations VALUES (?, ?, ?, ?, ?, ?, ?)', row)
+                stats['inserted' if old is None else 'updated'] += 1
+            if prune:
+                keep = {reg['code'] for reg in regulations}
+                stale = [(code,) for code in existing if code not in keep]
+                conn.executemany('DELETE FROM regulations WHERE code = ?', stale)
+                stats['deleted'] = len(stale)
+        if stats['inserted'] or stats['updated'] or stats['deleted']:
+            self._writes += 1
+        return stats
+
+    def _entries(self, sql, params=()):
+        return [json.loads(row['data']) for row in self.refresh().execute(sql, params)]
+
+    def get(self, code):
+        """코드로 조회 (없으면 None)"""
+        rows = self._entries('SELECT data FROM regulations WHERE code = ?', (code,))
+        return rows[0] if rows else None
+
+    def by_title(self, title):
+        """정규화된 제목이 정확히 같은 규정 목록"""
+        return self._entries('SELECT data FROM regulations WHERE normalized_title = ? ORDER BY code',
+                             (normalize_title(title),))
+
+    def by_category(self, category):
+        """카테고리(하위 카테고리 포함)의 규정 목록"""
+        return self._entries(
+            "SELECT data FROM regulations WHERE category = ? OR category LIKE ? ESCAPE '\\' ORDER BY code",
+            (category, category.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '/%'))
+
+    def by_path(self, path):
+        """규정 파일 경로로 조회 (없으면 None)"""
+        rows = self._entries('SELECT data FROM regulations WHERE path = ?', (str(path).replace('\\', '/'),))
+        return rows[0] if rows else None
+
+    def _data_version(self):
+        """카탈로그 내용이 바뀌면 달라지는 값
+        (다른 연결/프로세스의 변경은 PRAGMA data_version, 이 연결의 변경은 쓰기 횟수)"""
+        return self.refresh().execute('PRAGMA data_version').fetchone()[0], self._writes
+
+    def all(self):
+        """전체 규정 목록 (코드 순)
+
+        카탈로그가 바뀌지 않았으면 같은 목록 객체를 돌려주므로 (제목 색인 등이 목록 단위로 캐시됨)
+        호출한 쪽에서 목록을 수정하지 않습니다.
+        """
+        version = self._data_version()
+        if self._all_cache is None or self._all_cache[0] != version:
+            self._all_cache = (version, self._entries('SELECT data FROM regulations ORDER BY code'))
+        return self._all_cache[1]
+
+    def count(self):
+        return self.refresh().execute('SELECT COUNT(*) FROM regulations').fetchone()[0]
+
+    def categories(self):
+        """카테고리별 규정 수"""
+        return {row[0]: row[1] for row in
+                self.refresh().execute('SELECT category, COUNT(*) FROM regulations GROUP BY category ORDER BY category')}
+
+    def export_data(self, last_updated=None):
+        """regulations.json 형식의 dict"""
+        regulations = self.all()
+        return {
+            "version": "1.0",
+            "last_updated": last_updated or datetime.now().strftime('%Y-%m-%d'),
+            "total_regulations": len(regulations),
+            "regulations": regulations,
+        }
+
+    def export_json(self, output_file=None, last_updated=None):
+        """카탈로그를 regulations.json 형식으로 내보내기 (사이트/사이드바용) → 규정 수"""
+        from batch_writer import BatchWriter
+
+        output_file = Path(output_file or self.json_path)
+        data = self.export_data(last_updated)
+        with BatchWriter('regulations_db') as batch:
+            batch.write_json(output_file, data)
+        if output_file.resolve() == self.json_path.resolve():
+            # 방금 내보낸 파일은 다시 가져오지 않음
+            with open(output_file, 'rb') as f:
+                digest = hash_bytes(f.read())
+            with self.conn:
+                self._json_signature = file_signature(output_file)
+                self._set_meta('json_signature', self._json_signature)
+                self._set_meta('json_sha256', digest)
+                self._set_meta('last_updated', data['last_updated'])
+        return data['total_regulations']
+
+_catalogs = {}
+
+def get_catalog(json_path=None):
+    """프로세스 공용 카탈로그 (regulations.json 경로별)"""
+    key = str(Path(json_path or DEFAULT_JSON_PATH).resolve())
+    if key not in _catalogs:
+        _catalogs[key] = RegulationCatalog(json_path=json_path)
+    return _catalogs[key]
+
+def print_entries(entries):
+    for reg in entries:
+        print(f"{reg['code']:<10} {reg['title']}  ({reg['path']})")
+    if not entries:
+        print("(없음)")
+
+def main():
+    """명령행 실행"""
+    args = sys.argv[1:]
+    commands = ('get', 'title', 'category', 'import', 'export', 'stats')
+    if not args or args[0] not in commands:
+        print(__doc__.split('사용법:')[1].rstrip())
+        return 1
+
+    catalog = RegulationCatalog()
+    command = args[0]
+    if command == 'import':
+        catalog.sync_from_json(force=True)
+        print(f"✅ {catalog.json_path} → {catalog.db_path}: {catalog.count()}개 규정")
+        return 0
+    if command == 'export':
+        output = Path(args[1]) if len(args) > 1 else catalog.json_path
+        count = catalog.export_json(output)
+        print(f"✅ {output} 내보내기 완료: {count}개 규정")
+        return 0
+    if command == 'stats':
+        print(f"📚 {catalog.db_path}: {catalog.count()}개 규정")
+        for category, count in catalog.categories().items():
+            print(f"   {category}: {count}개")
+        return 0
+
+    if len(args) < 2:
+        print(f"❌ {command}에 검색어를 지정하세요.")
+        return 1
+    if command == 'get':
+        reg = catalog.get(args[1])
+        print_entries([reg] if reg else [])
+    elif command == 'title':
+        print_entries(catalog.by_title(' '.join(args[1:])))
+    else:
+        print_entries(catalog.by_category(args[1]))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+규정 구조 파서 및 조문 색인
+
+규정 MD 파일을 평면적인 라인 목록이 아니라
+    머리말 / 제N장 / 부칙
+      └ 제N조[제목]
+          └ ① 항
+              └ 1. 호
+                  └ 가. 목
+트리로 분석하고 각 노드의 바이트 범위(시작, 끝)를 기록합니다.
+
+색인은 .cache/article_index.json에 압축된 형태로 저장하며
+파일별 mtime/크기/내용 해시가 바뀐 규정만 다시 분석합니다.
+"3-1-3 제4조 ⑤" 같은 주소는 색인의 사전에서 바로 찾고(O(1)),
+본문은 해당 바이트 범위만 읽어 반환합니다.
+
+사용법:
+    python3 scripts/regulation_parser.py build
+    python3 scripts/regulation_parser.py get "3-1-3 제4조 ⑤"
+    python3 scripts/regulation_parser.py tree 3-1-3
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+
+DEFAULT_INDEX_PATH = project_root / '.cache' / 'article_index.json'
+INDEX_VERSION = 1
+
+# 제1조\[목적\], 제6조의2\[...\], 제9조 (입찰의 연기), **제1조(목적)**
+ARTICLE_PATTERN = re.compile(r'^\s*(?:\*\*)?제\s*(\d+)\s*조(?:\s*의\s*(\d+))?\s*(?:\\?\[|\(|【|$)')
+ARTICLE_TITLE_PATTERN = re.compile(r'^\s*(?:\*\*)?제\s*\d+\s*조(?:\s*의\s*\d+)?\s*(?:\\?\[(.*?)\\?\]|\((.*?)\)|【(.*?)】)')
+CHAPTER_PATTERN = re.compile(r'^\s*(?:#+\s*)?(?:\*\*)?제\s*(\d+)\s*장(?:\s|$)')
+ADDENDA_PATTERN = re.compile(r'^\s*(?:#+\s*)?(?:\*\*)?부\s*칙\s*(?:\*\*)?\s*(?:\(|$)')
+CLAUSE_PATTERN = re.compile(r'^\s*([①-⑳])')
+# "1\. " (호, pandoc이 목록 기호를 이스케이프) - "3. 31.개정)."처럼 줄바꿈된 날짜는 제외
+ITEM_PATTERN = re.compile(r'^\s*(\d{1,2})\\?\.\s+(?!\d+\.)')
+SUBITEM_PATTERN = re.compile(r'^\s*([가나다라마바사아자차카타파하])\\?\.\s')
+
+FIRST_CLAUSE = '①'.encode('utf-8')
+
+# 노드 종류별 깊이
+LEVELS = {
+    'preamble': 0,
+    'chapter': 1,
+    'addenda': 1,
+    'article': 2,
+    'clause': 3,
+    'item': 4,
+    'subitem': 5,
+}
+
+# 색인에 저장하는 노드 형태: [종류, key, 제목, 부모 번호, 시작 바이트, 끝 바이트, 시작 줄]
+KIND, KEY, TITLE, PARENT, START, END, LINE = range(7)
+
+def classify_line(line, in_article, in_item):
+    """라인이 새 노드의 시작이면 (종류, 라벨, 제목) 반환"""
+    match = ARTICLE_PATTERN.match(line)
+    if match:
+        label = f"제{match.group(1)}조" + (f"의{match.group(2)}" if match.group(2) else '')
+        title_match = ARTICLE_TITLE_PATTERN.match(line)
+        title = next((g for g in title_match.groups() if g), '') if title_match else ''
+        return 'article', label, title.strip()
+    match = CHAPTER_PATTERN.match(line)
+    if match:
+        return 'chapter', f"제{match.group(1)}장", line.strip().lstrip('#').strip('*').strip()
+    if ADDENDA_PATTERN.match(line):
+        return 'addenda', '부칙', ''
+    if not in_article:
+        return None
+    match = CLAUSE_PATTERN.match(line)
+    if match:
+        return 'clause', match.group(1), ''
+    match = ITEM_PATTERN.match(line)
+    if match:
+        return 'item', f"{int(match.group(1))}호", ''
+    if in_item:
+        match = SUBITEM_PATTERN.match(line)
+        if match:
+            return 'subitem', f"{match.group(1)}목", ''
+    return None
+
+def parse_regulation(data):
+    """규정 본문(bytes)을 분석하여 노드 목록 반환 (문서 순서)
+
+    각 노드: [종류, key, 제목, 부모 번호, 시작 바이트, 끝 바이트, 시작 줄]
+    key는 문서 안에서 유일한 주소입니다. (예: '제4조 ⑤ 2호', '부칙[3] 제1조')
+    """
+    nodes = [['preamble', '머리말', '', -1, 0, len(data), 1]]
+    stack = []  # 열려 있는 노드 번호 (바깥 → 안쪽)
+    addenda_no = 0
+    seen = {}
+    offset = 0
+
+    for line_no, raw in enumerate(data.splitlines(keepends=True), 1):
+        start = offset
+        offset += len(raw)
+        in_article = any(nodes[i][KIND] == 'article' for i in stack)
+        in_item = bool(stack) and nodes[stack[-1]][KIND] in ('item', 'subitem')
+        found = classify_line(raw.decode('utf-8', errors='replace'), in_article, in_item)
+        if found is None:
+            continue
+
+        kind, label, title = found
+        if len(nodes) == 1:
+            nodes[0][END] = start  # 머리말은 첫 구조 노드 앞까지
+        # 같거나 높은 수준의 노드는 여기서 끝남
+        level = LEVELS[kind]
+        while stack and LEVELS[nodes[stack[-1]][KIND]] >= level:
+            nodes[stack.pop()][END] = start
+
+        parent = stack[-1] if stack else -1
+        if kind == 'addenda':
+            addenda_no += 1
+            label = f"부칙[{addenda_no}]"
+        # 조 번호는 장과 무관하게 유일하므로 장은 주소에 넣지 않음 (부칙 안의 조는 부칙 포함)
+        if parent >= 0 and (kind != 'article' or nodes[parent][KIND] == 'addenda'):
+            key = f"{nodes[parent][KEY]} {label}"
+        else:
+            key = label
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            key = f"{key}#{seen[key]}"
+
+        nodes.append([kind, key, title, parent, start, len(data), line_no])
+        stack.append(len(nodes) - 1)
+
+        # "제4조\[기강확립\] ① ..."처럼 제목 줄에서 시작하는 첫 항
+        if kind == 'article':
+            pos = raw.find(FIRST_CLAUSE)
+            if pos > 0:
+                article = len(nodes) - 1
+                nodes.append(['clause', f"{key} ①", '', article, start + pos, len(data), line_no])
+                stack.append(len(nodes) - 1)
+
+    return nodes
+
+def parse_address(address):
+    """'3-1-3 제4조 ⑤ 2호' → ('3-1-3', '제4조 ⑤ 2호') (색인 key 형태로 정규화)"""
+    address = address.strip()
+    code, _, rest = address.partition(' ')
+    parts = []
+    token_pattern = re.compile(
+        r'부\s*칙\s*\[?\s*(\d+)\s*\]?'
+        r'|제\s*(\d+)\s*조(?:\s*의\s*(\d+))?'
+        r'|제\s*(\d+)\s*장'
+        r'|([①-⑳])'
+        r'|제?\s*(\d+)\s*호?'
+        r'|([가나다라마바사아자차카타파하])\s*목?'
+        r'|(#\d+)'
+    )
+    for match in token_pattern.finditer(rest):
+        addenda, art, art_sub, chapter, clause, item, subitem, dup = match.groups()
+        if addenda:
+            parts.append(f"부칙[{addenda}]")
+        elif art:
+            parts.append(f"제{art}조" + (f"의{art_sub}" if art_sub else ''))
+        elif chapter:
+            parts.append(f"제{chapter}장")
+        elif clause:
+            parts.append(clause)
+        elif item:
+            parts.append(f"{int(item)}호")
+        elif subitem:
+            parts.append(f"{subitem}목")
+        elif dup and parts:
+            parts[-1] += dup
+    return code, ' '.join(parts)
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+class ArticleIndex:
+    """규정별 구조 트리 + 주소 → 노드 사전"""
+
+    def __init__(self, files=None, index_path=None):
+        self.index_path = Path(index_path or DEFAULT_INDEX_PATH)
+        # files: {상대 경로: {'code', 'mtime_ns', 'size', 'sha256', 'nodes'}}
+        self.files = files or {}
+        self._build_lookup()
+
+    def _build_lookup(self):
+        self.by_code = {}
+        self.lookup = {}
+        for path, info in self.files.items():
+            self.by_code[info['code']] = path
+            for i, node in enumerate(info['nodes']):
+                self.lookup[(info['code'], node[KEY])] = (path, i)
+
+    @classmethod
+    def load(cls, index_path=None):
+        """저장된 색인 로드 (없거나 버전이 다르면 빈 색인)"""
+        index_path = Path(index_path or DEFAULT_INDEX_PATH)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                return cls(data['files'], index_path)
+        except (OSError, ValueError, KeyError):
+            pass
+        return cls(index_path=index_path)
+
+    def save(self):
+        """색인 저장 (공백 없는 JSON, 임시 파일에 쓴 뒤 교체)"""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files}, f,
+                      ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+    def update(self, regulations_dir=None):
+        """바뀐 규정만 다시 분석 → {'parsed', 'unchanged', 'removed'}"""
+        from regenerate_regulations_db import iter_regulation_files
+
+        regulations_dir = Path(regulations_dir or project_root / 'regulations')
+        stats = {'parsed': 0, 'unchanged': 0, 'removed': 0}
+        files = {}
+        for filepath, file in iter_regulation_files(str(regulations_dir)):
+            relative_path = os.path.relpath(filepath, start=project_root).replace('\\', '/')
+            st = os.stat(filepath)
+            cached = self.files.get(relative_path)
+            if cached and cached['mtime_ns'] == st.st_mtime_ns and cached['size'] == st.st_size:
+                files[relative_path] = cached
+                stats['unchanged'] += 1
+                continue
+            with open(filepath, 'rb') as f:
+                data = f.read()
+            digest = hash_bytes(data)
+            if cached and cached['sha256'] == digest:
+                cached = dict(cached, mtime_ns=st.st_mtime_ns)
+                files[relative_path] = cached
+                stats['unchanged'] += 1
+                continue
+            files[relative_path] = {
+                'code': file[:-len('.md')],
+                'mtime_ns': st.st_mtime_ns,
+                'size': st.st_size,
+                'sha256': digest,
+                'nodes': parse_regulation(data),
+            }
+            stats['parsed'] += 1
+        stats['removed'] = len(set(self.files) - set(files))
+        self.files = files
+        self._build_lookup()
+        return stats
+
+    def nodes(self, code):
+        """규정의 노드 목록 (문서 순서)"""
+        path = self.by_code.get(code)
+        return self.files[path]['nodes'] if path else []
+
+    def get(self, address):
+        """주소로 노드 찾기 → (상대 경로, 노드) 또는 None"""
+        found = self.lookup.get(parse_address(address))
+        if found is None:
+            return None
+        path, i = found
+        return path, self.files[path]['nodes'][i]
+
+    def children(self, code, key):
+        """노드의 바로 아래 자식 노드 목록"""
+        found = self.lookup.get((code, key))
+        if found is None:
+            return []
+        path, i = found
+        return [node for node in self.files[path]['nodes'] if node[PARENT] == i]
+
+    def read(self, address):
+        """주소의 본문 텍스트 (해당 바이트 범위만 읽음)"""
+        found = self.get(address)
+        if found is None:
+            return None
+        path, node = found
+        with open(project_root / path, 'rb') as f:
+            f.seek(node[START])
+            return f.read(node[END] - node[START]).decode('utf-8', errors='replace')
+
+_index_cache = {}
+
+def get_article_index(update=True):
+    """프로세스 안에서 한 번만 로드하고, update=True면 바뀐 파일 반영 후 저장"""
+    index = _index_cache.get('index')
+    if index is None:
+        index = ArticleIndex.load()
+        _index_cache['index'] = index
+        if update:
+            stats = index.update()
+            if stats['parsed'] or stats['removed']:
+                index.save()
+    return index
+
+def main():
+    """명령행 실행: build / get / tree"""
+    if len(sys.argv) < 2 or sys.argv[1] not in ('build', 'get', 'tree'):
+        print("사용법:")
+        print(f"  python3 {sys.argv[0]} build")
+        print(f"  python3 {sys.argv[0]} get \"3-1-3 제4조 ⑤\"")
+        print(f"  python3 {sys.argv[0]} tree <규정 코드>")
+        return 1
+
+    command = sys.argv[1]
+    if command == 'build':
+        start = time.perf_counter()
+        index = ArticleIndex.load()
+        stats = index.update()
+        index.save()
+        node_count = sum(len(info['nodes']) for info in index.files.values())
+        print(f"✅ 조문 색인: {len(index.files)}개 규정, {node_count}개 노드 "
+              f"(분석 {stats['parsed']} / 재사용 {stats['unchanged']} / 삭제 {stats['removed']}, "
+              f"{time.perf_counter() - start:.2f}초)")
+        print(f"   {index.index_path}")
+        return 0
+
+    if len(sys.argv) < 3:
+        print("❌ 주소 또는 규정 코드를 입력하세요.")
+        return 1
+
+    index = get_article_index()
+    if command == 'get':
+        text = index.read(sys.argv[2])
+        if text is None:
+            print(f"❌ 찾을 수 없습니다: {sys.argv[2]}")
+            return 1
+        print(text.rstrip())
+        return 0
+
+    nodes = index.nodes(sys.argv[2])
+    if not nodes:
+        print(f"❌ 규정을 찾을 수 없습니다: {sys.argv[2]}")
+        return 1
+    for node in nodes:
+        indent = '  ' * LEVELS[node[KIND]]
+        title = f" [{node[TITLE]}]" if node[TITLE] and node[KIND] == 'article' else ''
+        print(f"{indent}{node[KEY]}{title}  (줄 {node[LINE]}, {node[END] - node[START]}B)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
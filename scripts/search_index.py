@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+규정 전문 검색 색인 (한글 2-gram/3-gram + BM25)
+
+MkDocs 기본 검색이나 grep으로는 "교직원징계"처럼 붙여 쓴 복합어를
+"교직원 징계"와 맞추기 어려우므로, 공백/기호를 제거한 본문에서
+문자 2-gram과 3-gram을 뽑아 역색인을 만들고 BM25로 순위를 매깁니다.
+
+- 검색 단위: 조문 (regulation_parser의 제N조 노드, 조문 없는 부칙, 머리말)
+- 색인 파일: .cache/search/index.bin (mmap으로 열어 필요한 부분만 읽음)
+    헤더 | 용어 표(해시 순 정렬) | 포스팅(문서 번호, 빈도) | 문서 길이 | 문서 정보(JSON)
+- 증분 갱신: 규정별 용어 빈도를 .cache/search/segments.pickle에 보관하고
+  내용 해시가 바뀐 규정만 다시 분석한 뒤 색인 파일을 다시 씁니다.
+
+사용법:
+    python3 scripts/search_index.py build
+    python3 scripts/search_index.py query "교직원징계" [결과 수]
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import mmap
+import time
+import array
+import struct
+import pickle
+import sqlite3
+import hashlib
+from collections import Counter
+from pathlib import Path
+
+from regulation_catalog import get_catalog
+from regulation_parser import get_article_index, project_root, KIND, KEY, TITLE, PARENT, START, END, LINE
+
+DEFAULT_INDEX_DIR = project_root / '.cache' / 'search'
+INDEX_FILE = 'index.bin'
+SEGMENTS_FILE = 'segments.pickle'
+MAGIC = b'RGSX'
+FORMAT_VERSION = 1
+
+# 헤더: 매직, 버전, 문서 수, 용어 수, 평균 문서 길이, 각 영역 시작 위치
+HEADER = struct.Struct('<4sIIId4Q')
+# 용어 표 항목: 용어 해시, 포스팅 시작 위치, 문서 빈도
+TERM = struct.Struct('<QQI')
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+NON_TEXT = re.compile(r'[^0-9a-z가-힣]+')
+
+def normalize_text(text):
+    """공백/기호/마크다운 이스케이프 제거 + 소문자"""
+    return NON_TEXT.sub('', text.lower())
+
+def tokenize(text):
+    """문자 2-gram + 3-gram 빈도"""
+    s = normalize_text(text)
+    counts = Counter(s[i:i + 2] for i in range(len(s) - 1))
+    counts.update(s[i:i + 3] for i in range(len(s) - 2))
+    if not counts and s:
+        counts[s] = 1
+    return counts
+
+def term_hash(term):
+    return int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def _uint32_view(buffer, offset, count):
+    """buffer의 little-endian uint32 배열 (복사 없이 memoryview, 빅엔디언이면 복사)"""
+    view = memoryview(buffer)[offset:offset + 4 * count]
+    if sys.byteorder == 'little':
+        return view.cast('I')
+    values = array.array('I', view)
+    values.byteswap()
+    return values
+
+def load_titles():
+    """규정 카탈로그의 코드 → 제목"""
+    try:
+        return {reg['code']: reg['title'] for reg in get_catalog().all()}
+    except (OSError, ValueError, KeyError, sqlite3.Error):
+        return {}
+
+def document_nodes(nodes):
+    """검색 단위 노드: 조문, 조문이 없는 부칙, 내용이 있는 머리말"""
+    has_article_child = {node[PARENT] for node in nodes if node[KIND] == 'article'}
+    for i, node in enumerate(nodes):
+        if node[KIND] == 'article':
+            yield node
+        elif node[KIND] == 'addenda' and i not in has_article_child:
+            yield node
+        elif node[KIND] == 'preamble' and node[END] > node[START]:
+            yield node
+
+def analyze_regulation(path, info, title):
+    """규정 하나를 조문 단위 문서 목록으로 분석 → [(문서 정보, 용어 빈도, 길이)]"""
+    with open(project_root / path, 'rb') as f:
+        data = f.read()
+    docs = []
+    for node in document_nodes(info['nodes']):
+        text = data[node[START]:node[END]].decode('utf-8', errors='replace')
+        counts = tokenize(text)
+        if not counts:
+            continue
+        first_line = text.strip().splitlines()[0] if text.strip() else ''
+        meta = {
+            'code': info['code'],
+            'title': title or first_line,
+            'article': node[KEY],
+            'article_title': node[TITLE],
+            'path': path,
+            'line': node[LINE],
+            'start': node[START],
+            'end': node[END],
+        }
+        docs.append((meta, counts, sum(counts.values())))
+    return docs
+
+class SearchIndex:
+    """mmap으로 연 BM25 역색인 (읽기 전용)"""
+
+    def __init__(self, index_path=None):
+        self.index_path = Path(index_path or DEFAULT_INDEX_DIR / INDEX_FILE)
+        self._file = open(self.index_path, 'rb')
+        self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.doc_count, self.term_count, self.avgdl,
+         self.terms_offset, self.postings_offset, self.lengths_offset, self.meta_offset) = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"검색 색인 형식이 맞지 않습니다: {self.index_path}")
+        self.doc_lengths = _uint32_view(self.mm, self.lengths_offset, self.doc_count)
+
+    def close(self):
+        self.doc_lengths = None
+        self.mm.close()
+        self._file.close()
+
+    def _find_term(self, hashed):
+        """용어 표 이진 탐색 → (포스팅 위치, 문서 빈도) 또는 None"""
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value, offset, df = TERM.unpack_from(self.mm, self.terms_offset + mid * TERM.size)
+            if value < hashed:
+                lo = mid + 1
+            elif value > hashed:
+                hi = mid
+            else:
+                return offset, df
+        return None
+
+    def meta(self, doc_id):
+        """문서 정보 (결과로 반환할 문서만 읽음)"""
+        start, end = struct.unpack_from('<QQ', self.mm, self.meta_offset + doc_id * 16)
+        return json.loads(self.mm[start:end].decode('utf-8'))
+
+    def search(self, query, k=10):
+        """BM25 상위 k개 → [(점수, 문서 정보)]"""
+        terms = set(tokenize(query))
+        scores = {}
+        lengths = self.doc_lengths
+        norm = BM25_K1 * (1 - BM25_B)
+        slope = BM25_K1 * BM25_B / (self.avgdl or 1)
+        for term in terms:
+            found = self._find_term(term_hash(term))
+            if found is None:
+                continue
+            offset, df = found
+            idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            postings = _uint32_view(self.mm, offset, 2 * df)
+            for i in range(0, 2 * df, 2):
+                doc_id = postings[i]
+                tf = postings[i + 1]
+                score = idf * tf * (BM25_K1 + 1) / (tf + norm + slope * lengths[doc_id])
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+            postings = None
+
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(score, self.meta(doc_id)) for doc_id, score in best]
+
+def write_index(docs, index_path):
+    """문서 목록 [(정보, 용어 빈도, 길이)]을 색인 파일로 저장"""
+    postings = {}
+    for doc_id, (_, counts, _) in enumerate(docs):
+        for term, tf in counts.items():
+            postings.setdefault(term, []).extend((doc_id, min(tf, 0xFFFFFFFF)))
+
+    entries = sorted((term_hash(term), plist) for term, plist in postings.items())
+    doc_count = len(docs)
+    avgdl = sum(length for _, _, length in docs) / doc_count if doc_count else 0.0
+
+    terms_offset = HEADER.size
+    postings_offset = terms_offset + TERM.size * len(entries)
+
+    term_table = bytearray()
+    posting_blob = array.array('I')
+    offset = postings_offset
+    for hashed, plist in entries:
+        term_table += TERM.pack(hashed, offset, len(plist) // 2)
+        posting_blob.extend(plist)
+        offset += 4 * len(plist)
+    if sys.byteorder != 'little':
+        posting_blob.byteswap()
+
+    lengths = array.array('I', (length for _, _, length in docs))
+    if sys.byteorder != 'little':
+        lengths.byteswap()
+    lengths_offset = offset
+    meta_offset = lengths_offset + 4 * doc_count
+
+    meta_blobs = [json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8') for meta, _, _ in docs]
+    meta_table = bytearray()
+    position = meta_offset + 16 * doc_count
+    for blob in meta_blobs:
+        meta_table += struct.pack('<QQ', position, position + len(blob))
+        position += len(blob)
+
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, doc_count, len(entries), avgdl,
+                            terms_offset, postings_offset, lengths_offset, meta_offset))
+        f.write(term_table)
+        f.write(posting_blob.tobytes())
+        f.write(lengths.tobytes())
+        f.write(meta_table)
+        for blob in meta_blobs:
+            f.write(blob)
+    os.replace(tmp_path, index_path)
+    return len(entries)
+
+def build_index(index_dir=None):
+    """바뀐 규정만 다시 분석하여 색인 재작성 → 통계"""
+    start = time.perf_counter()
+    index_dir = Path(index_dir or DEFAULT_INDEX_DIR)
+    segments_path = index_dir / SEGMENTS_FILE
+    try:
+        with open(segments_path, 'rb') as f:
+            segments = pickle.load(f)
+        if segments.get('version') != FORMAT_VERSION:
+            segments = {}
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        segments = {}
+    old_files = segments.get('files', {})
+
+    article_index = get_article_index()
+    titles = load_titles()
+    files = {}
+    stats = {'analyzed': 0, 'reused': 0, 'removed': 0}
+    for path, info in sorted(article_index.files.items()):
+        cached = old_files.get(path)
+        if cached and cached['sha256'] == info['sha256'] and cached['title'] == titles.get(info['code']):
+            files[path] = cached
+            stats['reused'] += 1
+            continue
+        title = titles.get(info['code'])
+        files[path] = {
+            'sha256': info['sha256'],
+            'title': title,
+            'docs': analyze_regulation(path, info, title),
+        }
+        stats['analyzed'] += 1
+    stats['removed'] = len(set(old_files) - set(files))
+
+    docs = [doc for path in sorted(files) for doc in files[path]['docs']]
+    stats['docs'] = len(docs)
+    index_path = index_dir / INDEX_FILE
+    if stats['analyzed'] or stats['removed'] or not index_path.exists():
+        stats['terms'] = write_index(docs, index_path)
+    else:
+        # 바뀐 규정이 없으면 기존 색인 파일 그대로 사용
+        with open(index_path, 'rb') as f:
+            stats['terms'] = HEADER.unpack(f.read(HEADER.size))[3]
+
+    if stats['analyzed'] or stats['removed'] or not segments:
+        index_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = segments_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': FORMAT_VERSION, 'files': files}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, segments_path)
+
+    stats['elapsed'] = time.perf_counter() - start
+    return stats
+
+def main():
+    """명령행 실행: build / query"""
+    if len(sys.argv) < 2 or sys.argv[1] not in ('build', 'query'):
+        print("사용법:")
+        print(f"  python3 {sys.argv[0]} build")
+        print(f"  python3 {sys.argv[0]} query \"검색어\" [결과 수]")
+        return 1
+
+    if sys.argv[1] == 'build':
+        stats = build_index()
+        print(f"✅ 검색 색인: 조문 {stats['docs']}개, 용어 {stats['terms']}개 "
+              f"(분석 {stats['analyzed']} / 재사용 {stats['reused']} / 삭제 {stats['removed']}, "
+              f"{stats['elapsed']:.2f}초)")
+        return 0
+
+    if len(sys.argv) < 3:
+        print("❌ 검색어를 입력하세요.")
+        return 1
+
+    index_path = DEFAULT_INDEX_DIR / INDEX_FILE
+    if not index_path.exists():
+        print("📚 검색 색인이 없어 생성합니다...")
+        build_index()
+
+    k = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    index = SearchIndex(index_path)
+    try:
+        start = time.perf_counter()
+        results = index.search(sys.argv[2], k)
+        elapsed = time.perf_counter() - start
+    finally:
+        index.close()
+
+    if not results:
+        print("❌ 검색 결과가 없습니다.")
+        return 1
+    print(f"🔎 \"{sys.argv[2]}\" 검색 결과 {len(results)}건 ({elapsed * 1000:.1f}ms)")
+    for score, meta in results:
+        article_title = f"[{meta['article_title']}]" if meta['article_title'] else ''
+        print(f"{score:7.2f}  {meta['code']:<8} {meta['title']} {meta['article']}{article_title}  "
+              f"({meta['path']}:{meta['line']})")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,23 +12,32 @@
     python3 scripts/smart_update.py regulations_source/new/교직원포상규정.pdf
     python3 scripts/smart_update.py regulations_source/new/교직원포상규정.docx
     python3 scripts/smart_update.py regulations_source/new/3-1-9_교직원포상규정.pdf
+
+    # 이미 변환된 MD 재사용 (process_regulation.py에서 호출 시)
+    python3 scripts/smart_update.py regulations_source/new/교직원포상규정.pdf --md /tmp/변환결과.md
 """
 
 import os
 import sys
-import json
 import re
 import subprocess
-import difflib
+import tempfile
 from pathlib import Path
 from datetime import datetime
 
-# regulations.json 로드
+from conversion_cache import ConversionCache, pdf_pipeline, docx_pipeline
+from document_probe import probe_file
+from title_index import get_title_index
+from regulation_catalog import get_catalog
+from backup_store import BackupStore
+from batch_writer import BatchWriter
+from pandoc_pool import convert_file, describe
+from stage_trace import stage, traced
+
+# 규정 카탈로그 (regulations.json의 SQLite 색인, regulation_catalog.py)
 def load_regulations_db():
-    """regulations.json 파일 로드"""
-    with open('regulations.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data['regulations']
+    """전체 규정 목록 (유사 제목 검색처럼 목록 전체가 필요할 때만 사용)"""
+    return get_catalog().all()
 
 def extract_code_from_filename(filename):
     """파일명에서 규정 코드 추출"""
@@ -49,23 +58,23 @@ def extract_title_from_file(file_path):
         # 파일 형식 확인
         ext = os.path.splitext(file_path)[1].lower()
         
-        if ext == '.pdf':
-            input_format = 'pdf'
-        elif ext == '.docx':
-            input_format = 'docx'
-        else:
+        if ext not in ('.pdf', '.docx'):
             return None
+
+        # pandoc 없이 DOCX document.xml / PDF 텍스트 레이어의 첫 단락만 읽음
+        try:
+            title = probe_file(file_path)['title']
+            if title:
+                return title
+        except Exception as e:
+            print(f"⚠️  원본 직접 분석 실패, pandoc으로 재시도: {e}")
+        input_format = ext[1:]
         
-        # pandoc을 사용하여 제목 추출
-        result = subprocess.run(
-            ['pandoc', '-f', input_format, '-t', 'plain', file_path],
-            capture_output=True,
-            text=True,
-            encoding='utf-8'
-        )
-
-        if result.returncode == 0:
-            lines = result.stdout.strip().split('\n')
+        # pandoc을 사용하여 제목 추출 (상주 서버가 있으면 서버로)
+        result = convert_file(file_path, None, input_format, 'plain')
+
+        if result['ok']:
+            lines = result['text'].strip().split('\n')
             for line in lines:
                 line = line.strip()
                 if line and len(line) > 2:  # 의미 있는 첫 줄
@@ -75,71 +84,76 @@ def extract_title_from_file(file_path):
         print(f"⚠️  제목 추출 실패: {e}")
         return None
 
-def normalize_title(title):
-    """제목 정규화"""
-    normalized = re.sub(r'[\s\.\·\-]', '', title)
-    return normalized.lower()
+def extract_title_from_md(md_path):
+    """변환된 MD 파일에서 제목 추출 (첫 번째 의미 있는 줄)"""
+    try:
+        with open(md_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = re.sub(r'^#+\s*', '', line.strip()).strip('*').strip()
+                if line and len(line) > 2:  # 의미 있는 첫 줄
+                    return line
+        return None
+    except Exception as e:
+        print(f"⚠️  제목 추출 실패: {e}")
+        return None
 
-def find_regulation_by_code(regulations, code):
-    """규정 코드로 검색"""
-    for reg in regulations:
-        if reg['code'] == code:
-            return reg
-    return None
+def find_regulation_by_code(code):
+    """규정 코드로 검색 (카탈로그 색인)"""
+    return get_catalog().get(code)
+
+@traced('classify', document=0)
+def find_regulation_by_title(title):
+    """제목으로 검색 → (규정, 유사도)
+
+    정규화된 제목이 같으면 카탈로그 색인으로 바로 찾고,
+    아니면 전체 목록으로 n-gram 색인 + 유사도 검색
+    """
+    exact = get_catalog().by_title(title)
+    if exact:
+        return exact[0], 1.0
+    return get_title_index(load_regulations_db()).best_match(title)
 
-def find_regulation_by_title(regulations, title):
-    """제목으로 검색 (유사도 기반)"""
-    normalized_search = normalize_title(title)
-
-    # 정확한 매칭 먼저 시도
-    for reg in regulations:
-        if reg['title_normalized'] == normalized_search:
-            return reg, 1.0  # 100% 일치
-
-    # 부분 매칭 시도
-    best_match = None
-    best_ratio = 0.0
-
-    for reg in regulations:
-        # 제목 포함 여부 확인
-        if normalized_search in reg['title_normalized'] or reg['title_normalized'] in normalized_search:
-            ratio = difflib.SequenceMatcher(None, normalized_search, reg['title_normalized']).ratio()
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_match = reg
-
-    # 유사도 기반 검색
-    if best_match is None:
-        for reg in regulations:
-            ratio = difflib.SequenceMatcher(None, normalized_search, reg['title_normalized']).ratio()
-            if ratio > best_ratio and ratio > 0.6:  # 60% 이상 유사도
-                best_ratio = ratio
-                best_match = reg
-
-    return best_match, best_ratio
+def make_temp_path(suffix):
+    """변환용 고유 임시 파일 경로 생성"""
+    fd, path = tempfile.mkstemp(prefix=f"regulation_temp_{os.getpid()}_", suffix=suffix)
+    os.close(fd)
+    return path
 
 def convert_to_md(input_path):
-    """PDF/DOCX를 MD로 변환 (PDF는 DOCX를 거쳐 변환)"""
-    temp_md = f"/tmp/regulation_temp_{os.getpid()}.md"
+    """PDF/DOCX를 MD로 변환 (PDF는 DOCX를 거쳐 변환, 변환 캐시 적중 시 pdf2docx/pandoc 생략)"""
     temp_docx = None
     
     # 파일 형식 확인
     ext = os.path.splitext(input_path)[1].lower()
     
+    # process_regulation.py와 같은 파이프라인 식별자 → 두 스크립트가 캐시 항목을 함께 사용
+    cache = ConversionCache()
+    cache_key = None
+    if ext in ('.pdf', '.docx'):
+        cache_key = cache.make_key(input_path, pdf_pipeline() if ext == '.pdf' else docx_pipeline())
+        # 확인과 복사 사이에 다른 프로세스가 항목을 정리했으면 미적중으로 보고 변환
+        cached_md = cache.copy_to_temp(cache_key) if cache.get(cache_key) else None
+        if cached_md:
+            print("♻️  변환 캐시 적중 (pdf2docx/pandoc 생략)")
+            return cached_md
+    
+    # 호출마다 고유한 임시 파일 사용 (일괄 처리 시 한 프로세스가 여러 파일을 변환)
+    temp_md = make_temp_path('.md')
+    converted = False
     try:
         if ext == '.pdf':
             # PDF → DOCX → Markdown (더 나은 품질)
-            temp_docx = f"/tmp/regulation_temp_{os.getpid()}.docx"
-            
-            # 1단계: PDF → DOCX
-            result = subprocess.run(
-                ['pandoc', '-f', 'pdf', '-t', 'docx', input_path, '-o', temp_docx],
-                capture_output=True,
-                text=True
-            )
+            temp_docx = make_temp_path('.docx')
             
-            if result.returncode != 0:
-                print(f"❌ PDF → DOCX 변환 실패: {result.stderr}")
+            # 1단계: PDF → DOCX (pandoc은 PDF를 읽지 못하므로 process_regulation.py처럼 pdf2docx 사용)
+            try:
+                from pdf2docx import Converter
+                with stage('pdf2docx', document=input_path):
+                    cv = Converter(input_path)
+                    cv.convert(temp_docx)
+                    cv.close()
+            except Exception as e:
+                print(f"❌ PDF → DOCX 변환 실패: {e}")
                 return None
             
             # 2단계: DOCX → Markdown
@@ -153,148 +167,103 @@ def convert_to_md(input_path):
             print(f"❌ 지원하지 않는 파일 형식: {ext}")
             return None
 
-        result = subprocess.run(
-            ['pandoc', '-f', input_format, '-t', 'markdown', input_file, '-o', temp_md],
-            capture_output=True,
-            text=True
-        )
+        result = convert_file(input_file, temp_md, input_format, 'markdown')
 
-        if result.returncode == 0:
-            # 중간 파일 정리
-            if temp_docx and os.path.exists(temp_docx):
-                try:
-                    os.remove(temp_docx)
-                except:
-                    pass
+        if result['ok']:
+            print(f"⏱️  pandoc 변환 {describe(result)}")
+            if cache_key:
+                cache.put(cache_key, temp_md)
+            converted = True
             return temp_md
         else:
-            print(f"❌ Pandoc 변환 실패: {result.stderr}")
+            print(f"❌ Pandoc 변환 실패: {result['error']}")
             return None
             
     except Exception as e:
         print(f"❌ 변환 중 오류: {e}")
-        # 중간 파일 정리
-        if temp_docx and os.path.exists(temp_docx):
-            try:
-                os.remove(temp_docx)
-            except:
-                pass
         return None
-
-def cleanup_old_backups(target_path, days=7):
-    """오래된 백업 파일 정리 (기본 7일)"""
-    import time
-    import glob
-    
-    # 백업 파일 패턴
-    backup_pattern = f"{target_path}.backup.*"
-    backup_files = glob.glob(backup_pattern)
-    
-    if not backup_files:
-        return
-    
-    current_time = time.time()
-    deleted_count = 0
-    
-    for backup_file in backup_files:
-        try:
-            # 파일 수정 시간 확인
-            file_age_days = (current_time - os.path.getmtime(backup_file)) / 86400
-            
-            if file_age_days > days:
-                os.remove(backup_file)
-                deleted_count += 1
-        except Exception as e:
-            # 삭제 실패해도 계속 진행
-            pass
-    
-    if deleted_count > 0:
-        print(f"🗑️  오래된 백업 파일 {deleted_count}개 정리됨 ({days}일 이상)")
+    finally:
+        # 중간 파일 정리 (실패하면 미리 만들어 둔 MD 임시 파일도 삭제)
+        for path in [temp_docx] + ([] if converted else [temp_md]):
+            if path and os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
 
 def update_regulation_file(target_path, source_md):
-    """규정 파일 업데이트"""
-    # 백업 생성
-    backup_path = f"{target_path}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    """규정 파일 업데이트 → (성공 여부, 백업 버전 "코드 시각")
+
+    기존 내용은 규정 파일 옆이 아니라 백업 저장소(backup_store.py)에 압축 저장하고,
+    새 내용은 임시 파일에 쓴 뒤 교체하므로 중간에 멈춰도 반쯤 쓰인 파일이 남지 않습니다.
+    """
+    code = Path(target_path).stem
+    backup = None
 
     try:
         # 백업
         if os.path.exists(target_path):
-            subprocess.run(['cp', target_path, backup_path], check=True)
-            print(f"💾 백업 생성: {backup_path}")
+            entry = BackupStore().save(code, target_path)
+            backup = f"{code} {entry['time']}"
+            print(f"💾 백업 저장: {backup}")
 
-        # 파일 업데이트
-        subprocess.run(['cp', source_md, target_path], check=True)
-        
-        # 오래된 백업 정리
-        cleanup_old_backups(target_path, days=7)
+        # 파일 업데이트 (임시 파일에 복사한 뒤 교체, batch_writer.py)
+        with BatchWriter('smart_update') as batch:
+            batch.copy(source_md, target_path)
 
-        return True, backup_path
+        return True, backup
     except Exception as e:
         print(f"❌ 파일 업데이트 실패: {e}")
         return False, None
 
-def main():
-    if len(sys.argv) < 2:
-        print("사용법: python3 scripts/smart_update.py <파일>")
-        print("\n예시:")
-        print("  python3 scripts/smart_update.py regulations_source/new/교직원포상규정.pdf")
-        print("  python3 scripts/smart_update.py regulations_source/new/교직원포상규정.docx")
-        print("  python3 scripts/smart_update.py regulations_source/new/3-1-9_교직원포상규정.pdf")
-        sys.exit(1)
-
-    input_file = sys.argv[1]
-
-    if not os.path.exists(input_file):
-        print(f"❌ 파일을 찾을 수 없습니다: {input_file}")
-        sys.exit(1)
-    
-    # 파일 형식 확인
-    ext = os.path.splitext(input_file)[1].lower()
-    if ext not in ['.pdf', '.docx']:
-        print(f"❌ 지원하지 않는 파일 형식: {ext}")
-        print("   지원 형식: .pdf, .docx")
-        sys.exit(1)
-
-    print("=" * 80)
-    print("🤖 스마트 규정 업데이트 시작")
-    print("=" * 80)
-    print(f"📄 원본 파일: {input_file}")
-    print()
-
-    # 1. regulations.json 로드
-    regulations = load_regulations_db()
-    print(f"📚 규정 데이터베이스 로드: {len(regulations)}개 규정")
-    print()
-
-    # 2. 규정 코드 추출 시도
-    filename = os.path.basename(input_file)
-    code = extract_code_from_filename(filename)
-
-    matched_regulation = None
-    match_method = None
-    match_confidence = 0.0
+def match_regulation(input_file, converted_md=None):
+    """파일명의 규정 코드 → 제목 순서로 규정 매칭 → (규정, 매칭 방법, 신뢰도)
 
+    제목은 변환된 MD가 있으면 MD에서, 없으면 원본에서 추출합니다.
+    """
+    code = extract_code_from_filename(os.path.basename(input_file))
     if code:
         print(f"🔍 파일명에서 코드 추출: {code}")
-        matched_regulation = find_regulation_by_code(regulations, code)
-        if matched_regulation:
-            match_method = "코드"
-            match_confidence = 1.0
+        regulation = find_regulation_by_code(code)
+        if regulation:
             print(f"✅ 규정 매칭 성공 (코드 기반)")
+            return regulation, "코드", 1.0
 
-    # 3. 코드로 못 찾으면 제목으로 검색
-    if not matched_regulation:
-        print("🔍 파일에서 제목 추출 중...")
+    print("🔍 파일에서 제목 추출 중...")
+    if converted_md:
+        title = extract_title_from_md(converted_md)
+    else:
         title = extract_title_from_file(input_file)
+    if not title:
+        print("⚠️  제목 추출 실패")
+        return None, None, 0.0
+
+    print(f"   제목: {title}")
+    regulation, confidence = find_regulation_by_title(title)
+    if not regulation:
+        return None, None, 0.0
+    print(f"✅ 규정 매칭 성공 (제목 기반, 유사도: {confidence*100:.1f}%)")
+    return regulation, "제목", confidence
+
+def archive_source(input_file):
+    """처리된 원본 파일을 regulations_source/history/<연도>/로 이동 → 이동한 경로"""
+    history_dir = f"regulations_source/history/{datetime.now().strftime('%Y')}"
+    os.makedirs(history_dir, exist_ok=True)
 
-        if title:
-            print(f"   제목: {title}")
-            matched_regulation, match_confidence = find_regulation_by_title(regulations, title)
-            if matched_regulation:
-                match_method = "제목"
-                print(f"✅ 규정 매칭 성공 (제목 기반, 유사도: {match_confidence*100:.1f}%)")
-        else:
-            print("⚠️  제목 추출 실패")
+    history_path = os.path.join(history_dir, os.path.basename(input_file))
+    subprocess.run(['mv', input_file, history_path])
+    print(f"📦 원본 파일 아카이브: {history_path}")
+    return history_path
+
+def apply_update(input_file, converted_md=None, updated_codes=None):
+    """원본 파일 하나를 규정에 적용 (smart_update.py, batch_smart_update.py 공용)
+
+    규정 매칭 → 신뢰도가 낮으면 확인 → MD 변환(converted_md가 없을 때) → 규정 파일 업데이트
+    → 원본을 history로 이동
+    updated_codes: {규정 코드: 원본 파일명} — 이번 실행에서 같은 규정을 다시 덮어쓰면 경고하고 기록
+    반환: (상태 'updated' | 'cancelled' | 'failed', 매칭된 규정, 백업 버전)
+    """
+    matched_regulation, match_method, match_confidence = match_regulation(input_file, converted_md)
 
     if not matched_regulation:
         print("\n❌ 매칭되는 규정을 찾을 수 없습니다.")
@@ -302,7 +271,7 @@ def main():
         print("   1. 파일명에 규정 코드 포함 (예: 3-1-9_제목.docx)")
         print("   2. DOCX 파일의 첫 줄이 올바른 규정 제목인지 확인")
         print("   3. regulations.json에 해당 규정이 등록되어 있는지 확인")
-        sys.exit(1)
+        return 'failed', None, None
 
     print()
     print(f"🎯 매칭된 규정:")
@@ -314,38 +283,109 @@ def main():
         print(f"   매칭 신뢰도: {match_confidence*100:.1f}%")
     print()
 
+    if updated_codes is not None and matched_regulation['code'] in updated_codes:
+        print(f"⚠️  이번 실행에서 이미 업데이트된 규정입니다: {updated_codes[matched_regulation['code']]}")
+
     # 확신도가 낮으면 확인
     if match_confidence < 0.8:
         response = input(f"⚠️  매칭 신뢰도가 낮습니다 ({match_confidence*100:.1f}%). 계속하시겠습니까? (y/N): ")
         if response.lower() != 'y':
             print("취소되었습니다.")
-            sys.exit(0)
+            return 'cancelled', matched_regulation, None
 
-    # 4. DOCX → MD 변환
-    print("🔄 PDF/DOCX → MD 변환 중...")
-    temp_md = convert_to_md(input_file)
+    # DOCX → MD 변환 (이미 변환된 MD가 있으면 재사용)
+    if converted_md:
+        temp_md = converted_md
+        print(f"♻️  변환된 MD 재사용: {temp_md}")
+    else:
+        print("🔄 PDF/DOCX → MD 변환 중...")
+        temp_md = convert_to_md(input_file)
 
-    if not temp_md:
-        print("❌ 변환 실패")
-        sys.exit(1)
+        if not temp_md:
+            print("❌ 변환 실패")
+            return 'failed', matched_regulation, None
 
-    print(f"✅ 변환 완료: {temp_md}")
+        print(f"✅ 변환 완료: {temp_md}")
     print()
 
-    # 5. 규정 파일 업데이트
+    # 규정 파일 업데이트
     print(f"📝 규정 파일 업데이트 중...")
-    success, backup_path = update_regulation_file(matched_regulation['path'], temp_md)
+    try:
+        success, backup_path = update_regulation_file(matched_regulation['path'], temp_md)
+    finally:
+        # 임시 파일 삭제 (재사용한 MD는 호출한 쪽에서 정리)
+        if not converted_md:
+            os.remove(temp_md)
 
     if not success:
-        sys.exit(1)
+        return 'failed', matched_regulation, None
 
+    if updated_codes is not None:
+        updated_codes[matched_regulation['code']] = os.path.basename(input_file)
     print(f"✅ 업데이트 완료: {matched_regulation['path']}")
     print()
 
-    # 6. 임시 파일 삭제
-    os.remove(temp_md)
+    # 처리된 파일을 history로 이동
+    archive_source(input_file)
+    print()
+    return 'updated', matched_regulation, backup_path
+
+def parse_args(argv):
+    """명령행 인자 해석: <파일> [--md <변환된 MD>]"""
+    input_file = None
+    converted_md = None
+    args = iter(argv)
+    for arg in args:
+        if arg == '--md':
+            converted_md = next(args, None)
+        elif input_file is None:
+            input_file = arg
+    return input_file, converted_md
+
+def main():
+    input_file, converted_md = parse_args(sys.argv[1:])
 
-    # 7. Git 커밋 안내
+    if not input_file:
+        print("사용법: python3 scripts/smart_update.py <파일> [--md <변환된 MD>]")
+        print("\n예시:")
+        print("  python3 scripts/smart_update.py regulations_source/new/교직원포상규정.pdf")
+        print("  python3 scripts/smart_update.py regulations_source/new/교직원포상규정.docx")
+        print("  python3 scripts/smart_update.py regulations_source/new/3-1-9_교직원포상규정.pdf")
+        sys.exit(1)
+
+    if not os.path.exists(input_file):
+        print(f"❌ 파일을 찾을 수 없습니다: {input_file}")
+        sys.exit(1)
+    
+    # 파일 형식 확인
+    ext = os.path.splitext(input_file)[1].lower()
+    if ext not in ['.pdf', '.docx']:
+        print(f"❌ 지원하지 않는 파일 형식: {ext}")
+        print("   지원 형식: .pdf, .docx")
+        sys.exit(1)
+
+    if converted_md and not os.path.exists(converted_md):
+        print(f"❌ 변환된 MD 파일을 찾을 수 없습니다: {converted_md}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("🤖 스마트 규정 업데이트 시작")
+    print("=" * 80)
+    print(f"📄 원본 파일: {input_file}")
+    print()
+
+    # 규정 카탈로그 열기
+    print(f"📚 규정 카탈로그: {get_catalog().count()}개 규정")
+    print()
+
+    # 규정 매칭 → 변환 → 업데이트 → 원본 아카이브 (batch_smart_update.py와 공용)
+    status, matched_regulation, backup_path = apply_update(input_file, converted_md)
+    if status == 'cancelled':
+        sys.exit(0)
+    if status != 'updated':
+        sys.exit(1)
+
+    # Git 커밋 안내
     print("=" * 80)
     print("📝 Git 커밋 명령:")
     print("=" * 80)
@@ -356,19 +396,10 @@ def main():
     print()
     print("=" * 80)
     print()
-    print(f"💡 백업 파일: {backup_path}")
-    print(f"   문제가 없으면 삭제: rm \"{backup_path}\"")
-    print()
-
-    # 처리된 파일을 history로 이동
-    year = datetime.now().strftime('%Y')
-    history_dir = f"regulations_source/history/{year}"
-    os.makedirs(history_dir, exist_ok=True)
-
-    history_path = os.path.join(history_dir, os.path.basename(input_file))
-    subprocess.run(['mv', input_file, history_path])
-    print(f"📦 원본 파일 아카이브: {history_path}")
-    print()
+    if backup_path:
+        print(f"💡 백업: {backup_path}")
+        print(f"   되돌리기: python3 scripts/backup_store.py restore {backup_path}")
+        print()
     print("✅ 모든 작업 완료!")
 
 if __name__ == "__main__":
@@ -4,27 +4,42 @@ Regulation Split and Update Script
 
 This script processes a monolithic markdown file containing multiple regulations,
 splits it into individual regulation files based on titles defined in regulations.json,
-and updates the existing files if changes are detected. It also generates a diff report.
+and updates the existing files if changes are detected. It also generates a diff report
+(article-aligned, see article_diff.py) and a JSON list of changed articles.
+
+Large inputs (or --stream) are split without loading the whole file: title lines are located
+in a first pass, then each regulation is read, compared and staged on its own, so memory is
+bounded by the largest regulation.
 """
 
 import os
 import sys
 import json
 import re
-import difflib
 from datetime import datetime
 from pathlib import Path
 
+from title_index import normalize_title
+from title_matcher import get_title_matcher
+from article_diff import diff_articles, render_html, changes_summary
+from near_duplicates import SplitGuard
+from mdx_sanitizer import sanitize_text
+from backup_store import BackupStore
+from batch_writer import BatchWriter, PendingBatchError
+from regulation_catalog import get_catalog
+from stage_trace import stage, traced
+
+# Inputs larger than this are split in streaming mode even without --stream
+STREAM_THRESHOLD = 64 * 1024 * 1024
+
 # Set stdout to UTF-8 to avoid UnicodeEncodeError on Windows
 sys.stdout.reconfigure(encoding='utf-8')
 
 def load_regulations_db(project_root):
-    """Load regulations.json database."""
+    """Load all regulations from the catalog (indexed regulations.json, see regulation_catalog.py)."""
     json_path = os.path.join(project_root, 'regulations.json')
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data['regulations']
+        return get_catalog(json_path).all()
     except Exception as e:
         print(f"Error loading regulations.json: {e}")
         sys.exit(1)
@@ -33,25 +48,14 @@ def normalize_line(line):
     """Normalize line for comparison (ignore whitespace differences)."""
     return line.strip()
 
-def normalize_title(title):
-    """제목 정규화 (공백, 특수문자 제거)"""
-    return re.sub(r'[\s\.\·\-\(\)\[\]\:：]', '', title).lower()
+def make_regulation_finder(regulations):
+    """Build a function that returns the regulation whose title starts at a line (or None).
 
-def split_markdown_content(content, regulations):
-    """
-    Split the monolithic markdown content into individual regulations.
-    Returns a dictionary {regulation_code: content_lines}
-    
     PDF 변환 후에도 규정을 찾을 수 있도록 여러 매칭 방법 사용:
     1. 정확한 제목 매칭
     2. 정규화된 제목 매칭 (공백/특수문자 무시)
     3. 라인 내 제목 포함 여부 (짧은 라인만)
     """
-    lines = content.splitlines()
-    split_result = {}
-    current_code = None
-    current_content = []
-    
     # Create a mapping for fast lookup
     # exact_title -> reg, normalized_title -> reg
     exact_map = {}
@@ -61,6 +65,9 @@ def split_markdown_content(content, regulations):
         exact_map[reg['title'].replace(' ', '')] = reg
         normalized_map[normalize_title(reg['title'])] = reg
 
+    # 접미사 매칭용 오토마톤 (규정 수와 무관하게 라인 길이에 비례)
+    matcher = get_title_matcher(regulations, normalize_title)
+
     def find_matching_regulation(line):
         """라인에서 규정 제목을 찾는 함수"""
         stripped = line.strip()
@@ -80,17 +87,26 @@ def split_markdown_content(content, regulations):
         if normalized in normalized_map:
             return normalized_map[normalized]
         
-        # 방법 3: 짧은 라인에서 부분 매칭 (제목이 포함된 경우)
+        # 방법 3: 짧은 라인에서 부분 매칭 (라인이 규정 제목으로 끝나는 경우)
         if len(stripped) < 80:
-            for norm_title, reg in normalized_map.items():
-                if norm_title == normalized:
-                    return reg
-                # 라인이 규정 제목으로 끝나는 경우
-                if normalized.endswith(norm_title) and len(norm_title) > 4:
-                    return reg
+            return matcher.first_suffix(normalized, min_length=4)
         
         return None
 
+    return find_matching_regulation
+
+@traced('split')
+def split_markdown_content(content, regulations):
+    """
+    Split the monolithic markdown content into individual regulations.
+    Returns a dictionary {regulation_code: content_lines}
+    """
+    lines = content.splitlines()
+    split_result = {}
+    current_code = None
+    current_content = []
+    find_matching_regulation = make_regulation_finder(regulations)
+
     for line in lines:
         matched_reg = find_matching_regulation(line)
         
@@ -114,80 +130,105 @@ def split_markdown_content(content, regulations):
         
     return split_result
 
-def generate_diff_html(old_lines, new_lines, title):
-    """Generate a simple HTML diff snippet."""
-    diff = difflib.HtmlDiff().make_table(old_lines, new_lines, context=True, numlines=3)
-    return f"<h3>{title}</h3>\n{diff}<br>"
+@traced('split', document=0)
+def scan_regulation_spans(input_file, regulations):
+    """
+    First pass over a file: find regulation title lines without keeping any content.
+    Returns [(regulation_code, start_offset, end_offset)] byte ranges in file order.
+    """
+    find_matching_regulation = make_regulation_finder(regulations)
+    spans = []
+    offset = 0
+    with open(input_file, 'rb') as f:
+        for raw_line in f:
+            line = raw_line.decode('utf-8').rstrip('\r\n')
+            matched_reg = find_matching_regulation(line)
+            if matched_reg:
+                if spans:
+                    spans[-1][2] = offset
+                spans.append([matched_reg['code'], offset, None])
+                print(f"Found regulation start: {matched_reg['title']} ({matched_reg['code']})")
+            offset += len(raw_line)
+    if spans:
+        spans[-1][2] = offset
+    return [tuple(span) for span in spans]
+
+def iter_split_file(input_file, regulations):
+    """
+    Streaming version of split_markdown_content() for very large inputs.
+
+    Yields (regulation_code, content_lines) one regulation at a time, reading each byte range
+    from disk only when it is needed. As with the dict version, when a title appears more than
+    once (e.g. in a table of contents) only its last occurrence is used.
+    """
+    spans = scan_regulation_spans(input_file, regulations)
+    last = {code: index for index, (code, _, _) in enumerate(spans)}
+    with open(input_file, 'rb') as f:
+        for index, (code, start, end) in enumerate(spans):
+            if last[code] != index:
+                continue
+            f.seek(start)
+            yield code, f.read(end - start).decode('utf-8').splitlines()
+
+def generate_diff_html(old_lines, new_lines, title, changes=None):
+    """Generate an HTML diff snippet, line-diffing only the articles that changed."""
+    if changes is None:
+        changes = diff_articles(old_lines, new_lines)
+    return render_html(changes, title)
 
 def sanitize_for_mdx(content):
-    """Sanitize content for Docusaurus MDX compatibility."""
-    # Remove style attributes from HTML tags (causes MDX errors)
-    # style="width: 9%" -> ""
-    content = re.sub(r' style="[^"]*"', '', content)
-    
-    # Fix MDX nesting issues: Ensure block tags inside table cells have newlines
-    # </td> after </p> or </blockquote> should be on new line
-    content = re.sub(r'(</p>|</blockquote>)</td>', r'\1\n</td>', content)
-    
-    # <td> before <p> or <blockquote> should be on new line
-    # Handle <td> with attributes (e.g. <td rowspan="2">)
-    content = re.sub(r'(<td[^>]*>)(<p>|<blockquote>)', r'\1\n\2', content)
-    
-    # Replace <br> with <br /> if needed (Pandoc usually does this, but just in case)
-    # But be careful not to double replace
-    
-    return content
+    """Sanitize content for Docusaurus MDX compatibility (single pass, see mdx_sanitizer.py)."""
+    return sanitize_text(content)
 
-def cleanup_old_backups(target_path, days=7):
-    """오래된 백업 파일 정리 (기본 7일)"""
-    import time
-    import glob
-    
-    # 백업 파일 패턴
-    backup_pattern = f"{target_path}.backup.*"
-    backup_files = glob.glob(backup_pattern)
-    
-    if not backup_files:
-        return
-    
-    current_time = time.time()
-    deleted_count = 0
-    
-    for backup_file in backup_files:
-        try:
-            # 파일 수정 시간 확인
-            file_age_days = (current_time - os.path.getmtime(backup_file)) / 86400
-            
-            if file_age_days > days:
-                os.remove(backup_file)
-                deleted_count += 1
-        except Exception as e:
-            # 삭제 실패해도 계속 진행
-            pass
-    
-    if deleted_count > 0:
-        print(f"    🗑️  오래된 백업 {deleted_count}개 정리 ({days}일 이상)")
+def update_files(split_result, regulations, project_root, article_changes=None,
+                 duplicate_guard=True, skipped=None, writer=None):
+    """Update files and generate report.
 
-def update_files(split_result, regulations, project_root):
-    """Update files and generate report."""
+    split_result is either the {code: lines} dict from split_markdown_content() or an
+    iterable of (code, lines) pairs such as iter_split_file(); in the latter case
+    each regulation is compared and written as soon as it arrives.
+    If article_changes is a list, a summary of changed articles per regulation is appended to it.
+    With duplicate_guard, regulations whose new content looks like another regulation's file
+    or like several regulations merged together (see near_duplicates.py) are not written;
+    if skipped is a list, {'code', 'title', 'reasons'} entries for them are appended to it.
+    Changed files are staged in a BatchWriter (see batch_writer.py) and replaced together
+    at the end, so an interrupted run never leaves the tree half-updated; pass writer to
+    stage them into a larger batch and commit it yourself.
+    """
     updated_count = 0
     unchanged_count = 0
     diff_report = []
     
     reg_map = {r['code']: r for r in regulations}
+    backup_store = BackupStore()
+    own_writer = writer is None
+    if own_writer:
+        writer = BatchWriter('split_and_update')
+    
+    guard = None
+    if duplicate_guard:
+        print("\nLoading signatures for near-duplicate check...")
+        guard = SplitGuard(regulations, project_root)
     
     print("\nChecking for updates...")
     
-    for code, new_lines in split_result.items():
+    items = split_result.items() if isinstance(split_result, dict) else split_result
+    for code, new_lines in items:
         if code not in reg_map:
             continue
+        
+        reasons = guard.check(code, new_lines) if guard else []
+        if reasons:
+            print(f"  [SKIP] {reg_map[code]['title']} ({code})")
+            for reason in reasons:
+                print(f"    - {reason}")
+            if skipped is not None:
+                skipped.append({'code': code, 'title': reg_map[code]['title'], 'reasons': reasons})
+            continue
             
         reg_info = reg_map[code]
         file_path = os.path.join(project_root, reg_info['path'])
         
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
         old_lines = []
         if os.path.exists(file_path):
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -198,7 +239,8 @@ def update_files(split_result, regulations, project_root):
         new_content_str = '\n'.join(new_lines)
         
         # Sanitize for MDX
-        new_content_str = sanitize_for_mdx(new_content_str)
+        with stage('sanitize', document=code):
+            new_content_str = sanitize_for_mdx(new_content_str)
         
         # Re-split to lines for diffing (after sanitization)
         new_lines_sanitized = new_content_str.splitlines()
@@ -208,42 +250,51 @@ def update_files(split_result, regulations, project_root):
         if new_content_str.strip() != old_content_str.strip():
             print(f"  [UPDATE] {reg_info['title']} ({code})")
             
-            # Generate diff
-            diff_html = generate_diff_html(old_lines, new_lines_sanitized, f"{reg_info['title']} ({code})")
+            # Generate diff (article-aligned)
+            with stage('diff', document=code):
+                changes = diff_articles(old_lines, new_lines_sanitized)
+                diff_html = generate_diff_html(old_lines, new_lines_sanitized, f"{reg_info['title']} ({code})", changes)
             diff_report.append(diff_html)
+            if article_changes is not None:
+                article_changes.append({
+                    'code': code,
+                    'title': reg_info['title'],
+                    'path': reg_info['path'],
+                    'articles': changes_summary(changes),
+                })
             
-            # Backup existing file
+            # Backup existing file (compressed, deduplicated store outside regulations/)
             if os.path.exists(file_path):
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                backup_path = f"{file_path}.backup.{timestamp}"
                 try:
-                    os.rename(file_path, backup_path)
-                    print(f"    Backup created: {os.path.basename(backup_path)}")
-                    
-                    # 오래된 백업 정리
-                    cleanup_old_backups(file_path, days=7)
+                    entry = backup_store.save(code, file_path)
+                    print(f"    Backup stored: {code} {entry['time']}")
                 except OSError as e:
                     print(f"    Error creating backup: {e}")
             
-            # Write new content
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content_str)
-                # Add a newline at end of file if missing
-                if not new_content_str.endswith('\n'):
-                    f.write('\n')
+            # Stage new content (add a newline at end of file if missing)
+            if not new_content_str.endswith('\n'):
+                new_content_str += '\n'
+            writer.write_text(file_path, new_content_str)
             
             updated_count += 1
         else:
             unchanged_count += 1
+    
+    if own_writer:
+        print(f"\nWriting {len(writer)} staged files...")
+        writer.commit()
             
     return updated_count, unchanged_count, diff_report
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python split_and_update.py <input_markdown_file>")
+    flags = {'--no-dup-guard', '--stream'}
+    args = [arg for arg in sys.argv[1:] if arg not in flags]
+    duplicate_guard = '--no-dup-guard' not in sys.argv[1:]
+    if not args:
+        print("Usage: python split_and_update.py <input_markdown_file> [--stream] [--no-dup-guard]")
         sys.exit(1)
         
-    input_file = sys.argv[1]
+    input_file = args[0]
     if not os.path.exists(input_file):
         print(f"Error: Input file not found: {input_file}")
         sys.exit(1)
@@ -259,22 +310,47 @@ def main():
     regulations = load_regulations_db(project_root)
     print(f"Loaded {len(regulations)} regulations from database.")
     
-    # Read input file
-    with open(input_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-        
-    # Split content
-    print("\nSplitting content...")
-    split_result = split_markdown_content(content, regulations)
-    print(f"Found {len(split_result)} regulations in input file.")
+    # Large inputs are split without loading the whole file, one regulation in memory at a time
+    stream = '--stream' in sys.argv[1:] or os.path.getsize(input_file) > STREAM_THRESHOLD
+    article_changes = []
+    skipped = []
+    if stream:
+        print("\nSplitting and updating one regulation at a time (streaming)...")
+        found = []
+        def counted(pairs):
+            for code, lines in pairs:
+                found.append(code)
+                yield code, lines
+        split_result = counted(iter_split_file(input_file, regulations))
+    else:
+        # Read input file
+        with open(input_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+            
+        # Split content
+        print("\nSplitting content...")
+        split_result = split_markdown_content(content, regulations)
+        print(f"Found {len(split_result)} regulations in input file.")
     
-    # Update files
-    updated, unchanged, diff_report = update_files(split_result, regulations, project_root)
+    # Update files (staged, then replaced together; an exception leaves the tree untouched)
+    try:
+        with BatchWriter('split_and_update') as writer:
+            updated, unchanged, diff_report = update_files(split_result, regulations, project_root,
+                                                           article_changes, duplicate_guard, skipped, writer)
+            if len(writer):
+                print(f"\nWriting {len(writer)} staged files...")
+    except PendingBatchError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if stream:
+        print(f"Found {len(found)} regulations in input file.")
     
     print("\n" + "="*50)
     print(f"Summary:")
     print(f"  Updated: {updated}")
     print(f"  Unchanged: {unchanged}")
+    if skipped:
+        print(f"  Skipped (duplicate guard): {len(skipped)}")
     print("="*50)
     
     # Save diff report if there are updates
@@ -312,6 +388,16 @@ def main():
         with open(report_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
         print(f"\nDiff report saved to: {report_path}")
+        
+        # Machine-readable list of changed articles
+        changes_path = os.path.join(reports_dir, f'update_report_{timestamp}.json')
+        with open(changes_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(timespec='seconds'),
+                'regulations': article_changes,
+                'skipped': skipped,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"Changed articles saved to: {changes_path}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+처리 단계 추적 (선택 사항, Chrome trace-event JSON)
+
+REGULATION_TRACE를 켜면 단계(stage)마다, 문서마다 벽시계 시간, CPU 시간, 메모리를 기록합니다.
+꺼져 있으면 stage()/traced()는 아무것도 기록하지 않습니다.
+
+단계: probe, pdf2docx, pandoc, classify, split, sanitize, diff, write, regenerate, rag_sync
+(regctl로 실행하면 하위 명령 단위 구간도 함께 기록)
+
+- 시간: 벽시계, 프로세스 CPU, 단계 중에 끝난 자식 프로세스 CPU (pandoc CLI 등)
+- 메모리: 단계가 끝날 때 RSS와 프로세스 최대 RSS,
+  REGULATION_TRACE_MEMORY=1이면 tracemalloc으로 단계 중 파이썬 최대 할당량 (느려짐)
+- 페이지 병렬 변환/일괄 변환의 작업 프로세스도 같은 실행 ID로 .cache/traces/<실행 ID>/<pid>.jsonl에
+  바로 기록하고, 실행을 시작한 프로세스가 끝날 때 하나의 Chrome trace JSON으로 합칩니다
+  (chrome://tracing 또는 https://ui.perfetto.dev 에서 열기)
+- 요약 표: 단계별 횟수, 합계/최대 시간, CPU, 최대 메모리, 가장 오래 걸린 문서
+- 예산: 단계별 허용치를 넘으면 위반으로 보고 (regctl은 종료 코드 1)
+
+환경 변수:
+    REGULATION_TRACE=1 | <출력.json>   켜기 (1이면 .cache/traces/<실행 ID>.json)
+    REGULATION_TRACE_MEMORY=1          tracemalloc 사용
+    REGULATION_TRACE_BUDGETS=<예산.json>
+
+예산 파일 (단위: 초, MB):
+    {"stages": {"pandoc": {"max_seconds": 60, "max_total_seconds": 600, "max_peak_mb": 512}}}
+    max_seconds: 문서 하나, max_total_seconds: 단계 합계, max_peak_mb: 최대 메모리 (tracemalloc, 없으면 RSS)
+
+사용 예:
+    with stage('pandoc', document=input_path):
+        ...
+
+    @traced('classify', document=0)   # 첫 번째 인자를 문서 이름으로
+    def analyze_md_content(md_path, regulations):
+        ...
+
+사용법:
+    python3 scripts/regctl.py --trace --budgets .github/trace-budgets.json process regulations_source/new/규정집.pdf
+    REGULATION_TRACE=1 python3 scripts/process_regulation.py regulations_source/new/규정집.pdf
+    python3 scripts/stage_trace.py summary <trace.json>
+    python3 scripts/stage_trace.py check <trace.json> <예산.json>
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import threading
+import functools
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+project_root = Path(__file__).resolve().parent.parent
+
+TRACE_DIR = project_root / '.cache' / 'traces'
+STAGES = ('probe', 'pdf2docx', 'pandoc', 'classify', 'split', 'sanitize', 'diff', 'write',
+          'regenerate', 'rag_sync')
+
+_run = None
+_lock = threading.Lock()
+_local = threading.local()
+_log = None  # (pid, 파일) - fork된 작업 프로세스는 자기 파일을 새로 엶
+
+def _init():
+    """환경 변수로 추적 설정 (import 시 한 번, 꺼져 있으면 None)"""
+    setting = os.environ.get('REGULATION_TRACE', '0')
+    if setting in ('', '0'):
+        return None
+    run_id = os.environ.get('REGULATION_TRACE_RUN')
+    owner = run_id is None
+    if owner:
+        # 이후에 띄우는 작업 프로세스가 같은 실행에 기록하도록 환경 변수로 전달
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}-{os.getpid()}"
+        os.environ['REGULATION_TRACE_RUN'] = run_id
+    run = {
+        'id': run_id,
+        'dir': TRACE_DIR / run_id,
+        'output': TRACE_DIR / f"{run_id}.json" if setting == '1' else Path(setting).resolve(),
+        'owner_pid': os.getpid() if owner else None,
+        'process': Path(sys.argv[0]).name,
+        'memory': os.environ.get('REGULATION_TRACE_MEMORY', '0') != '0',
+        'finished': False,
+    }
+    run['dir'].mkdir(parents=True, exist_ok=True)
+    if run['memory'] and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if owner:
+        atexit.register(finish)
+    return run
+
+def enabled():
+    return _run is not None
+
+def _write(record):
+    """이 프로세스의 기록 파일에 한 줄 추가 (작업 프로세스가 갑자기 끝나도 남도록 바로 flush)"""
+    global _log
+    with _lock:
+        if _log is None or _log[0] != os.getpid():
+            handle = open(_run['dir'] / f"{os.getpid()}.jsonl", 'a', encoding='utf-8')
+            _log = (os.getpid(), handle)
+            # 작업 프로세스는 fork 시점의 스크립트 이름 (regctl 안에서는 실행 중인 하위 스크립트)
+            process = _run['process'] if os.getpid() == _run['owner_pid'] else Path(sys.argv[0]).name
+            handle.write(json.dumps({
+                'name': 'process_name', 'ph': 'M', 'pid': os.getpid(),
+                'args': {'name': f"{process} ({os.getpid()})"},
+            }, ensure_ascii=False) + '\n')
+        _log[1].write(json.dumps(record, ensure_ascii=False) + '\n')
+        _log[1].flush()
+
+def _children_cpu():
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def _rss_mb():
+    """(현재 RSS, 프로세스 최대 RSS) MB (알 수 없으면 None)"""
+    current = None
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            current = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    peak = None
+    if resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 바이트
+        peak = maxrss / 1024 ** 2 if sys.platform == 'darwin' else maxrss / 1024
+    return current, peak
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+@contextmanager
+def stage(name, document=None, **args):
+    """단계 구간 기록 (추적이 꺼져 있으면 아무것도 하지 않음)"""
+    if _run is None:
+        yield
+        return
+
+    stack = _stack()
+    frame = {'peak': 0}
+    if _run['memory']:
+        # tracemalloc 최대치는 프로세스에 하나뿐이므로, 열려 있는 바깥 단계에 지금까지의 최대치를 넘기고 초기화
+        peak = tracemalloc.get_traced_memory()[1]
+        for outer in stack:
+            outer['peak'] = max(outer['peak'], peak)
+        tracemalloc.reset_peak()
+    stack.append(frame)
+
+    ts = time.time_ns() // 1000
+    start = time.perf_counter()
+    cpu = time.process_time()
+    children = _children_cpu()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        if not (isinstance(e, SystemExit) and e.code in (None, 0)):
+            error = type(e).__name__
+        raise
+    finally:
+        wall = time.perf_counter() - start
+        stack.pop()
+        record_args = {
+            'document': str(document) if document is not None else None,
+            'cpu_s': round(time.process_time() - cpu, 6),
+            'child_cpu_s': round(_children_cpu() - children, 6),
+        }
+        if _run['memory']:
+            frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            for outer in stack:
+                outer['peak'] = max(outer['peak'], frame['peak'])
+            tracemalloc.reset_peak()
+            record_args['peak_mb'] = round(frame['peak'] / 1024 ** 2, 3)
+        rss, max_rss = _rss_mb()
+        record_args['rss_mb'] = round(rss, 1) if rss is not None else None
+        record_args['max_rss_mb'] = round(max_rss, 1) if max_rss is not None else None
+        if error:
+            record_args['error'] = error
+        record_args.update(args)
+        _write({
+            'name': name,
+            'cat': 'stage',
+            'ph': 'X',
+            'ts': ts,
+            'dur': int(wall * 1_000_000),
+            'pid': os.getpid(),
+            'tid': threading.get_native_id(),
+            'args': record_args,
+        })
+
+def traced(name, document=None):
+    """함수 전체를 단계로 기록하는 데코레이터
+
+    document: 문서 이름으로 쓸 위치 인자 번호, 또는 (*args, **kwargs) → 문서 이름 함수
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _run is None:
+                return func(*args, **kwargs)
+            if callable(document):
+                label = document(*args, **kwargs)
+            elif document is not None and document < len(args):
+                label = args[document]
+            else:
+                label = None
+            with stage(name, document=label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def load_events(run_dir):
+    """실행 폴더의 모든 프로세스 기록 → 이벤트 목록 (시간 순)"""
+    events = []
+    for path in sorted(Path(run_dir).glob('*.jsonl')):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    pass  # 작업 프로세스가 쓰는 도중 끝난 마지막 줄
+    return sorted(events, key=lambda event: (event['ph'] != 'M', event.get('ts', 0)))
+
+def summarize(events):
+    """단계별 요약 {단계: {'count', 'total_s', 'max_s', 'cpu_s', 'child_cpu_s', 'peak_mb', 'max_rss_mb', 'slowest'}}"""
+    summary = {}
+    for event in events:
+        if event.get('ph') != 'X':
+            continue
+        args = event.get('args', {})
+        seconds = event['dur'] / 1_000_000
+        entry = summary.setdefault(event['name'], {
+            'count': 0, 'total_s': 0.0, 'max_s': 0.0, 'cpu_s': 0.0, 'child_cpu_s': 0.0,
+            'peak_mb': None, 'max_rss_mb': None, 'slowest': None,
+        })
+        entry['count'] += 1
+        entry['total_s'] += seconds
+        entry['cpu_s'] += args.get('cpu_s') or 0.0
+        entry['child_cpu_s'] += args.get('child_cpu_s') or 0.0
+        if seconds >= entry['max_s']:
+            entry['max_s'] = seconds
+            entry['slowest'] = args.get('document')
+        for key in ('peak_mb', 'max_rss_mb'):
+            if args.get(key) is not None:
+                entry[key] = max(entry[key] or 0.0, args[key])
+    order = {name: i for i, name in enumerate(STAGES)}
+    return dict(sorted(summary.items(), key=lambda item: (order.get(item[0], len(order)), item[0])))
+
+def load_budgets(path):
+    """예산 파일 → {단계: {한도}} (없으면 {})"""
+    if not path:
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('stages', {})
+
+def check_budgets(summary, budgets):
+    """예산 초과 목록 ["단계: 설명"]"""
+    violations = []
+    for name, limits in budgets.items():
+        entry = summary.get(name)
+        if entry is None:
+            continue
+        if 'max_seconds' in limits and entry['max_s'] > limits['max_seconds']:
+            slowest = f" ({entry['slowest']})" if entry['slowest'] else ''
+            violations.append(f"{name}: 문서 하나 {entry['max_s']:.2f}초 > {limits['max_seconds']}초{slowest}")
+        if 'max_total_seconds' in limits and entry['total_s'] > limits['max_total_seconds']:
+            violations.append(f"{name}: 합계 {entry['total_s']:.2f}초 > {limits['max_total_seconds']}초")
+        peak = entry['peak_mb'] if entry['peak_mb'] is not None else entry['max_rss_mb']
+        if 'max_peak_mb' in limits and peak is not None and peak > limits['max_peak_mb']:
+            violations.append(f"{name}: 최대 메모리 {peak:.1f}MB > {limits['max_peak_mb']}MB")
+    return violations
+
+def print_summary(summary, violations=(), output=None):
+    """요약 표 출력"""
+    print()
+    print("=" * 60)
+    print("⏱️  단계별 소요 시간" + (f" (trace: {output})" if output else ""))
+    print("=" * 60)
+    print(f"   {'단계':<16} {'횟수':>5} {'합계(초)':>9} {'최대(초)':>9} {'CPU(초)':>8} {'메모리(MB)':>10}  가장 오래 걸린 문서")
+    for name, entry in summary.items():
+        peak = entry['peak_mb'] if entry['peak_mb'] is not None else entry['max_rss_mb']
+        peak_str = f"{peak:10.1f}" if peak is not None else f"{'-':>10}"
+        slowest = os.path.basename(entry['slowest']) if entry['slowest'] else ''
+        print(f"   {name:<16} {entry['count']:>5} {entry['total_s']:>9.2f} {entry['max_s']:>9.2f} "
+              f"{entry['cpu_s'] + entry['child_cpu_s']:>8.2f} {peak_str}  {slowest}")
+    if violations:
+        print()
+        print(f"❌ 예산 초과 {len(violations)}건:")
+        for violation in violations:
+            print(f"   - {violation}")
+
+def finish(budgets_path=None):
+    """(실행을 시작한 프로세스에서) 기록을 Chrome trace JSON으로 합치고 요약 출력 → 예산 초과 목록
+
+    atexit에서도 호출되며 두 번째 호출부터는 아무것도 하지 않습니다.
+    """
+    global _log
+    if _run is None or _run['owner_pid'] != os.getpid() or _run['finished']:
+        return []
+    _run['finished'] = True
+    with _lock:
+        if _log is not None and _log[0] == os.getpid():
+            _log[1].close()
+        _log = None
+
+    events = load_events(_run['dir'])
+    summary = summarize(events)
+    budgets_path = budgets_path or os.environ.get('REGULATION_TRACE_BUDGETS')
+    violations = check_budgets(summary, load_budgets(budgets_path))
+
+    output = _run['output']
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'run': _run['id'],
+                'argv': sys.argv,
+                'summary': summary,
+                'budgets': str(budgets_path) if budgets_path else None,
+                'budget_violations': violations,
+            },
+        }, f, ensure_ascii=False)
+    os.replace(tmp_path, output)
+    shutil.rmtree(_run['dir'], ignore_errors=True)
+
+    print_summary(summary, violations, output)
+    return violations
+
+_run = _init()
+
+def main():
+    """명령행 실행: 저장된 trace 요약 / 예산 검사"""
+    args = sys.argv[1:]
+    if len(args) < 2 or args[0] not in ('summary', 'check') or (args[0] == 'check' and len(args) < 3):
+        print(__doc__[__doc__.index('사용법:'):].rstrip())
+        return 1
+
+    with open(args[1], 'r', encoding='utf-8') as f:
+        trace = json.load(f)
+    summary = summarize(trace.get('traceEvents', []))
+    violations = check_budgets(summary, load_budgets(args[2])) if args[0] == 'check' else []
+    print_summary(summary, violations, args[1])
+    if args[0] == 'check' and not violations:
+        print("\n✅ 예산 이내")
+    return 1 if violations else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
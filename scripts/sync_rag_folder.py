@@ -4,95 +4,389 @@ RAG 폴더 동기화 스크립트
 
 regulations/ 폴더의 규정 파일들을 regulations_for_rag/ 폴더로 복사합니다.
 파일명을 규정 코드(3-2-11.md)에서 한글 제목(보수지급규정.md)으로 변경합니다.
+(파일명은 copy_regulations_for_rag.ps1과 같이 공백을 뺀 정규화된 제목 title_normalized)
+
+증분 동기화:
+- 매니페스트(.cache/rag_sync_manifest.json)에 원본 mtime/크기와 내용 해시를 기록하고
+  내용이 바뀐 파일만 다시 복사
+- 가능하면 복사 대신 reflink(CoW 복제) 또는 하드 링크 사용
+- 지난 동기화에서 만든 파일 중 regulations.json에 더는 없는 제목의 파일(고아 파일)만 삭제
+  (매니페스트에 없는 파일은 직접 넣었거나 다른 도구가 만든 것이므로 건드리지 않음)
+- 추가/변경/삭제 목록을 .cache/rag_sync_changes.json에 누적하여
+  RAG 재색인 시 바뀐 문서만 처리할 수 있게 함
+  (재색인 쪽에서 --clear-changes로 비우기 전까지 이후 실행의 변경과 합쳐짐)
+
+사용법:
+    python3 scripts/sync_rag_folder.py [--link-mode auto|reflink|hardlink|copy]
+                                       [--keep-orphans] [--changes <경로>]
+    python3 scripts/sync_rag_folder.py --clear-changes [--changes <경로>]   # 재색인 후 변경 목록 비우기
+
+하드 링크는 원본과 같은 파일을 가리키므로 regulations_for_rag/ 파일을
+직접 수정하면 원본도 바뀝니다. (auto는 reflink → 하드 링크 → 복사 순으로 시도)
 """
 
 import os
+import sys
 import json
 import shutil
+import hashlib
+from datetime import datetime
 from pathlib import Path
 
+from batch_writer import BatchWriter, PendingBatchError
+from regulation_catalog import get_catalog
+from title_index import normalize_title
+from stage_trace import traced
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MANIFEST_PATH = Path('.cache') / 'rag_sync_manifest.json'
+CHANGES_PATH = Path('.cache') / 'rag_sync_changes.json'
+MANIFEST_VERSION = 1
+LINK_MODES = ('auto', 'reflink', 'hardlink', 'copy')
+FICLONE = 0x40049409  # Linux ioctl: 파일 내용 CoW 복제 (btrfs, xfs 등)
+
 def load_regulations_db(json_path='regulations.json'):
-    """regulations.json 파일 로드"""
+    """규정 목록 (규정 카탈로그, regulation_catalog.py)"""
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data['regulations']
+        return get_catalog(json_path).all()
     except Exception as e:
         print(f"❌ regulations.json 로드 실패: {e}")
         return None
 
-def sync_rag_folder(regulations, output_dir='regulations_for_rag'):
-    """RAG 폴더로 파일 동기화"""
+def hash_file(path, chunk_size=1024 * 1024):
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    """매니페스트 로드 (없거나 버전이 다르면 빈 매니페스트)"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == MANIFEST_VERSION:
+            return data.get('files', {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+def save_json(data, path):
+    """JSON 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def reflink(source, destination):
+    """reflink(CoW 복제) 시도 - 지원하지 않는 파일 시스템이면 OSError"""
+    if fcntl is None:
+        raise OSError("reflink 미지원 플랫폼")
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source, destination)
+
+def place_file(source, destination, batch, link_mode='auto'):
+    """source를 destination 자리의 임시 파일로 준비하고 사용한 방식 반환
+
+    교체는 batch(BatchWriter)를 적용할 때 다른 파일, 매니페스트와 함께 이루어지므로
+    중간 상태가 보이지 않고, 도중에 멈춰도 저널로 이어서 적용하거나 되돌릴 수 있습니다.
+    """
+    tmp_path = batch.temp_path(destination)
+
+    attempts = {
+        'auto': ('reflink', 'hardlink', 'copy'),
+        'reflink': ('reflink',),
+        'hardlink': ('hardlink',),
+        'copy': ('copy',),
+    }[link_mode]
+
+    for method in attempts:
+        try:
+            if method == 'reflink':
+                reflink(source, tmp_path)
+            elif method == 'hardlink':
+                os.link(source, tmp_path)
+            else:
+                shutil.copy2(source, tmp_path)
+            return method
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            if method == attempts[-1]:
+                batch.discard(destination)
+                raise
+
+def load_changes(path=CHANGES_PATH):
+    """아직 처리되지 않은 변경 목록 (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if all(isinstance(data.get(kind), list) for kind in ('added', 'updated', 'removed')):
+            return data
+    except (OSError, ValueError):
+        pass
+    return None
+
+def merge_changes(pending, changes):
+    """이전에 쌓인 변경 목록에 이번 변경을 합침 (파일별 최종 상태)
+
+    추가 후 변경 → 추가, 추가 후 삭제 → 목록에서 제외, 삭제 후 추가 → 변경
+    """
+    state = {}
+    for kind in ('added', 'updated', 'removed'):
+        for change in (pending or {}).get(kind, []):
+            state[change['file']] = (kind, change)
+    for kind in ('added', 'updated', 'removed'):
+        for change in changes[kind]:
+            previous = state.get(change['file'], (None, None))[0]
+            if previous == 'added' and kind == 'removed':
+                del state[change['file']]
+                continue
+            if previous == 'added':
+                merged_kind = 'added'
+            elif previous == 'removed' and kind == 'added':
+                merged_kind = 'updated'
+            else:
+                merged_kind = kind
+            state[change['file']] = (merged_kind, change)
+    merged = {'added': [], 'updated': [], 'removed': []}
+    for name in sorted(state):
+        kind, change = state[name]
+        merged[kind].append(change)
+    return merged
+
+def save_changes(changes, path=CHANGES_PATH):
+    """변경 목록을 아직 처리되지 않은 목록에 합쳐 저장 → 합친 목록"""
+    pending = load_changes(path)
+    now = datetime.now().isoformat(timespec='seconds')
+    merged = merge_changes(pending, changes)
+    save_json({
+        'generated_at': now,
+        # 재색인 쪽에서 비운 뒤 처음 쌓기 시작한 시각
+        'since': (pending or {}).get('since') or (pending or {}).get('generated_at') or now,
+        'output_dir': 'regulations_for_rag',
+        **merged,
+    }, path)
+    return merged
+
+def clear_changes(path=CHANGES_PATH):
+    """재색인이 끝난 변경 목록 삭제 → 삭제했는지 여부"""
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+def rag_filename(reg):
+    """RAG 폴더 파일명 (copy_regulations_for_rag.ps1과 같은 정규화된 제목)"""
+    return f"{reg.get('title_normalized') or normalize_title(reg['title'])}.md"
+
+def stat_signature(path):
+    """변경 감지용 (mtime_ns, 크기, inode)"""
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+@traced('rag_sync')
+def sync_rag_folder(regulations, output_dir='regulations_for_rag', link_mode='auto',
+                    keep_orphans=False, manifest_path=MANIFEST_PATH):
+    """RAG 폴더로 파일 증분 동기화
+
+    바뀐 파일, 고아 파일 삭제, 매니페스트는 하나의 일괄 작업(batch_writer.py)으로 함께 반영합니다.
+
+    반환: (성공 수, 실패 수, 건너뜀 수, 변경 목록)
+    변경 목록: {'added': [...], 'updated': [...], 'removed': [...]}
+    """
     # 출력 디렉토리 생성
     os.makedirs(output_dir, exist_ok=True)
-    
+
+    old_manifest = load_manifest(manifest_path)
+    manifest = {}
+    changes = {'added': [], 'updated': [], 'removed': []}
+    methods = {}
+
     success_count = 0
     fail_count = 0
     skip_count = 0
-    
+    batch = BatchWriter('sync_rag_folder')
+
     print(f"📂 {len(regulations)}개 규정 파일 동기화 중...")
     print("=" * 60)
-    
+
+    targets = set()
     for reg in regulations:
         source_file = reg['path']
-        
-        # 한글 파일명 생성 (원본 제목 사용, normalized 말고)
-        korean_filename = f"{reg['title']}.md"
+
+        # 한글 파일명 생성 (정규화된 제목, 커밋된 regulations_for_rag/ 파일과 같은 이름)
+        korean_filename = rag_filename(reg)
         destination_file = os.path.join(output_dir, korean_filename)
-        
+        targets.add(korean_filename)
+
         # 소스 파일 존재 확인
         if not os.path.exists(source_file):
             print(f"⚠️  소스 파일 없음: {source_file}")
             fail_count += 1
             continue
-        
+
         try:
-            # 파일 복사
-            shutil.copy2(source_file, destination_file)
-            print(f"✅ {reg['code']} → {korean_filename}")
-            success_count += 1
+            source_sig = stat_signature(source_file)
+            dest_exists = os.path.exists(destination_file)
+            dest_sig = stat_signature(destination_file) if dest_exists else None
+            cached = old_manifest.get(korean_filename)
+
+            # 원본/대상 모두 지난 동기화 이후 그대로면 해시 계산도 생략
+            if (cached and dest_exists and cached.get('source') == source_file
+                    and cached.get('source_sig') == source_sig and cached.get('dest_sig') == dest_sig):
+                manifest[korean_filename] = cached
+                skip_count += 1
+                continue
+
+            digest = hash_file(source_file)
+            change = {'file': korean_filename, 'code': reg['code'], 'sha256': digest}
+            # 하드 링크면 같은 inode이므로 해시 비교 불필요
+            dest_ok = dest_exists and (dest_sig[2] == source_sig[2] or hash_file(destination_file) == digest)
+            placed = None
+            if not dest_ok:
+                method = place_file(source_file, destination_file, batch, link_mode)
+                placed = batch.entries[os.path.abspath(destination_file)]['tmp']
+                methods[method] = methods.get(method, 0) + 1
+                changes['updated' if dest_exists else 'added'].append(change)
+                print(f"✅ {reg['code']} → {korean_filename}")
+                success_count += 1
+            elif cached and cached.get('sha256') != digest:
+                # 하드 링크로 원본 수정이 이미 반영된 경우에도 재색인 대상에 포함
+                changes['updated'].append(change)
+                print(f"✅ {reg['code']} → {korean_filename} (링크로 반영됨)")
+                success_count += 1
+            else:
+                skip_count += 1
+
+            manifest[korean_filename] = {
+                'code': reg['code'],
+                'source': source_file,
+                'sha256': digest,
+                'source_sig': stat_signature(source_file),
+                # 교체 후에도 임시 파일의 mtime/크기/inode가 그대로 유지됨
+                'dest_sig': stat_signature(placed or destination_file),
+            }
         except Exception as e:
             print(f"❌ 복사 실패 ({reg['code']}): {e}")
             fail_count += 1
-    
-    return success_count, fail_count, skip_count
+
+    # 고아 파일 삭제 (지난 동기화에서 만들었지만 regulations.json에 더는 없는 제목)
+    if not keep_orphans:
+        for name in sorted(old_manifest):
+            if name in targets or not os.path.exists(os.path.join(output_dir, name)):
+                continue
+            batch.remove(os.path.join(output_dir, name))
+            changes['removed'].append({'file': name, 'code': old_manifest.get(name, {}).get('code')})
+            print(f"🗑️  고아 파일 삭제: {name}")
+
+    batch.write_json(manifest_path, {'version': MANIFEST_VERSION, 'files': manifest})
+    try:
+        batch.commit()
+    except OSError as e:
+        batch.abort()
+        print(f"❌ 반영 실패: {e}")
+        print("   python3 scripts/batch_writer.py status 로 중단된 작업을 확인하세요.")
+        return 0, fail_count + success_count + len(changes['removed']), skip_count, changes
+
+    if methods:
+        print(f"   배치 방식: " + ", ".join(f"{method} {count}개" for method, count in sorted(methods.items())))
+
+    return success_count, fail_count, skip_count, changes
+
+def parse_args(argv):
+    """명령행 인자 파싱 → (link_mode, keep_orphans, changes_path, clear)"""
+    link_mode = 'auto'
+    keep_orphans = False
+    changes_path = CHANGES_PATH
+    clear = False
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == '--link-mode' and i + 1 < len(argv):
+            link_mode = argv[i + 1]
+            if link_mode not in LINK_MODES:
+                raise ValueError(f"--link-mode는 {', '.join(LINK_MODES)} 중 하나여야 합니다.")
+            i += 1
+        elif arg == '--keep-orphans':
+            keep_orphans = True
+        elif arg == '--clear-changes':
+            clear = True
+        elif arg == '--changes' and i + 1 < len(argv):
+            changes_path = Path(argv[i + 1])
+            i += 1
+        i += 1
+    return link_mode, keep_orphans, changes_path, clear
 
 def main():
     """메인 실행 함수"""
+    try:
+        link_mode, keep_orphans, changes_path, clear = parse_args(sys.argv[1:])
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if clear:
+        if clear_changes(changes_path):
+            print(f"🧹 변경 목록 비움: {changes_path}")
+        else:
+            print(f"ℹ️  비울 변경 목록이 없습니다: {changes_path}")
+        return 0
+
     print("=" * 60)
     print("🔄 RAG 폴더 동기화")
     print("=" * 60)
     print()
-    
+
     # regulations.json 로드
     regulations = load_regulations_db()
-    
+
     if not regulations:
         print("❌ regulations.json을 로드할 수 없습니다.")
         return 1
-    
+
     print(f"📚 {len(regulations)}개 규정 로드됨")
     print()
-    
+
     # 동기화 실행
-    success, fail, skip = sync_rag_folder(regulations)
-    
+    try:
+        success, fail, skip, changes = sync_rag_folder(regulations, link_mode=link_mode,
+                                                       keep_orphans=keep_orphans)
+    except PendingBatchError as e:
+        print(f"❌ {e}")
+        return 1
+
+    # 변경 목록 저장 (RAG 재색인 대상, 아직 처리되지 않은 이전 변경과 합침)
+    pending = save_changes(changes, changes_path)
+
     # 결과 출력
     print()
     print("=" * 60)
     print("📊 동기화 완료")
     print("=" * 60)
-    print(f"✅ 성공: {success}개")
+    print(f"✅ 성공: {success}개 (추가 {len(changes['added'])}, 변경 {len(changes['updated'])})")
+    if changes['removed']:
+        print(f"🗑️  삭제: {len(changes['removed'])}개")
     if fail > 0:
         print(f"❌ 실패: {fail}개")
     if skip > 0:
-        print(f"⏭️  건너뜀: {skip}개")
+        print(f"⏭️  건너뜀: {skip}개 (변경 없음)")
+    print(f"📝 변경 목록: {changes_path} (재색인 대기: 추가 {len(pending['added'])}, "
+          f"변경 {len(pending['updated'])}, 삭제 {len(pending['removed'])})")
     print()
-    
+
     return 0 if fail == 0 else 1
 
 if __name__ == '__main__':
-    import sys
     try:
         exit_code = main()
         sys.exit(exit_code)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+규정 제목 색인 (n-gram 역색인 기반 유사 제목 검색)
+
+기능:
+- 모든 스크립트가 함께 쓰는 단일 제목 정규화 함수 normalize_title()
+- regulations.json의 제목(과 선택 항목 aliases)으로 문자 2-gram 역색인 생성
+- 공통 n-gram 수로 후보를 먼저 추린 뒤 상위 후보에만 difflib 유사도 계산
+- 최근 검색어 LRU 캐시
+- 색인은 .cache/title_index.json에 저장하고 규정 목록이 바뀌면 다시 생성
+
+순위는 기존 smart_update.find_regulation_by_title()과 같은 기준입니다.
+1. 정규화된 제목이 정확히 일치 → 1.0
+2. 한쪽이 다른 쪽을 포함하는 제목 (유사도 순)
+3. 그 외 유사도 0.6 초과
+
+사용법:
+    python3 scripts/title_index.py <검색할 제목> [상위 개수]
+"""
+
+import os
+import re
+import sys
+import json
+import difflib
+import heapq
+import hashlib
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+
+DEFAULT_INDEX_PATH = project_root / '.cache' / 'title_index.json'
+INDEX_VERSION = 1
+NGRAM = 2
+MIN_FUZZY_RATIO = 0.6
+MAX_CANDIDATES = 32
+
+def normalize_title(title):
+    """제목 정규화 (공백, 특수문자 제거, 소문자 변환) - 모든 스크립트 공통"""
+    if not title:
+        return ""
+    return re.sub(r'[\s\.\·\-\(\)\[\]\:：]', '', title).lower()
+
+def ngrams(text, n=NGRAM):
+    """문자 n-gram 집합 (n보다 짧으면 문자열 자체)"""
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def catalog_fingerprint(regulations):
+    """색인 대상(코드, 제목, 별칭)의 해시 - 바뀌면 색인 재생성"""
+    payload = [(reg['code'], reg['title'], reg.get('aliases', [])) for reg in regulations]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+class TitleIndex:
+    """규정 제목/별칭 n-gram 역색인"""
+
+    def __init__(self, regulations, entries=None, postings=None):
+        self.regulations = regulations
+        self.by_code = {reg['code']: reg for reg in regulations}
+        self.order = {}
+        for i, reg in enumerate(regulations):
+            self.order.setdefault(reg['code'], i)
+        if entries is None:
+            entries, postings = self._build_entries(regulations)
+        # entries: [(정규화된 제목 또는 별칭, 규정 코드)]
+        self.entries = entries
+        self.postings = postings
+        self.exact = {}
+        self.gram_counts = []
+        for i, (text, code) in enumerate(entries):
+            self.exact.setdefault(text, i)
+            self.gram_counts.append(len(ngrams(text)))
+        self._search_cached = lru_cache(maxsize=256)(self._search)
+
+    @staticmethod
+    def _build_entries(regulations):
+        entries = []
+        postings = {}
+        for reg in regulations:
+            names = [reg['title']] + list(reg.get('aliases', []))
+            seen = set()
+            for name in names:
+                text = normalize_title(name)
+                if not text or text in seen:
+                    continue
+                seen.add(text)
+                entry_id = len(entries)
+                entries.append((text, reg['code']))
+                for gram in ngrams(text):
+                    postings.setdefault(gram, []).append(entry_id)
+        return entries, postings
+
+    @classmethod
+    def load(cls, regulations, index_path=None):
+        """저장된 색인을 불러오고, 없거나 규정 목록이 바뀌었으면 새로 만들어 저장"""
+        index_path = Path(index_path or DEFAULT_INDEX_PATH)
+        fingerprint = catalog_fingerprint(regulations)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION and data.get('fingerprint') == fingerprint:
+                entries = [tuple(entry) for entry in data['entries']]
+                return cls(regulations, entries, data['postings'])
+        except (OSError, ValueError, KeyError):
+            pass
+
+        index = cls(regulations)
+        index.save(index_path, fingerprint)
+        return index
+
+    def save(self, index_path=None, fingerprint=None):
+        """색인을 파일로 저장 (실패해도 검색에는 영향 없음)"""
+        index_path = Path(index_path or DEFAULT_INDEX_PATH)
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': INDEX_VERSION,
+                    'fingerprint': fingerprint or catalog_fingerprint(self.regulations),
+                    'entries': self.entries,
+                    'postings': self.postings,
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            pass
+
+    def _search(self, query, k):
+        """정규화된 검색어로 (점수, 코드) 상위 k개 검색"""
+        if query in self.exact:
+            _, code = self.entries[self.exact[query]]
+            results = [(1.0, code)]
+        else:
+            results = []
+
+        query_grams = ngrams(query)
+        overlap = Counter()
+        for gram in query_grams:
+            overlap.update(self.postings.get(gram, ()))
+
+        # 후보 정리: 포함 관계인 제목은 항상 후보, 나머지는 Dice 계수 상위만
+        contained = []
+        others = []
+        for entry_id, shared in overlap.items():
+            text, _ = self.entries[entry_id]
+            if query in text or text in query:
+                contained.append(entry_id)
+            else:
+                dice = 2 * shared / (len(query_grams) + self.gram_counts[entry_id])
+                others.append((dice, entry_id))
+        candidates = contained + [entry_id for _, entry_id in heapq.nlargest(MAX_CANDIDATES, others)]
+        if not candidates:
+            # 공통 n-gram이 하나도 없으면 (매우 짧은 검색어 등) 전체 비교
+            candidates = range(len(self.entries))
+
+        matcher = difflib.SequenceMatcher(None)
+        matcher.set_seq1(query)
+        best = {}
+        for entry_id in candidates:
+            text, code = self.entries[entry_id]
+            if query in text or text in query:
+                # 포함 관계면 일치 블록이 짧은 쪽 전체이므로 difflib 없이 계산 가능
+                ratio = 2 * min(len(query), len(text)) / (len(query) + len(text))
+                rank = (True, ratio)
+            else:
+                matcher.set_seq2(text)
+                # 상한값(quick_ratio)으로 먼저 걸러내고 통과한 후보만 정확히 계산
+                if matcher.real_quick_ratio() <= MIN_FUZZY_RATIO or matcher.quick_ratio() <= MIN_FUZZY_RATIO:
+                    continue
+                ratio = matcher.ratio()
+                if ratio <= MIN_FUZZY_RATIO:
+                    continue
+                rank = (False, ratio)
+            if code not in best or rank > best[code]:
+                best[code] = rank
+
+        seen = {code for _, code in results}
+        # 점수가 같으면 regulations.json 순서가 앞선 규정 우선
+        ranked = sorted(((rank, code) for code, rank in best.items() if code not in seen),
+                        key=lambda item: (item[0], -self.order[item[1]]), reverse=True)
+        results += [(rank[1], code) for rank, code in ranked]
+        return tuple(results[:k])
+
+    def search(self, title, k=5):
+        """제목으로 검색하여 [(규정, 점수)] 상위 k개 반환 (점수 높은 순)"""
+        query = normalize_title(title)
+        if not query:
+            return []
+        return [(self.by_code[code], score) for score, code in self._search_cached(query, k)]
+
+    def best_match(self, title):
+        """가장 유사한 규정과 점수 (없으면 (None, 0.0))"""
+        results = self.search(title, k=1)
+        return results[0] if results else (None, 0.0)
+
+_index_cache = {}
+
+def get_title_index(regulations):
+    """프로세스 안에서는 같은 규정 목록에 대해 색인을 한 번만 로드"""
+    key = id(regulations)
+    cached = _index_cache.get(key)
+    if cached is None or cached.regulations is not regulations:
+        cached = TitleIndex.load(regulations)
+        _index_cache.clear()
+        _index_cache[key] = cached
+    return cached
+
+def main():
+    """명령행 실행: 제목 검색"""
+    if len(sys.argv) < 2:
+        print(f"사용법: python3 {sys.argv[0]} <검색할 제목> [상위 개수]")
+        return 1
+
+    with open(project_root / 'regulations.json', 'r', encoding='utf-8') as f:
+        regulations = json.load(f)['regulations']
+
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    index = TitleIndex.load(regulations)
+    results = index.search(sys.argv[1], k)
+    if not results:
+        print("❌ 매칭되는 규정이 없습니다.")
+        return 1
+    for reg, score in results:
+        print(f"{score * 100:5.1f}%  {reg['code']:<8} {reg['title']}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
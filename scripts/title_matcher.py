@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+규정 제목 다중 매칭기 (Aho-Corasick)
+
+regulations.json의 모든 제목(정규화된 형태)으로 오토마톤을 한 번 만들고,
+라인 하나를 한 번만 훑어서
+- 라인에 포함된 모든 규정 제목
+- 라인이 끝나는 규정 제목 (접미사 매칭)
+을 찾습니다. 라인 × 규정 수만큼 반복하던 비교를 라인 길이에 비례하는
+시간으로 줄여 규정 수가 늘어나도 분리/분석 속도가 유지됩니다.
+
+split_and_update.split_markdown_content()와
+document_probe.find_titles_in_lines()가 함께 사용합니다.
+"""
+
+from collections import deque
+
+class TitleMatcher:
+    """정규화된 규정 제목 Aho-Corasick 오토마톤
+
+    같은 정규화 제목이 여러 번 나오면 dict와 동일하게
+    순서는 처음 나온 위치, 값은 마지막 규정을 사용합니다.
+    """
+
+    def __init__(self, regulations, normalize):
+        self.normalize = normalize
+        self.by_key = {}
+        for reg in regulations:
+            self.by_key[normalize(reg['title'])] = reg
+        self.keys = [key for key in self.by_key if key]
+        self.order = {key: i for i, key in enumerate(self.keys)}
+        self._build()
+
+    def _build(self):
+        """트라이 + 실패 링크 구성"""
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+
+        for key in self.keys:
+            state = 0
+            for ch in key:
+                next_state = self.goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][ch] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = next_state
+            self.output[state] = self.output[state] + (key,)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def _final_state(self, text, found=None):
+        """text를 한 번 훑고 마지막 상태 반환 (found가 있으면 중간 매칭 수집)"""
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if found is not None and output[state]:
+                found.update(output[state])
+        return state
+
+    def contained(self, normalized_text):
+        """정규화된 텍스트에 포함된 모든 제목 키"""
+        found = set()
+        self._final_state(normalized_text, found)
+        return found
+
+    def suffixes(self, normalized_text):
+        """정규화된 텍스트가 끝나는 제목 키 (등록 순서대로)"""
+        keys = self.output[self._final_state(normalized_text)]
+        return sorted(keys, key=self.order.__getitem__)
+
+    def first_suffix(self, normalized_text, min_length=0):
+        """등록 순서상 가장 먼저인, min_length보다 긴 접미사 제목의 규정"""
+        for key in self.suffixes(normalized_text):
+            if len(key) > min_length:
+                return self.by_key[key]
+        return None
+
+_matcher_cache = {}
+
+def get_title_matcher(regulations, normalize):
+    """같은 규정 목록/정규화 함수에 대해서는 오토마톤을 한 번만 생성"""
+    cache_key = (normalize, tuple(reg['title'] for reg in regulations), tuple(id(reg) for reg in regulations))
+    matcher = _matcher_cache.get(cache_key)
+    if matcher is None:
+        _matcher_cache.clear()
+        matcher = TitleMatcher(regulations, normalize)
+        _matcher_cache[cache_key] = matcher
+    return matcher
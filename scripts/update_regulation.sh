@@ -51,10 +51,8 @@ fi
 
 echo "🎯 대상 파일: $TARGET_FILE"
 
-# 백업 생성
-BACKUP_FILE="${TARGET_FILE}.backup.$(date +%Y%m%d_%H%M%S)"
-cp "$TARGET_FILE" "$BACKUP_FILE"
-echo "💾 백업 생성: $BACKUP_FILE"
+# 백업 생성 (압축 백업 저장소, 되돌리기: python3 scripts/backup_store.py restore <코드> [시각])
+python3 "$(dirname "$0")/backup_store.py" save "$CODE" "$TARGET_FILE"
 
 # 파일 업데이트
 cp "$TEMP_MD" "$TARGET_FILE"
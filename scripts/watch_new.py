@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+regulations_source/new 감시 (상주 처리)
+
+하루 한 번 도는 워크플로우나 batch_smart_update.py를 직접 실행하기 전까지
+new/ 폴더에 넣은 파일이 기다리지 않도록, 폴더를 감시하다가 파일이 들어오면 바로 처리합니다.
+
+- Linux에서는 inotify(ctypes, 추가 의존성 없음)로 파일 쓰기 완료/이동을 감지하고,
+  inotify를 쓸 수 없으면 주기적으로 폴더를 확인(폴링)합니다
+- 복사 중인 파일을 처리하지 않도록 마지막 변경 후 일정 시간(--settle, 기본 1초) 동안
+  크기/수정 시각이 그대로인 파일만 처리합니다
+- 처리는 process_regulation.py와 같은 흐름을 같은 프로세스에서 실행합니다 (regctl.run_step)
+  · 규정 카탈로그와 제목 색인은 시작할 때 한 번 열어 두고 파일마다 다시 읽지 않음
+  · pandoc 서버를 띄워 두고 모든 변환에 사용 (pandoc_pool.py)
+- 처리 후에도 new/에 남은 파일(통합 문서, 실패한 파일)은 내용이 바뀔 때까지 다시 처리하지 않습니다
+
+사용법:
+    python3 scripts/watch_new.py
+    python3 scripts/watch_new.py --regenerate          # 처리 후 regulations.json 재생성 + RAG 폴더 동기화
+    python3 scripts/watch_new.py --settle 2 --page-jobs 0
+    python3 scripts/watch_new.py --poll 5              # inotify 대신 5초마다 폴더 확인
+    python3 scripts/watch_new.py --once                # 지금 있는 파일만 처리하고 종료
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import signal
+import struct
+import ctypes
+import ctypes.util
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+
+WATCH_DIR = 'regulations_source/new'
+EXTENSIONS = ('.pdf', '.docx')
+DEFAULT_SETTLE = 1.0
+DEFAULT_POLL = 2.0
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+def is_candidate(name):
+    """처리 대상 파일인지 (PDF/DOCX, 임시/숨김 파일 제외)"""
+    return name.lower().endswith(EXTENSIONS) and not name.startswith(('~', '.'))
+
+def file_signature(path):
+    """안정화 판단용 (mtime_ns, 크기) (없으면 None)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def scan_directory(directory):
+    """폴더의 처리 대상 파일 → {경로: 서명}"""
+    files = {}
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return files
+    for name in names:
+        if is_candidate(name):
+            path = os.path.join(directory, name)
+            signature = file_signature(path)
+            if signature is not None:
+                files[path] = signature
+    return files
+
+class InotifyWatcher:
+    """inotify로 폴더의 변경된 파일 이름 감지 (Linux)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, os.strerror(error))
+
+    def wait(self, timeout):
+        """변경 이벤트를 기다림 (timeout초, None이면 무한) → 변경된 파일 경로 집합
+
+        이벤트 큐가 넘치면 폴더 전체를 다시 확인하도록 폴더 경로를 넣어 돌려줍니다.
+        """
+        try:
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+        except InterruptedError:
+            return set()
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EINTR):
+                return set()
+            raise
+        changed = set()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].split(b'\0', 1)[0]
+            offset += length
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                raise OSError(errno.ENOENT, f"감시 중인 폴더가 사라졌습니다: {self.directory}")
+            if mask & IN_Q_OVERFLOW:
+                changed.add(self.directory)
+            elif name:
+                changed.add(os.path.join(self.directory, os.fsdecode(name)))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """주기적으로 폴더를 확인하여 변경된 파일 감지 (inotify를 쓸 수 없을 때)"""
+
+    def __init__(self, directory, interval=DEFAULT_POLL):
+        self.directory = directory
+        self.interval = interval
+        self.files = scan_directory(directory)
+
+    def wait(self, timeout):
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        files = scan_directory(self.directory)
+        changed = {path for path, signature in files.items() if self.files.get(path) != signature}
+        self.files = files
+        return changed
+
+    def close(self):
+        pass
+
+def make_watcher(directory, poll=None):
+    """inotify 감시 (안 되면 폴링) → (감시 객체, 설명)"""
+    if poll is None and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory), 'inotify'
+        except (OSError, AttributeError) as e:
+            print(f"⚠️  inotify를 사용할 수 없어 폴링으로 감시합니다: {e}")
+    interval = poll or DEFAULT_POLL
+    return PollingWatcher(directory, interval), f"폴링 ({interval:g}초 간격)"
+
+class PendingFiles:
+    """쓰기가 끝날 때까지 기다리는 파일 (디바운스)
+
+    파일마다 처음 감지한 시각과 마지막으로 바뀐 시각을 기록하고,
+    마지막 변경 후 settle초 동안 크기/수정 시각이 그대로면 처리할 준비가 된 것으로 봅니다.
+    """
+
+    def __init__(self, settle=DEFAULT_SETTLE):
+        self.settle = settle
+        self.files = {}   # 경로 → [서명, 처음 감지 시각, 마지막 변경 시각]
+        self.handled = {}  # 처리했는데 new/에 남아 있는 파일 → 처리할 때의 서명
+
+    def touch(self, path, now=None):
+        """변경 감지 (파일이 없어졌으면 대기 목록에서 제거)"""
+        now = now or time.monotonic()
+        signature = file_signature(path)
+        if signature is None or not is_candidate(os.path.basename(path)):
+            self.files.pop(path, None)
+            self.handled.pop(path, None)
+            return
+        if self.handled.get(path) == signature:
+            return
+        entry = self.files.get(path)
+        if entry is None:
+            self.files[path] = [signature, now, now]
+        elif entry[0] != signature:
+            entry[0] = signature
+            entry[2] = now
+
+    def ready(self, now=None):
+        """처리할 준비가 된 파일 목록 (처음 감지한 순서)"""
+        now = now or time.monotonic()
+        ready = []
+        for path, entry in sorted(self.files.items(), key=lambda item: item[1][1]):
+            if now - entry[2] < self.settle:
+                continue
+            # 이벤트 없이 바뀌었을 수도 있으므로 (폴링, 느린 복사) 한 번 더 확인
+            signature = file_signature(path)
+            if signature is None:
+                del self.files[path]
+            elif signature != entry[0]:
+                entry[0] = signature
+                entry[2] = now
+            else:
+                ready.append((path, entry[1]))
+        return ready
+
+    def next_timeout(self, now=None):
+        """다음 확인까지 기다릴 시간 (대기 중인 파일이 없으면 None)"""
+        if not self.files:
+            return None
+        now = now or time.monotonic()
+        return max(0.05, min(entry[2] + self.settle for entry in self.files.values()) - now)
+
+    def done(self, path):
+        """처리 완료 (파일이 아직 있으면 바뀌기 전까지 다시 처리하지 않음)"""
+        entry = self.files.pop(path, None)
+        signature = file_signature(path)
+        if signature is not None:
+            self.handled[path] = signature
+        return entry
+
+def warm_up():
+    """처리 모듈 import, 카탈로그/제목 색인 로드, pandoc 서버 준비 (파일마다 반복하지 않도록)"""
+    start = time.perf_counter()
+    import process_regulation  # noqa: F401 (무거운 import를 첫 파일 전에)
+    import smart_update  # noqa: F401
+    import split_and_update  # noqa: F401
+    from regulation_catalog import get_catalog
+    from title_index import get_title_index
+    from pandoc_pool import get_pool
+
+    regulations = get_catalog().all()
+    get_title_index(regulations)
+    print(f"📚 규정 카탈로그: {len(regulations)}개 규정")
+    if get_pool().start():
+        print(f"🚀 pandoc 서버 사용: {os.environ['PANDOC_SERVER_URL']}")
+    else:
+        print("ℹ️  pandoc 서버를 사용할 수 없어 pandoc CLI로 변환합니다.")
+    print(f"⏱️  준비: {time.perf_counter() - start:.2f}초")
+
+def process_files(paths, page_jobs=None, regenerate=False):
+    """파일들을 같은 프로세스에서 처리 → {경로: 종료 코드}"""
+    from regctl import run_step
+
+    results = {}
+    for path in paths:
+        print()
+        print("=" * 60)
+        print(f"📥 새 파일: {path}")
+        print("=" * 60)
+        argv = [path]
+        if page_jobs is not None:
+            argv += ['--page-jobs', str(page_jobs)]
+        results[path] = run_step('process', argv)
+    if regenerate and any(code == 0 for code in results.values()):
+        if run_step('regenerate', ['--incremental']) == 0:
+            run_step('sync-rag')
+    return results
+
+def report(path, code, detected):
+    """파일별 결과와 감지부터 완료까지 걸린 시간 출력"""
+    status = "✅ 처리 완료" if code == 0 else f"❌ 처리 실패 (종료 코드 {code})"
+    print(f"{status}: {os.path.basename(path)} (감지 → 완료 {time.monotonic() - detected:.1f}초)")
+
+def parse_args(argv):
+    """명령행 인자 해석"""
+    options = {'settle': DEFAULT_SETTLE, 'poll': None, 'page_jobs': None,
+               'regenerate': False, 'once': False, 'directory': WATCH_DIR}
+    args = iter(argv)
+    for arg in args:
+        if arg == '--settle':
+            options['settle'] = float(next(args, DEFAULT_SETTLE))
+        elif arg == '--poll':
+            options['poll'] = float(next(args, DEFAULT_POLL))
+        elif arg == '--page-jobs':
+            options['page_jobs'] = int(next(args, '0'))
+        elif arg == '--regenerate':
+            options['regenerate'] = True
+        elif arg == '--once':
+            options['once'] = True
+        elif arg in ('-h', '--help'):
+            return None
+        else:
+            options['directory'] = arg
+    return options
+
+def stop(signum, frame):
+    # run_step은 KeyboardInterrupt를 그대로 올려 보내므로 처리 중이어도 감시 루프에서 정리
+    raise KeyboardInterrupt
+
+def main():
+    """명령행 실행"""
+    options = parse_args(sys.argv[1:])
+    if options is None:
+        print(__doc__.split('사용법:')[1].rstrip())
+        return 0
+
+    # 기존 스크립트들은 프로젝트 루트 기준 경로를 사용
+    os.chdir(project_root)
+    directory = options['directory']
+    if not os.path.isdir(directory):
+        print(f"❌ {directory} 폴더가 없습니다.")
+        return 1
+
+    print("=" * 60)
+    print("👀 규정 파일 감시")
+    print("=" * 60)
+    warm_up()
+
+    pending = PendingFiles(options['settle'])
+    now = time.monotonic()
+    for path in sorted(scan_directory(directory)):
+        pending.touch(path, now)
+    if options['once']:
+        pending.settle = 0.0
+        ready = pending.ready()
+        results = process_files([path for path, _ in ready], options['page_jobs'], options['regenerate'])
+        for path, detected in ready:
+            report(path, results[path], detected)
+        if not ready:
+            print(f"ℹ️  {directory}에 처리할 파일이 없습니다.")
+        return 0 if all(code == 0 for code in results.values()) else 1
+
+    watcher, method = make_watcher(directory, options['poll'])
+    signal.signal(signal.SIGTERM, stop)
+    print(f"👀 {directory} 감시 중 ({method}, 안정화 {pending.settle:g}초, Ctrl+C로 종료)")
+    processed = failed = 0
+    try:
+        while True:
+            for path in watcher.wait(pending.next_timeout()):
+                if path == directory:
+                    # 이벤트 큐가 넘침 → 폴더 전체 다시 확인
+                    for name in scan_directory(directory):
+                        pending.touch(name)
+                else:
+                    pending.touch(path)
+            ready = pending.ready()
+            if not ready:
+                continue
+            results = process_files([path for path, _ in ready], options['page_jobs'], options['regenerate'])
+            for path, detected in ready:
+                pending.done(path)
+                report(path, results[path], detected)
+                processed += 1
+                failed += results[path] != 0
+            print(f"\n👀 {directory} 감시 중...")
+    except KeyboardInterrupt:
+        print("\n\n⚠️  감시를 종료합니다.")
+    finally:
+        watcher.close()
+    print(f"📊 처리한 파일: {processed}개 (실패 {failed}개)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())